@@ -0,0 +1,64 @@
+"""
+Timestamp parsing : tweets parsed per second with dateutil.parser.parse and with utils.parse_date.
+
+Every timestamp is different and the cache is cleared before each run , so parse_date is measured cold.
+The warm column parses the same timestamps again , i.e. only from the cache.
+
+    python benchmarks/bench_dates.py [--pages 10] [--repeat 3]
+"""
+
+import argparse
+import time
+from datetime import timedelta
+from unittest import mock
+
+from dateutil import parser
+
+import fixtures
+from tweety.types import twDataTypes
+from tweety.types.usertweet import UserTweets
+from tweety.utils import parse_date
+
+
+def parse_pages(pages):
+    count = 0
+    for page in pages:
+        count += len(UserTweets(None, None)._parse_page(page, UserTweets._get_entries(page)))
+    return count
+
+
+def best_rate(func, arg, repeat, warm=False):
+    rates = []
+    for _ in range(repeat):
+        parse_date.cache_clear()
+        if warm:
+            func(arg)
+        start = time.perf_counter()
+        count = func(arg)
+        rates.append(count / (time.perf_counter() - start))
+    return max(rates)
+
+
+def main():
+    argParser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argParser.add_argument("--pages", type=int, default=10)
+    argParser.add_argument("--repeat", type=int, default=3)
+    args = argParser.parse_args()
+
+    pages = [fixtures.user_tweets_page(44196397, page) for page in range(args.pages)]
+    stamps = [fixtures.twitter_date(fixtures.EPOCH + timedelta(seconds=i)) for i in range(5000)]
+
+    dates_before = best_rate(lambda values: len([parser.parse(value) for value in values]), stamps, args.repeat)
+    dates_after = best_rate(lambda values: len([parse_date(value) for value in values]), stamps, args.repeat)
+    dates_warm = best_rate(lambda values: len([parse_date(value) for value in values]), stamps, args.repeat, warm=True)
+    print(f"timestamps/sec  dateutil {dates_before:>12,.0f}   parse_date {dates_after:>12,.0f}   {dates_after / dates_before:.1f}x"
+          f"   warm {dates_warm:>12,.0f}   {dates_warm / dates_before:.1f}x")
+
+    with mock.patch.object(twDataTypes, "parse_date", parser.parse):
+        tweets_before = best_rate(parse_pages, pages, args.repeat)
+    tweets_after = best_rate(parse_pages, pages, args.repeat)
+    print(f"tweets/sec      dateutil {tweets_before:>12,.0f}   parse_date {tweets_after:>12,.0f}   {tweets_after / tweets_before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
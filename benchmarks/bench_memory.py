@@ -0,0 +1,66 @@
+"""
+Memory held per parsed tweet : dict based models against the slotted records.
+
+    python benchmarks/bench_memory.py [--pages 25]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+import fixtures
+from tweety.types.usertweet import UserTweets
+from tweety.types.records import TweetRecord, to_record
+
+
+def _pages(count):
+    return [fixtures.user_tweets_page(44196397, page) for page in range(count)]
+
+
+def _raw_tweets(pages):
+    for page in pages:
+        for entry in UserTweets._get_entries(page):
+            yield from UserTweets._get_tweet_content_key(entry)
+
+
+def measure(build, page_count):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    # the payloads are built inside the traced region : whatever a model keeps of its page is counted
+    kept = build(_pages(page_count))
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(kept), len(kept)
+
+
+def models(pages):
+    return [tweet for page in pages for tweet in UserTweets(None, None)._parse_page(page, UserTweets._get_entries(page))]
+
+
+def records_from_models(pages):
+    return [to_record(tweet) for tweet in models(pages)]
+
+
+def records_from_raw(pages):
+    return [TweetRecord.from_raw(raw_tweet) for raw_tweet in _raw_tweets(pages)]
+
+
+def main():
+    argParser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argParser.add_argument("--pages", type=int, default=25)
+    args = argParser.parse_args()
+
+    results = {}
+    for name, build in (("Tweet", models), ("TweetRecord (to_record)", records_from_models),
+                        ("TweetRecord (from_raw)", records_from_raw)):
+        per_object, count = measure(build, args.pages)
+        results[name] = per_object
+        print(f"{name:<26} {count:>7} tweets {per_object / 1024:>9.2f} KiB/tweet")
+
+    print(f"saving : {results['Tweet'] / results['TweetRecord (from_raw)']:.1f}x less memory per tweet")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Parser throughput : items parsed per second , allocations and peak memory per page for every endpoint shape.
+
+    python benchmarks/bench_parsers.py [--pages 20] [--repeat 5] [--lazy] [--output results.json]
+
+Compare two result files with benchmarks/compare.py
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import fixtures
+import tweety
+from tweety.bot import _parse_tweet_detail
+from tweety.types.replies import TweetReplies
+from tweety.types.search import Search
+from tweety.types.usertweet import UserTweets
+from tweety.utils import json_loads
+
+
+def _timeline(pages, lazy):
+    return [tweet for page in pages for tweet in UserTweets(None, None, False, lazy=lazy)._parse_page(page, UserTweets._get_entries(page))]
+
+
+def _timeline_replies(pages, lazy):
+    return [tweet for page in pages for tweet in UserTweets(None, None, True, lazy=lazy)._parse_page(page, UserTweets._get_entries(page))]
+
+
+def _search(pages, lazy):
+    return [tweet for page in pages for tweet in Search("python", None, 0, lazy=lazy)._parse_response(page)]
+
+
+def _users_search(pages, lazy):
+    return [user for page in pages for user in Search("python", None, 0, "users", lazy=lazy)._parse_response(page)]
+
+
+def _tweet_detail(pages, lazy):
+    items = []
+    for page in pages:
+        focal_id = _focal_id(page)
+        items.append(_parse_tweet_detail(page, focal_id, None, get_reply=False, lazy=lazy))
+        items += TweetReplies(focal_id, None, lazy=lazy)._parse_page(page, None)
+    return items
+
+
+def _focal_id(page):
+    entries = page['data']['threaded_conversation_with_injections_v2']['instructions'][0]['entries']
+    return [entry['entryId'].split("-")[-1] for entry in entries if entry['entryId'].startswith("tweet-")][-1]
+
+
+# shape -> (payload of page n , parser of a list of pages)
+SHAPES = {
+    "timeline": (lambda page: fixtures.user_tweets_page(44196397, page), _timeline),
+    "timeline_replies": (lambda page: fixtures.user_tweets_page(44196397, page, conversations=5), _timeline_replies),
+    "search": (lambda page: fixtures.search_page("python", page), _search),
+    "users_search": (lambda page: fixtures.search_page("python", page, users=True), _users_search),
+    "tweet_detail": (lambda page: fixtures.tweet_detail_page(str(1600000000000000000 - page), seed=page), _tweet_detail),
+}
+
+
+def _bodies(build, count):
+    # kept as bytes , every run decodes fresh payloads since the parsers write into them
+    return [json.dumps(build(page)).encode() for page in range(count)]
+
+
+def throughput(parse, bodies, repeat, lazy):
+    best, items = 0, 0
+    for _ in range(repeat):
+        pages = [json_loads(body) for body in bodies]
+        gc.collect()
+        start = time.perf_counter()
+        items = len(parse(pages, lazy))
+        best = max(best, items / (time.perf_counter() - start))
+    return best, items
+
+
+def memory(parse, bodies, lazy):
+    allocations, allocated, peak = 0, 0, 0
+    for body in bodies:
+        pages = [json_loads(body)]
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        parsed = parse(pages, lazy)
+        current, page_peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        stats = after.compare_to(before, "filename")
+        allocations += sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+        allocated += current - start
+        peak = max(peak, page_peak - start)
+        del parsed
+
+    return allocations / len(bodies), allocated / len(bodies), peak
+
+
+def run(shapes, page_count, repeat, lazy):
+    results = {}
+    for name in shapes:
+        build, parse = SHAPES[name]
+        bodies = _bodies(build, page_count)
+        rate, items = throughput(parse, bodies, repeat, lazy)
+        allocations, allocated, peak = memory(parse, bodies, lazy)
+        results[name] = {
+            "pages": page_count,
+            "items": items,
+            "items_per_sec": round(rate, 1),
+            "allocations_per_page": round(allocations, 1),
+            "kib_per_page": round(allocated / 1024, 2),
+            "peak_kib_per_page": round(peak / 1024, 2),
+        }
+    return results
+
+
+def main():
+    argParser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argParser.add_argument("--pages", type=int, default=20)
+    argParser.add_argument("--repeat", type=int, default=5)
+    argParser.add_argument("--lazy", action="store_true", help="build the models lazily")
+    argParser.add_argument("--shapes", nargs="+", choices=list(SHAPES), default=list(SHAPES))
+    argParser.add_argument("--output", help="write the results to this JSON file")
+    args = argParser.parse_args()
+
+    results = run(args.shapes, args.pages, args.repeat, args.lazy)
+    print(f"{'shape':<18} {'items/sec':>12} {'allocs/page':>12} {'KiB/page':>10} {'peak KiB':>10}")
+    for name, result in results.items():
+        print(f"{name:<18} {result['items_per_sec']:>12,.0f} {result['allocations_per_page']:>12,.0f} "
+              f"{result['kib_per_page']:>10,.1f} {result['peak_kib_per_page']:>10,.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "version": tweety.__version__,
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "lazy": args.lazy,
+                "results": results,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compare two result files of bench_parsers.py , exits with 1 when a shape got slower or heavier than the threshold allows.
+
+    python benchmarks/compare.py baseline.json current.json [--threshold 0.10]
+"""
+
+import argparse
+import json
+import sys
+
+# metric -> True when a higher value is better
+METRICS = {
+    "items_per_sec": True,
+    "allocations_per_page": False,
+    "kib_per_page": False,
+    "peak_kib_per_page": False,
+}
+
+
+def compare(baseline, current, threshold):
+    rows, regressions = [], []
+    for shape, result in current["results"].items():
+        base = baseline["results"].get(shape)
+        if base is None:
+            continue
+
+        for metric, higher_is_better in METRICS.items():
+            if not base.get(metric):
+                continue
+
+            change = (result[metric] - base[metric]) / base[metric]
+            regressed = -change > threshold if higher_is_better else change > threshold
+            rows.append((shape, metric, base[metric], result[metric], change, regressed))
+            if regressed:
+                regressions.append((shape, metric))
+
+    return rows, regressions
+
+
+def main():
+    argParser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argParser.add_argument("baseline")
+    argParser.add_argument("current")
+    argParser.add_argument("--threshold", type=float, default=0.10, help="relative change tolerated , 0.10 is 10%%")
+    args = argParser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows, regressions = compare(baseline, current, args.threshold)
+    print(f"{'shape':<18} {'metric':<22} {'baseline':>12} {'current':>12} {'change':>8}")
+    for shape, metric, before, after, change, regressed in rows:
+        print(f"{shape:<18} {metric:<22} {before:>12,.1f} {after:>12,.1f} {change:>+8.1%}{'  <-- regression' if regressed else ''}")
+
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
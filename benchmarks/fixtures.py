@@ -0,0 +1,404 @@
+"""
+Synthetic payloads in the shapes returned by the endpoints ``UrlBuilder`` targets.
+
+The builders are deterministic for a given ``seed`` , so benchmarks and the stand-in
+server produce the same pages on every run.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+SOURCES = [
+    '<a href="http://twitter.com/download/iphone" rel="nofollow">Twitter for iPhone</a>',
+    '<a href="http://twitter.com/download/android" rel="nofollow">Twitter for Android</a>',
+    '<a href="https://mobile.twitter.com" rel="nofollow">Twitter Web App</a>',
+]
+WORDS = ["launch", "rocket", "python", "data", "crawl", "tweet", "engine", "orbit", "model", "graph", "cache", "page"]
+EPOCH = datetime(2018, 10, 10, 20, 19, 24, tzinfo=timezone.utc)
+# Out of every ten tweets of a timeline or search page , the one at this position carries a poll and this one a link card
+POLL_POSITION = 3
+LINK_CARD_POSITION = 7
+
+
+def twitter_date(value):
+    return "{} {} {:02d} {:02d}:{:02d}:{:02d} +0000 {}".format(
+        DAYS[value.weekday()], MONTHS[value.month - 1], value.day, value.hour, value.minute, value.second, value.year
+    )
+
+
+def legacy_user(user_id, rnd=None):
+    rnd = rnd or random.Random(user_id)
+    screen_name = "user{}".format(user_id)
+    return {
+        "id": int(user_id),
+        "id_str": str(user_id),
+        "created_at": twitter_date(EPOCH - timedelta(days=int(user_id) % 3000)),
+        "default_profile": False,
+        "default_profile_image": False,
+        "description": " ".join(rnd.choice(WORDS) for _ in range(8)),
+        "entities": {"description": {"urls": []}},
+        "fast_followers_count": 0,
+        "favourites_count": rnd.randint(0, 50000),
+        "followers_count": rnd.randint(0, 10 ** 7),
+        "friends_count": rnd.randint(0, 5000),
+        "has_custom_timelines": True,
+        "is_translator": False,
+        "listed_count": rnd.randint(0, 1000),
+        "location": "Earth",
+        "media_count": rnd.randint(0, 2000),
+        "name": "User {}".format(user_id),
+        "normal_followers_count": rnd.randint(0, 10 ** 7),
+        "pinned_tweet_ids_str": [],
+        "possibly_sensitive": False,
+        "profile_banner_url": "https://pbs.twimg.com/profile_banners/{}/1".format(user_id),
+        "profile_image_url_https": "https://pbs.twimg.com/profile_images/{}/a_normal.jpg".format(user_id),
+        "profile_interstitial_type": "",
+        "protected": False,
+        "screen_name": screen_name,
+        "statuses_count": rnd.randint(0, 50000),
+        "translator_type": "none",
+        "verified": False,
+    }
+
+
+def graphql_user(user_id, rnd=None):
+    legacy = legacy_user(user_id, rnd)
+    legacy.pop("id")
+    legacy.pop("id_str")
+    return {
+        "__typename": "User",
+        "id": "VXNlcjo{}".format(user_id),
+        "rest_id": str(user_id),
+        "legacy": legacy,
+    }
+
+
+def _media(tweet_id, index, kind):
+    media_id = "{}{}".format(tweet_id, index)
+    media = {
+        "display_url": "pic.twitter.com/{}".format(media_id),
+        "expanded_url": "https://twitter.com/i/status/{}/photo/1".format(tweet_id),
+        "id_str": media_id,
+        "indices": [10, 33],
+        "media_key": "3_{}".format(media_id),
+        "media_url_https": "https://pbs.twimg.com/media/{}.jpg".format(media_id),
+        "type": kind,
+        "url": "https://t.co/{}".format(media_id),
+        "features": {},
+        "sizes": {"large": {"h": 1080, "w": 1920, "resize": "fit"}},
+        "original_info": {"height": 1080, "width": 1920},
+    }
+    if kind == "video":
+        media["video_info"] = {
+            "aspect_ratio": [16, 9],
+            "duration_millis": 30000,
+            "variants": [
+                {"content_type": "application/x-mpegURL", "url": "https://video.twimg.com/ext_tw_video/{}/pu/pl/x.m3u8".format(media_id)},
+                {"bitrate": 832000, "content_type": "video/mp4", "url": "https://video.twimg.com/ext_tw_video/{}/pu/vid/640x360/a.mp4".format(media_id)},
+                {"bitrate": 2176000, "content_type": "video/mp4", "url": "https://video.twimg.com/ext_tw_video/{}/pu/vid/1280x720/b.mp4".format(media_id)},
+            ],
+        }
+    return media
+
+
+def _card_kind(index):
+    return {POLL_POSITION: "poll", LINK_CARD_POSITION: "link"}.get(index % 10)
+
+
+def _card_bindings(tweet_id, kind):
+    # (name , [(key , value , type)]) of a poll or of a link preview , with its own generator so the tweets stay the same
+    rnd = random.Random("card-{}".format(tweet_id))
+    if kind == "poll":
+        choices = rnd.randint(2, 4)
+        end = EPOCH + timedelta(seconds=int(tweet_id) % 10 ** 7, days=1)
+        bindings = [("choice{}_label".format(i), rnd.choice(WORDS), "STRING") for i in range(1, choices + 1)]
+        bindings += [("choice{}_count".format(i), str(rnd.randint(0, 10000)), "STRING") for i in range(1, choices + 1)]
+        bindings += [
+            ("end_datetime_utc", end.strftime("%Y-%m-%dT%H:%M:%SZ"), "STRING"),
+            ("last_updated_datetime_utc", (end - timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ"), "STRING"),
+            ("duration_minutes", "1440", "STRING"),
+            ("counts_are_final", rnd.random() < 0.5, "BOOLEAN"),
+        ]
+        return "poll{}choice_text_only".format(choices), bindings
+
+    url = "https://example.com/{}".format(tweet_id)
+    image = {"height": 419, "width": 800, "url": "https://pbs.twimg.com/card_img/{}/a?format=jpg".format(tweet_id)}
+    return "summary_large_image", [
+        ("title", " ".join(rnd.choice(WORDS) for _ in range(5)), "STRING"),
+        ("description", " ".join(rnd.choice(WORDS) for _ in range(20)), "STRING"),
+        ("domain", "example.com", "STRING"),
+        ("card_url", url, "STRING"),
+        ("thumbnail_image_large", image, "IMAGE"),
+    ]
+
+
+def _binding_value(value, type_):
+    key = {"STRING": "string_value", "BOOLEAN": "boolean_value", "IMAGE": "image_value"}[type_]
+    return {key: value, "type": type_}
+
+
+def graphql_card(tweet_id, kind="poll"):
+    """
+    ``card`` of a GraphQL tweet , ``kind`` is ``poll`` or ``link``
+    """
+
+    name, bindings = _card_bindings(tweet_id, kind)
+    url = "card://{}".format(tweet_id)
+    return {"rest_id": url, "legacy": {
+        "binding_values": [{"key": key, "value": _binding_value(value, type_)} for key, value, type_ in bindings],
+        "card_platform": {"platform": {"audience": {"name": "production"}, "device": {"name": "Swift", "version": "12"}}},
+        "name": name,
+        "url": url,
+        "user_refs_results": [],
+    }}
+
+
+def legacy_card(tweet_id, kind="poll"):
+    """
+    ``card`` of an ``adaptive.json`` tweet , where the binding values are keyed by name
+    """
+
+    name, bindings = _card_bindings(tweet_id, kind)
+    return {"name": name, "url": "card://{}".format(tweet_id), "card_type_url": "http://card-type-url-is-deprecated.invalid",
+            "binding_values": {key: _binding_value(value, type_) for key, value, type_ in bindings}, "users": {}}
+
+
+def legacy_tweet(tweet_id, user_id, rnd=None, created_at=None, in_reply_to=None):
+    rnd = rnd or random.Random(tweet_id)
+    created_at = created_at or EPOCH + timedelta(seconds=int(tweet_id) % 10 ** 7)
+    text = " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(5, 30)))
+    mentions = [{"id_str": str(1000 + i), "name": "Mention {}".format(i), "screen_name": "mention{}".format(i), "indices": [0, 9]}
+                for i in range(rnd.randint(0, 2))]
+    hashtags = [{"text": rnd.choice(WORDS), "indices": [0, 5]} for _ in range(rnd.randint(0, 3))]
+    urls = [{"display_url": "example.com/{}".format(i), "expanded_url": "https://example.com/{}".format(i),
+             "url": "https://t.co/{}".format(i), "indices": [0, 23]} for i in range(rnd.randint(0, 2))]
+    tweet = {
+        "created_at": twitter_date(created_at),
+        "conversation_id_str": str(tweet_id),
+        "display_text_range": [0, len(text)],
+        "entities": {"hashtags": hashtags, "symbols": [], "urls": urls, "user_mentions": mentions},
+        "favorite_count": rnd.randint(0, 100000),
+        "favorited": False,
+        "full_text": text,
+        "is_quote_status": False,
+        "lang": "en",
+        "possibly_sensitive": False,
+        "quote_count": rnd.randint(0, 1000),
+        "reply_count": rnd.randint(0, 1000),
+        "retweet_count": rnd.randint(0, 10000),
+        "retweeted": False,
+        "user_id_str": str(user_id),
+        "id_str": str(tweet_id),
+        "source": rnd.choice(SOURCES),
+    }
+    if rnd.random() < 0.3:
+        kind = rnd.choice(["photo", "photo", "video"])
+        media = [_media(tweet_id, i, kind) for i in range(1 if kind == "video" else rnd.randint(1, 4))]
+        tweet["entities"]["media"] = media
+        tweet["extended_entities"] = {"media": media}
+    if in_reply_to:
+        tweet["in_reply_to_status_id_str"] = str(in_reply_to)
+        tweet["in_reply_to_user_id_str"] = str(user_id)
+        tweet["in_reply_to_screen_name"] = "user{}".format(user_id)
+    return tweet
+
+
+def graphql_tweet(tweet_id, user_id, rnd=None, created_at=None, in_reply_to=None, user=None, card=None):
+    rnd = rnd or random.Random(tweet_id)
+    legacy = legacy_tweet(tweet_id, user_id, rnd, created_at, in_reply_to)
+    source = legacy.pop("source")
+    tweet = {
+        "__typename": "Tweet",
+        "rest_id": str(tweet_id),
+        "core": {"user_results": {"result": user or graphql_user(user_id)}},
+        "legacy": legacy,
+        "source": source,
+        "views": {"count": str(rnd.randint(0, 10 ** 7)), "state": "EnabledWithCount"},
+    }
+    if card:
+        tweet["card"] = graphql_card(tweet_id, card)
+    return tweet
+
+
+def _tweet_entry(raw_tweet, entry_id=None):
+    return {
+        "entryId": entry_id or "tweet-{}".format(raw_tweet["rest_id"]),
+        "sortIndex": raw_tweet["rest_id"],
+        "content": {
+            "entryType": "TimelineTimelineItem",
+            "itemContent": {
+                "itemType": "TimelineTweet",
+                "tweet_results": {"result": raw_tweet},
+                "tweetDisplayType": "Tweet",
+            },
+        },
+    }
+
+
+def _cursor_entry(value, cursor_type):
+    return {
+        "entryId": "cursor-{}-{}".format(cursor_type.lower(), value),
+        "sortIndex": "0",
+        "content": {"entryType": "TimelineTimelineCursor", "value": value, "cursorType": cursor_type},
+    }
+
+
+def user_by_screen_name(user_id):
+    return {"data": {"user": {"result": graphql_user(user_id)}}}
+
+
+def user_tweets_page(user_id, page=0, count=40, seed=0, conversations=0, pinned=None, last_page=False):
+    """
+    Page of ``UserTweets`` / ``UserTweetsAndReplies`` , newest first.
+    Tweet ids decrease from page to page , like the real timeline. Some of the tweets carry a poll or a link card
+    """
+
+    rnd = random.Random("{}-{}-{}".format(seed, user_id, page))
+    author = graphql_user(user_id, random.Random(user_id))
+    top_id = 1600000000000000000 - page * count * 1000 - seed * 10 ** 9
+    entries = []
+    for i in range(count):
+        tweet_id = top_id - i * 1000
+        entries.append(_tweet_entry(graphql_tweet(tweet_id, user_id, rnd, user=author, card=_card_kind(i))))
+
+    for i in range(conversations):
+        base = top_id - count * 1000 + 500 - i * 10
+        items = []
+        for j in range(2):
+            tweet = graphql_tweet(base - j, user_id, rnd, user=author)
+            items.append({
+                "entryId": "homeConversation-{}-tweet-{}".format(base, base - j),
+                "item": {"itemContent": {"itemType": "TimelineTweet", "tweet_results": {
+                    "result": {"__typename": "TweetWithVisibilityResults", "tweet": tweet}}}},
+            })
+        entries.append({"entryId": "homeConversation-{}".format(base),
+                        "content": {"entryType": "TimelineTimelineModule", "items": items}})
+
+    entries.append(_cursor_entry("top{}".format(page), "Top"))
+    entries.append(_cursor_entry("page{}".format(page - 1 if last_page else page + 1), "Bottom"))
+    instructions = [{"type": "TimelineClearCache"}]
+    if pinned:
+        instructions.append({"type": "TimelinePinEntry",
+                             "entry": _tweet_entry(graphql_tweet(pinned, user_id, rnd, user=author))})
+    instructions.append({"type": "TimelineAddEntries", "entries": entries})
+    return {"data": {"user": {"result": {"__typename": "User", "timeline_v2": {
+        "timeline": {"instructions": instructions}}}}}}
+
+
+def search_page(keyword, page=0, count=20, seed=0, users=False, last_page=False):
+    """
+    Page of ``adaptive.json`` , ``users=True`` gives the shape of the ``users`` filter.
+    The bottom cursor of the last page is the cursor of that page , which ends a ``Search``.
+    Some of the tweets carry a poll or a link card
+    """
+
+    rnd = random.Random("{}-{}-{}".format(seed, keyword, page))
+    global_users = {}
+    global_tweets = {}
+    entries = []
+    for i in range(count):
+        user_id = rnd.randint(10 ** 6, 10 ** 9)
+        global_users[str(user_id)] = legacy_user(user_id)
+        if users:
+            entries.append({"entryId": "user-{}".format(user_id), "content": {"item": {"content": {"user": {"id": str(user_id)}}}}})
+            continue
+
+        tweet_id = 1600000000000000000 - page * count * 1000 - i * 1000
+        tweet = legacy_tweet(tweet_id, user_id, rnd)
+        tweet["id"] = tweet_id
+        tweet["user_id"] = user_id
+        if _card_kind(i):
+            tweet["card"] = legacy_card(tweet_id, _card_kind(i))
+        global_tweets[str(tweet_id)] = tweet
+        entries.append({"entryId": "sq-I-t-{}".format(tweet_id), "content": {"item": {"content": {"tweet": {"id": str(tweet_id)}}}}})
+
+    bottom = "scroll:{}-{}".format(keyword, page if last_page else page + 1)
+    if users:
+        entries.append({"entryId": "cursor-bottom-0", "content": {"operation": {"cursor": {"value": bottom, "cursorType": "Bottom"}}}})
+        instructions = [{"addEntries": {"entries": entries}}]
+    elif page == 0:
+        entries.append({"entryId": "sq-cursor-top", "content": {"operation": {"cursor": {"value": "refresh", "cursorType": "Top"}}}})
+        entries.append({"entryId": "sq-cursor-bottom", "content": {"operation": {"cursor": {"value": bottom, "cursorType": "Bottom"}}}})
+        instructions = [{"addEntries": {"entries": entries}}]
+    else:
+        instructions = [
+            {"addEntries": {"entries": entries}},
+            {"replaceEntry": {"entryIdToReplace": "sq-cursor-bottom", "entry": {
+                "entryId": "sq-cursor-bottom", "content": {"operation": {"cursor": {"value": bottom, "cursorType": "Bottom"}}}}}},
+        ]
+
+    return {"globalObjects": {"tweets": global_tweets, "users": global_users},
+            "timeline": {"id": "search-{}".format(page), "instructions": instructions}}
+
+
+def tweet_detail_page(tweet_id, replies=20, seed=0, ancestors=1, cursor=None, next_cursor=None):
+    """
+    Page of ``TweetDetail`` : the ancestors , the focal tweet and one conversation thread per reply
+    """
+
+    rnd = random.Random("{}-{}-{}".format(seed, tweet_id, cursor))
+    tweet_id = int(tweet_id)
+    entries = []
+    if not cursor:
+        parent = None
+        for i in range(ancestors, 0, -1):
+            ancestor = tweet_id - i
+            entries.append(_tweet_entry(graphql_tweet(ancestor, 100 + i, rnd, in_reply_to=parent)))
+            parent = ancestor
+        entries.append(_tweet_entry(graphql_tweet(tweet_id, 100, rnd, in_reply_to=parent)))
+
+    offset = int(cursor.split("-")[-1]) if cursor else 0
+    for i in range(replies):
+        reply_id = tweet_id + (offset + i + 1) * 10
+        reply = graphql_tweet(reply_id, rnd.randint(10 ** 6, 10 ** 9), rnd, in_reply_to=tweet_id)
+        entries.append({
+            "entryId": "conversationthread-{}".format(reply_id),
+            "sortIndex": str(reply_id),
+            "content": {"entryType": "TimelineTimelineModule", "items": [{
+                "entryId": "conversationthread-{}-tweet-{}".format(reply_id, reply_id),
+                "item": {"itemContent": {"itemType": "TimelineTweet", "tweet_results": {"result": reply},
+                                         "tweetDisplayType": "Tweet"}},
+            }]},
+        })
+
+    if next_cursor:
+        entries.append({"entryId": "cursor-bottom-{}".format(tweet_id), "sortIndex": "0", "content": {
+            "entryType": "TimelineTimelineItem",
+            "itemContent": {"itemType": "TimelineTimelineCursor", "value": next_cursor, "cursorType": "Bottom"}}})
+
+    instruction = {"type": "TimelineAddEntries", "entries": entries}
+    return {"data": {"threaded_conversation_with_injections_v2": {"instructions": [instruction]}}}
+
+
+def guest_token(value="1600000000000000000"):
+    return {"guest_token": value}
+
+
+def trends(count=10):
+    """
+    ``guide.json`` response , the trends are in the module of the second entry of the second instruction
+    """
+
+    items = [{"item": {"content": {"trend": {
+        "name": "#{}{}".format(WORDS[index % len(WORDS)], index),
+        "url": {"url": "twitter://search/?query=%23{}{}".format(WORDS[index % len(WORDS)], index)},
+        "trendMetadata": {"metaDescription": "{:,} Tweets".format((index + 1) * 1000)},
+    }}}} for index in range(count)]
+    entries = [{"entryId": "trends-header", "content": {}}, {"entryId": "trends", "content": {"timelineModule": {"items": items}}}]
+    return {"timeline": {"instructions": [{"clearCache": {}}, {"addEntries": {"entries": entries}}]}}
+
+
+def users_lookup(user_ids=(), screen_names=()):
+    """
+    ``UsersByRestIds`` / ``UsersByScreenNames`` response , a screen name ``userN`` belongs to the user with id N.
+    Names not of that form come back unavailable.
+    """
+
+    users = [{"result": graphql_user(user_id)} for user_id in user_ids]
+    for screen_name in screen_names:
+        user_id = screen_name[4:] if screen_name.lower().startswith("user") else ""
+        users.append({"result": graphql_user(int(user_id))} if user_id.isdigit() else {"result": {"__typename": "UserUnavailable"}})
+
+    return {"data": {"users": users}}
@@ -0,0 +1,187 @@
+"""
+Load test : N concurrent Tweety clients crawling the stand-in server , throughput and p50/p99 latency per endpoint.
+
+    python benchmarks/loadtest.py [--clients 8] [--iterations 2] [--pages 3] [--latency 0.02] [--rate-limit 30 --window 2] [--async]
+
+The clients send their requests to twitter.com as usual , a transport rewrites them to the stand-in server.
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+import server
+from tweety.bot import Tweety, AsyncTweety
+from tweety.ratelimit import get_endpoint
+
+
+class LatencyRecorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, endpoint, seconds, status_code):
+        with self._lock:
+            self.latencies[endpoint].append(seconds)
+            self.statuses[status_code] += 1
+
+    def report(self):
+        everything = [seconds for latencies in self.latencies.values() for seconds in latencies]
+        rows = {endpoint: _summary(latencies) for endpoint, latencies in sorted(self.latencies.items())}
+        rows["all"] = _summary(everything)
+        return rows
+
+
+def _percentile(values, percent):
+    # nearest rank
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, int(round(percent / 100 * len(ordered) + 0.5)) - 1))]
+
+
+def _summary(latencies):
+    return {"count": len(latencies), "p50": _percentile(latencies, 50), "p99": _percentile(latencies, 99)} if latencies else {"count": 0}
+
+
+class RewriteTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    def __init__(self, base_url, recorder):
+        """
+        Sends every request to `base_url` instead of its own host , keeping the path and the query
+
+        :param base_url: (`str`) e.g. `http://127.0.0.1:8080`
+        :param recorder: (`LatencyRecorder`) Gets the latency of every request , its body included
+        """
+
+        self.base_url = httpx.URL(base_url)
+        self.recorder = recorder
+        self._transport = httpx.HTTPTransport()
+        self._async_transport = httpx.AsyncHTTPTransport()
+
+    def _rewrite(self, request):
+        request.url = request.url.copy_with(scheme=self.base_url.scheme, host=self.base_url.host, port=self.base_url.port)
+        request.headers["host"] = request.url.netloc.decode()
+        return get_endpoint(request.url), time.perf_counter()
+
+    def handle_request(self, request):
+        endpoint, start = self._rewrite(request)
+        response = self._transport.handle_request(request)
+        response.read()
+        self.recorder.add(endpoint, time.perf_counter() - start, response.status_code)
+        return response
+
+    async def handle_async_request(self, request):
+        endpoint, start = self._rewrite(request)
+        response = await self._async_transport.handle_async_request(request)
+        await response.aread()
+        self.recorder.add(endpoint, time.perf_counter() - start, response.status_code)
+        return response
+
+    def close(self):
+        # The sessions of every guest token share the transport , see shutdown
+        pass
+
+    async def aclose(self):
+        pass
+
+    def shutdown(self):
+        self._transport.close()
+
+    async def ashutdown(self):
+        await self._async_transport.aclose()
+
+
+def crawl(index, args, url, recorder):
+    transport = RewriteTransport(url, recorder)
+    app = Tweety(transport=transport, token_pool_size=args.tokens)
+    items = 0
+    try:
+        for _ in range(args.iterations):
+            user = app.get_user("user{}".format(index + 1))
+            for page in app.paginate_tweets(user.rest_id, pages=args.pages, wait_time=0):
+                items += len(page)
+            for page in app.paginate_search("python{}".format(index), pages=args.pages, wait_time=0):
+                items += len(page)
+            items += len(app.get_trends())
+            for page in app.iter_replies(str(1600000000000000000 - index), max_pages=args.pages).get_replies_page_iterator():
+                items += len(page)
+    finally:
+        app.request.close()
+        transport.shutdown()
+    return items
+
+
+async def crawl_async(index, args, url, recorder):
+    items = 0
+    transport = RewriteTransport(url, recorder)
+    async with AsyncTweety(transport=transport, token_pool_size=args.tokens) as app:
+        for _ in range(args.iterations):
+            user = await app.get_user("user{}".format(index + 1))
+            async for page in app.paginate_tweets(user.rest_id, pages=args.pages, wait_time=0):
+                items += len(page)
+            async for page in app.paginate_search("python{}".format(index), pages=args.pages, wait_time=0):
+                items += len(page)
+            async for page in app.iter_replies(str(1600000000000000000 - index), max_pages=args.pages).get_replies_page_iterator_async():
+                items += len(page)
+    await transport.ashutdown()
+    return items
+
+
+def run(args, url):
+    recorder = LatencyRecorder()
+    start = time.perf_counter()
+    if args.use_async:
+        async def main():
+            return await asyncio.gather(*[crawl_async(index, args, url, recorder) for index in range(args.clients)])
+
+        items = sum(asyncio.run(main()))
+    else:
+        with ThreadPoolExecutor(max_workers=args.clients) as executor:
+            items = sum(executor.map(lambda index: crawl(index, args, url, recorder), range(args.clients)))
+
+    return time.perf_counter() - start, items, recorder
+
+
+def main():
+    argParser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argParser.add_argument("--clients", type=int, default=8)
+    argParser.add_argument("--iterations", type=int, default=2)
+    argParser.add_argument("--pages", type=int, default=3)
+    argParser.add_argument("--tokens", type=int, default=1, help="guest tokens per client")
+    argParser.add_argument("--latency", type=float, default=0.02)
+    argParser.add_argument("--jitter", type=float, default=0.0)
+    argParser.add_argument("--rate-limit", type=int, default=None)
+    argParser.add_argument("--window", type=int, default=2)
+    argParser.add_argument("--token-ttl", type=float, default=None)
+    argParser.add_argument("--url", help="an already running stand-in server , one is started otherwise")
+    argParser.add_argument("--async", dest="use_async", action="store_true", help="use AsyncTweety clients")
+    args = argParser.parse_args()
+
+    stand_in = None
+    url = args.url
+    if url is None:
+        stand_in = server.serve(latency=args.latency, jitter=args.jitter, rate_limit=args.rate_limit, window=args.window,
+                                token_ttl=args.token_ttl, timeline_pages=args.pages + 1, search_pages=args.pages + 1)
+        url = stand_in.url
+
+    try:
+        elapsed, items, recorder = run(args, url)
+    finally:
+        if stand_in is not None:
+            stand_in.shutdown()
+
+    requests = sum(recorder.statuses.values())
+    print(f"{args.clients} clients , {elapsed:.2f}s , {requests / elapsed:,.1f} requests/sec , {items / elapsed:,.1f} items/sec")
+    print(f"statuses {dict(recorder.statuses)}" + (f" , server {stand_in.state.snapshot()}" if stand_in else ""))
+    print(f"{'endpoint':<22} {'requests':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for endpoint, summary in recorder.report().items():
+        if summary["count"]:
+            print(f"{endpoint:<22} {summary['count']:>9} {summary['p50'] * 1000:>9.1f} {summary['p99'] * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
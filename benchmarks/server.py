@@ -0,0 +1,256 @@
+"""
+Local stand-in for the endpoints ``UrlBuilder`` targets , serving the synthetic pages of fixtures.py.
+
+    python benchmarks/server.py [--port 8080] [--latency 0.05] [--rate-limit 50 --window 60] [--token-ttl 300]
+
+Latency , rate limits (429 with the x-rate-limit-* headers) and guest token expiry (403) are simulated.
+Any path ending with a known endpoint is served , so a client only needs its host rewritten (see loadtest.py).
+"""
+
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import fixtures
+
+
+class StandInConfig:
+    def __init__(self, latency=0.0, jitter=0.0, rate_limit=None, window=900, token_ttl=None, timeline_pages=10,
+                 search_pages=10, detail_replies=40, replies_per_page=20, page_size=40):
+        """
+        :param latency: (`float`) Seconds every response is delayed by
+        :param jitter: (`float`) Up to this many seconds are added at random to the latency
+        :param rate_limit: (`int`) Requests per window per guest token and endpoint , None for no limit
+        :param window: (`int`) Seconds of a rate limit window
+        :param token_ttl: (`float`) Seconds a guest token is accepted for , None to never expire them
+        :param timeline_pages: (`int`) Pages of every user timeline
+        :param search_pages: (`int`) Pages of every search
+        :param detail_replies: (`int`) Replies of every conversation
+        :param replies_per_page: (`int`) Replies of a TweetDetail page
+        :param page_size: (`int`) Tweets of a timeline page
+        """
+
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.window = window
+        self.token_ttl = token_ttl
+        self.timeline_pages = timeline_pages
+        self.search_pages = search_pages
+        self.detail_replies = detail_replies
+        self.replies_per_page = replies_per_page
+        self.page_size = page_size
+
+
+class StandInState:
+    def __init__(self, config):
+        self.config = config
+        self.requests = 0
+        self.throttled = 0
+        self.expired = 0
+        self._tokens = {}
+        self._windows = {}
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def issue_token(self):
+        with self._lock:
+            token = str(1600000000000000000 + next(self._counter))
+            self._tokens[token] = time.monotonic()
+            return token
+
+    def check(self, token, endpoint):
+        """
+        :return: (`int`, `dict`) The status to answer with and the rate limit headers
+        """
+
+        config = self.config
+        with self._lock:
+            self.requests += 1
+            issued_at = self._tokens.get(token)
+            if issued_at is None or (config.token_ttl is not None and time.monotonic() - issued_at > config.token_ttl):
+                self.expired += 1
+                return 403, {}
+
+            if config.rate_limit is None:
+                return 200, {}
+
+            now = time.time()
+            reset, used = self._windows.get((token, endpoint), (0, 0))
+            if now >= reset:
+                reset, used = int(now) + config.window, 0
+
+            headers = {"x-rate-limit-limit": str(config.rate_limit), "x-rate-limit-reset": str(reset)}
+            if used >= config.rate_limit:
+                self.throttled += 1
+                headers["x-rate-limit-remaining"] = "0"
+                return 429, headers
+
+            self._windows[(token, endpoint)] = (reset, used + 1)
+            headers["x-rate-limit-remaining"] = str(config.rate_limit - used - 1)
+            return 200, headers
+
+    def snapshot(self):
+        return {"requests": self.requests, "throttled": self.throttled, "expired": self.expired, "tokens": len(self._tokens)}
+
+
+def _user_id(screen_name):
+    # "userN" is the user with id N , like fixtures.users_lookup , any other name gets a stable id
+    name = str(screen_name).lower()
+    if name.startswith("user") and name[4:].isdigit():
+        return int(name[4:])
+
+    return zlib.crc32(name.encode()) + 10 ** 6
+
+
+def _page_of(cursor, prefix):
+    try:
+        return int(str(cursor).split(prefix)[-1]) if cursor else 0
+    except ValueError:
+        return 0
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        self._serve("POST")
+
+    def do_GET(self):
+        self._serve("GET")
+
+    def _serve(self, method):
+        state = self.server.state
+        config = state.config
+        length = int(self.headers.get("content-length") or 0)
+        if length:
+            self.rfile.read(length)
+
+        if config.latency or config.jitter:
+            time.sleep(config.latency + random.random() * config.jitter)
+
+        url = urlsplit(self.path)
+        endpoint = url.path.rsplit("/", 1)[-1]
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        variables = json.loads(query.get("variables", "{}"))
+
+        if endpoint == "activate.json":
+            return self._send(200, fixtures.guest_token(state.issue_token()))
+
+        if endpoint == "init.json":
+            return self._send(200, {})
+
+        status, headers = state.check(self.headers.get("x-guest-token"), endpoint)
+        if status == 403:
+            return self._send(403, {"errors": [{"code": 239, "message": "Bad guest token."}]}, headers)
+
+        if status == 429:
+            return self._send(429, {"errors": [{"code": 88, "message": "Rate limit exceeded."}]}, headers)
+
+        payload = self._payload(endpoint, query, variables, config)
+        if payload is None:
+            return self._send(404, {"errors": [{"code": 34, "message": "Sorry, that page does not exist."}]}, headers)
+
+        return self._send(200, payload, headers)
+
+    @staticmethod
+    def _payload(endpoint, query, variables, config):
+        if endpoint == "UserByScreenName":
+            return fixtures.user_by_screen_name(_user_id(variables.get("screen_name")))
+
+        if endpoint == "UsersByRestIds":
+            return fixtures.users_lookup(user_ids=[int(user_id) for user_id in variables.get("userIds", [])])
+
+        if endpoint == "UsersByScreenNames":
+            return fixtures.users_lookup(screen_names=variables.get("screen_names", []))
+
+        if endpoint in ("UserTweets", "UserTweetsAndReplies"):
+            page = _page_of(variables.get("cursor"), "page")
+            return fixtures.user_tweets_page(variables.get("userId"), page, count=config.page_size,
+                                             conversations=2 if endpoint == "UserTweetsAndReplies" else 0,
+                                             last_page=page >= config.timeline_pages - 1)
+
+        if endpoint == "adaptive.json":
+            page = _page_of(query.get("cursor"), "-")
+            return fixtures.search_page(query.get("q"), page, users=query.get("result_filter") == "user",
+                                        last_page=page >= config.search_pages - 1)
+
+        if endpoint == "guide.json":
+            return fixtures.trends()
+
+        if endpoint == "TweetDetail":
+            cursor = variables.get("cursor")
+            offset = _page_of(cursor, "-")
+            replies = max(0, min(config.replies_per_page, config.detail_replies - offset))
+            next_offset = offset + config.replies_per_page
+            next_cursor = "bottom-{}".format(next_offset) if next_offset < config.detail_replies else None
+            return fixtures.tweet_detail_page(variables.get("focalTweetId"), replies=replies, cursor=cursor, next_cursor=next_cursor)
+
+        return None
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), config=None):
+        super().__init__(address, StandInHandler)
+        self.state = StandInState(config or StandInConfig())
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+
+def serve(host="127.0.0.1", port=0, **config):
+    """
+    Start a stand-in server on a background thread
+
+    :return: StandInServer , call `shutdown()` to stop it
+    """
+
+    server = StandInServer((host, port), StandInConfig(**config))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    argParser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argParser.add_argument("--host", default="127.0.0.1")
+    argParser.add_argument("--port", type=int, default=8080)
+    argParser.add_argument("--latency", type=float, default=0.0)
+    argParser.add_argument("--jitter", type=float, default=0.0)
+    argParser.add_argument("--rate-limit", type=int, default=None)
+    argParser.add_argument("--window", type=int, default=900)
+    argParser.add_argument("--token-ttl", type=float, default=None)
+    args = argParser.parse_args()
+
+    server = StandInServer((args.host, args.port), StandInConfig(args.latency, args.jitter, args.rate_limit, args.window, args.token_ttl))
+    print("serving on {}".format(server.url))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(server.state.snapshot())
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,12 @@ setup(
         'dateutils',
         'pytest'
     ],
+    extras_require={
+        'fast': ['orjson'],
+        'xlsx': ['openpyxl'],
+        'parquet': ['pyarrow'],
+        'zstd': ['zstandard'],
+    },
     classifiers=[
         'Development Status :: 4 - Beta',
         'Intended Audience :: Developers',
@@ -0,0 +1,325 @@
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import time
+from .builder import get_variables
+from .ratelimit import get_endpoint
+from .utils import json_loads
+from .types.page import Page
+from .types.usertweet import UserTweets
+from .types.search import Search
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Bytes a segment file grows to before the next payload goes to a new one
+ARCHIVE_SEGMENT_SIZE = 64 * 1024 * 1024
+
+# The index is committed once this many payloads were added , or once the oldest uncommitted one is this many seconds old
+ARCHIVE_COMMIT_EVERY = 100
+ARCHIVE_COMMIT_INTERVAL = 5
+
+# The endpoints `replay_pages` knows how to parse
+REPLAY_ENDPOINTS = ("UserTweets", "UserTweetsAndReplies", "adaptive.json")
+
+# `Search` filter of the query parameters of an archived search
+_SEARCH_FILTERS = {("tweet_search_mode", "live"): "latest", ("result_filter", "user"): "users",
+                   ("result_filter", "image"): "photos", ("result_filter", "video"): "videos"}
+
+# The variables ArchiveReplay matches a request on , per endpoint
+_REPLAY_VARIABLES = {"UserTweets": ("userId",), "UserTweetsAndReplies": ("userId",),
+                     "adaptive.json": ("q", "tweet_search_mode", "result_filter"), "TweetDetail": ("focalTweetId",)}
+
+
+class PayloadArchive:
+    def __init__(self, directory, compression="gzip", segment_size=ARCHIVE_SEGMENT_SIZE, commit_every=ARCHIVE_COMMIT_EVERY,
+                 commit_interval=ARCHIVE_COMMIT_INTERVAL):
+        """
+        Keeps the raw body of every response , so a crawl can be parsed again without requesting it again
+
+        Each body is compressed on its own and appended to the current segment file , a segment is a valid
+        multi-member gzip (or multi-frame zstd) file. `index.db` tells where every body is , with its endpoint ,
+        cursor , variables and time. The index is committed in batches , `flush` or `close` commits the rest
+
+        :param directory: (`str`) Where the segments and the index are kept , created when missing
+        :param compression: (`str`) `gzip` , or `zstd` when zstandard is installed
+        :param segment_size: (`int`) Bytes a segment grows to before a new one is started
+        :param commit_every: (`int`) Payloads added before the index is committed
+        :param commit_interval: (`float`) Most seconds an added payload waits for the index to be committed
+        """
+
+        if compression not in ("gzip", "zstd"):
+            raise ValueError(f"Unknown compression {compression} , use gzip or zstd")
+
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("zstd compression needs zstandard , install it with `pip install zstandard`")
+
+        self.directory = directory
+        self.compression = compression
+        self.segment_size = segment_size
+        self.commit_every = max(1, int(commit_every))
+        self.commit_interval = commit_interval
+        self._uncommitted = 0
+        self._first_uncommitted = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(directory, "index.db"), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS payloads (id INTEGER PRIMARY KEY, endpoint TEXT NOT NULL, cursor TEXT, variables TEXT, "
+            "status INTEGER, time REAL NOT NULL, segment TEXT NOT NULL, offset INTEGER NOT NULL, length INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS payloads_endpoint ON payloads (endpoint, time)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS payloads_cursor ON payloads (endpoint, cursor)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS payloads_time ON payloads (time)")
+        self._db.commit()
+        self._segment = self._last_segment()
+
+    def __repr__(self):
+        return f"PayloadArchive(directory={self.directory}, compression={self.compression})"
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM payloads").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def _suffix(self):
+        return ".gz" if self.compression == "gzip" else ".zst"
+
+    def _last_segment(self):
+        segments = sorted(name for name in os.listdir(self.directory) if name.startswith("segment-") and name.endswith(self._suffix))
+        return segments[-1] if segments else self._segment_name(0)
+
+    def _segment_name(self, number):
+        return f"segment-{number:06d}{self._suffix}"
+
+    def _rotate(self):
+        path = os.path.join(self.directory, self._segment)
+        if os.path.exists(path) and os.path.getsize(path) >= self.segment_size:
+            self._segment = self._segment_name(int(self._segment.split("-")[1].split(".")[0]) + 1)
+
+    def _compress(self, content):
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor().compress(content)
+
+        return gzip.compress(content)
+
+    @staticmethod
+    def _decompress(segment, data):
+        if segment.endswith(".zst"):
+            return zstandard.ZstdDecompressor().decompress(data)
+
+        return gzip.decompress(data)
+
+    def add(self, url, content, status_code=200):
+        """
+        Append one response body
+
+        :param url: (`str`) The request url , the endpoint , variables and cursor are read from it
+        :param content: (`bytes`) The raw body
+        :param status_code: (`int`) The status of the response
+
+        :return: int , id of the entry
+        """
+
+        variables = get_variables(url)
+        data = self._compress(content)
+        with self._lock:
+            self._rotate()
+            with open(os.path.join(self.directory, self._segment), "ab") as f:
+                offset = f.tell()
+                f.write(data)
+
+            cursor = self._db.execute(
+                "INSERT INTO payloads (endpoint, cursor, variables, status, time, segment, offset, length) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (get_endpoint(url), variables.get("cursor"), json.dumps(variables), status_code, time.time(), self._segment, offset, len(data))
+            )
+            self._uncommitted += 1
+            if self._first_uncommitted is None:
+                self._first_uncommitted = time.monotonic()
+            if self._uncommitted >= self.commit_every or time.monotonic() - self._first_uncommitted >= self.commit_interval:
+                self._commit()
+
+        return cursor.lastrowid
+
+    def flush(self):
+        """
+        Commit the index of the payloads added since the last commit
+        """
+
+        with self._lock:
+            self._commit()
+
+    def _commit(self):
+        if self._uncommitted:
+            self._db.commit()
+            self._uncommitted = 0
+            self._first_uncommitted = None
+
+    def entries(self, endpoints=None, since=None, until=None, **where):
+        """
+        :param endpoints: ([`str`]) Only the entries of these endpoints , e.g. `UserTweets` or `adaptive.json`
+        :param since: (`float`) Only the entries archived at or after this epoch time
+        :param until: (`float`) Only the entries archived before this epoch time
+        :param where: Only the entries whose column equals the value , e.g. `cursor=None` for the first pages
+
+        :return: list of dict , the index rows in the order they were archived
+        """
+
+        query, params = "SELECT * FROM payloads WHERE 1 = 1", []
+        for column, value in where.items():
+            if column not in ("cursor", "status", "segment"):
+                raise ValueError(f"Can't filter on {column}")
+            query += f" AND {column} IS ?"
+            params.append(value)
+        if endpoints:
+            query += " AND endpoint IN ({})".format(", ".join("?" * len(endpoints)))
+            params += list(endpoints)
+        if since is not None:
+            query += " AND time >= ?"
+            params.append(since)
+        if until is not None:
+            query += " AND time < ?"
+            params.append(until)
+
+        with self._lock:
+            cursor = self._db.execute(query + " ORDER BY id", params)
+            columns = [column[0] for column in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor]
+
+        for row in rows:
+            row["variables"] = json_loads(row["variables"]) if row["variables"] else {}
+
+        return rows
+
+    def read(self, entry):
+        """
+        :param entry: (`dict`) An index row returned by `entries`
+
+        :return: bytes , the raw body
+        """
+
+        with open(os.path.join(self.directory, entry["segment"]), "rb") as f:
+            return self._read(f, entry)
+
+    def _read(self, f, entry):
+        f.seek(entry["offset"])
+        return self._decompress(entry["segment"], f.read(entry["length"]))
+
+    def payloads(self, endpoints=None, since=None, until=None, loads=json_loads):
+        """
+        Same as `entries` , with the decoded payload of every entry
+
+        :return: generator of (`dict`, `dict`) , the index row and its payload
+        """
+
+        f = None
+        try:
+            # the entries come in the order they were written , a segment is opened once
+            for entry in self.entries(endpoints, since, until):
+                if f is None or f.name != os.path.join(self.directory, entry["segment"]):
+                    if f is not None:
+                        f.close()
+                    f = open(os.path.join(self.directory, entry["segment"]), "rb")
+
+                yield entry, loads(self._read(f, entry))
+        finally:
+            if f is not None:
+                f.close()
+
+    def close(self):
+        with self._lock:
+            self._commit()
+            self._db.close()
+
+
+class ArchiveReplay:
+    def __init__(self, archive, loads=json_loads):
+        """
+        Serves the archived payloads in place of a `Request` , so `UserTweets` and `Search` run without any network.
+        Every request is answered with the latest payload archived for the same endpoint , variables and cursor ,
+        out of the payloads archived before the replay was created
+
+        :param archive: (`PayloadArchive`) The archive to read
+        :param loads: (`callable`) Decoder for the bodies
+        """
+
+        self.archive = archive
+        self.loads = loads
+        self._entries = self._index()
+
+    def __repr__(self):
+        return f"ArchiveReplay(archive={self.archive})"
+
+    def _index(self):
+        # Read once , a request is then a dict lookup instead of a scan of the index rows
+        entries = {}
+        for entry in self.archive.entries(list(_REPLAY_VARIABLES)):
+            entries[_replay_key(entry["endpoint"], entry["cursor"], entry["variables"])] = entry
+
+        return entries
+
+    def _find(self, endpoint, cursor, variables, raw=False):
+        entry = self._entries.get(_replay_key(endpoint, cursor, variables))
+        if entry is None:
+            return None
+
+        content = self.archive.read(entry)
+        return content if raw else self.loads(content)
+
+    def get_tweets(self, user_id, replies=False, cursor=None, raw=False):
+        return self._find("UserTweetsAndReplies" if replies else "UserTweets", cursor, {"userId": str(user_id)}, raw)
+
+    def perform_search(self, keyword, cursor, filter_, raw=False):
+        # the same query parameters `Request.perform_search` sends
+        if keyword.startswith("#"):
+            keyword = f"%23{keyword[1:]}"
+
+        variables = {"q": keyword, "tweet_search_mode": None, "result_filter": None}
+        variables.update({key: expected for (key, expected), name in _SEARCH_FILTERS.items() if name == filter_})
+        return self._find("adaptive.json", cursor, variables, raw)
+
+    def get_tweet_detail(self, tweetId, cursor=None):
+        return self._find("TweetDetail", cursor, {"focalTweetId": str(tweetId)})
+
+
+def _replay_key(endpoint, cursor, variables):
+    return endpoint, cursor, tuple(variables.get(name) for name in _REPLAY_VARIABLES[endpoint])
+
+
+def replay_pages(archive, since=None, until=None, lazy=False):
+    """
+    Parse every archived UserTweets , UserTweetsAndReplies and search page again , in the order they were archived
+
+    :param archive: (`PayloadArchive`) The archive to read
+    :param since: (`float`) Only the pages archived at or after this epoch time
+    :param until: (`float`) Only the pages archived before this epoch time
+    :param lazy: (`boolean`) Build the tweets lazily
+
+    :return: generator of (`dict`, `.types.page.Page`) , the index row and the parsed page
+    """
+
+    http = ArchiveReplay(archive)
+    for entry, payload in archive.payloads(REPLAY_ENDPOINTS, since, until, http.loads):
+        if entry["status"] != 200 or not payload:
+            continue
+
+        variables = entry["variables"]
+        if entry["endpoint"] == "adaptive.json":
+            filter_ = next((value for (key, expected), value in _SEARCH_FILTERS.items() if variables.get(key) == expected), None)
+            search = Search(variables.get("q"), http, 0, filter_, 0, entry["cursor"], lazy, False)
+            results = search._parse_response(payload)
+            yield entry, Page(results, search.cursor, search.is_next_page)
+        else:
+            tweets = UserTweets(variables.get("userId"), http, entry["endpoint"] == "UserTweetsAndReplies", 0, cursor=entry["cursor"], lazy=lazy)
+            results = tweets._parse_page(payload, tweets._get_entries(payload))
+            yield entry, Page(results, tweets.cursor, tweets.is_next_page)
@@ -1,9 +1,22 @@
+import asyncio
 import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from .exceptions_ import *
-from .http import Request
-from .types.usertweet import UserTweets
+from .http import Request, AsyncRequest
+from .cache import UserCache
+from .checkpoint import Checkpoint, track, track_async
+from .profiling import Profile
+from .types.usertweet import UserTweets, TimelineResult
 from .types.search import Search
 from .types.twDataTypes import User, Trends, Tweet
+from .types.conversation import ConversationResolver
+from .types.replies import TweetReplies
+
+# Most users the UsersByRestIds / UsersByScreenNames endpoints are asked for in one request
+USERS_BATCH_SIZE = 100
+
+# Marks a string as a rest id , e.g. "id:44196397" , a bare string of digits may as well be a username
+USER_ID_PREFIX = "id:"
 
 
 def valid_profile(f):
@@ -26,25 +39,51 @@ def valid_profile(f):
     return wrapper
 
 
-class Tweety:
-    def __init__(self, max_retries: int = 10, proxy: dict = None):
+class _TweetyBase:
+    # The http client of the class , Request or AsyncRequest
+    _REQUEST = None
+
+    def __init__(self, max_retries: int = 10, proxy: dict = None, json_loads=None, lazy: bool = False, token_pool_size: int = 1,
+                 user_cache: UserCache = None, checkpoint_store=None, archive=None,
+                 transport=None, hooks=None, profile=False, parse_pool=None):
         """
-        Initialize the Twitter Class
+        Initialize the Twitter Class , Tweety makes its requests through `httpx.Client` sessions and AsyncTweety through `httpx.AsyncClient` ones
 
         :param max_retries: (`int`) Number of retries the script would make , if the guest token wasn't found
         :param proxy: (`dict`) Provide the proxy you want to use while making a request
+        :param json_loads: (`callable`) Decoder for the response bodies , orjson is used when installed and stdlib json otherwise
+        :param lazy: (`boolean`) Build the fields of the returned Tweet and User objects on first access instead of up front
+        :param token_pool_size: (`int`) Number of guest tokens to rotate through , each one with its own session
+        :param user_cache: (`.cache.UserCache`) Where the username -> rest id mappings are remembered , nothing is cached when None
+        :param checkpoint_store: (`.checkpoint.FileCheckpointStore` | `.checkpoint.SQLiteCheckpointStore`) Where the named jobs of `paginate_tweets` and `paginate_search` are saved
+        :param archive: (`.archive.PayloadArchive`) Where the raw body of every response is kept , nothing is kept when None
+        :param transport: (`httpx.BaseTransport` | `httpx.AsyncBaseTransport`) Sends the requests of every session , e.g. a `.transport.CassetteTransport`
+        :param hooks: (`.hooks.Hooks`) Callbacks called around every request , e.g. the `hooks` of a `.metrics.MetricsCollector`
+        :param profile: (`boolean` | `.profiling.Profile`) Time the network , decode , build and sleep phases of every page
+                        of the timelines and the searches into `profile` , pass a Profile to share one between clients
+        :param parse_pool: (`.parallel.ParsePool`) Worker processes the timeline and search pages are built in ,
+                           their results are then `.types.records.TweetRecord` / `UserRecord` in place of Tweet / User
         """
 
         self.max_retries = max_retries
-        if proxy and proxy is not None:
-            if proxy.get("http") and proxy.get("https"):
-                self.proxy = dict(http=proxy['http'], https=proxy['https'])
-            else:
-                raise ProxyParseError()
-        else:
-            self.proxy = None
+        self.lazy = lazy
+        self.user_cache = user_cache
+        self.checkpoint_store = checkpoint_store
+        self.profile = Profile() if profile is True else profile or None
+        self.parse_pool = parse_pool
+        self.proxy = _parse_proxy(proxy)
+
+        self.request = self._REQUEST(max_retries=self.max_retries, proxy=self.proxy, json_loads=json_loads, pool_size=token_pool_size,
+                                     archive=archive, transport=transport, hooks=hooks)
+
+    # The public methods are documented here once , Tweety and AsyncTweety only implement how their requests are made
 
-        self.request = Request(max_retries=self.max_retries, proxy=self.proxy)
+    def close(self):
+        """
+        Stop the guest token refresh and close the underlying `httpx.Client` / `httpx.AsyncClient` sessions
+        """
+
+        raise NotImplementedError
 
     def get_user(self, screen_name: str):
         """
@@ -53,38 +92,40 @@ class Tweety:
         :param screen_name: (`str`) Profile URL or The Username of the user you are dealing with
         """
 
-        user = self.request.get_user_by_sceen_name(screen_name)
-        if user:
-            return User(user)
-        raise UserNotFound("User {} not Found".format(screen_name))
+        raise NotImplementedError
 
-    @property
-    def user_id(self):
+    def get_users(self, screen_names_or_ids, batch_size: int = USERS_BATCH_SIZE):
         """
-        Get the user unique twitter id
+        Get many users with one request per `batch_size` users instead of one request per user , AsyncTweety requests the batches at once
 
-        :return: int
+        :param screen_names_or_ids: ([`str` | `int`]) Usernames or rest ids of the users , an `int` or an "id:" prefixed string is a rest id ,
+                                    a string of digits is looked up as a rest id and then as a username
+        :param batch_size: (`int`) Number of users asked for in one request
+
+        :return: dict of .types.twDataTypes.User keyed by the given username or rest id , the users which weren't found are left out
         """
 
-        return self.user.rest_id
+        raise NotImplementedError
 
-    def paginate_tweets(self, user_id: str, pages: int = 1, replies: bool = False, wait_time: int = 2, cursor: str = None):
+    def paginate_tweets(self, user_id: str, pages: int = 1, replies: bool = False, wait_time: int = 0, cursor: str = None, since_id: str = None,
+                        job: str = None):
         """
-        Get the tweets from a user
+        Get the tweets from a user , page by page
 
+        :param user_id: (`str`) The rest id or the username of the user , a cached username costs no request
         :param pages: (`int`) number of pages to be scraped
         :param replies: (`boolean`) get the replied tweets of the user too
         :param wait_time: (`int`) seconds to wait between multiple requests
         :param cursor: Pagination cursor if you want to get the pages from that cursor up-to (This cursor is different from actual API cursor)
+        :param since_id: (`str`) Id of the newest tweet already known , only newer tweets are returned and the pagination stops once it is reached
+        :param job: (`str`) Name of the job , its checkpoint is saved after every page and the job resumes from it when it is run again
 
-
-        :return: .types.usertweet.UserTweets
+        :return: generator of .types.page.Page , an async generator for AsyncTweety
         """
 
-        userTweets = UserTweets(user_id, self.request, replies, wait_time, cursor)
-        return userTweets.get_tweets_page_iterator(pages)
+        raise NotImplementedError
 
-    def get_tweets(self, pages: int = 1, replies: bool = False, wait_time: int = 2, cursor: str = None):
+    def get_tweets(self, pages: int = 1, replies: bool = False, wait_time: int = 0, cursor: str = None, user_id: str = None, since_id: str = None):
         """
         Get the tweets from a user
 
@@ -92,39 +133,32 @@ class Tweety:
         :param replies: (`boolean`) get the replied tweets of the user too
         :param wait_time: (`int`) seconds to wait between multiple requests
         :param cursor: Pagination cursor if you want to get the pages from that cursor up-to (This cursor is different from actual API cursor)
+        :param user_id: (`str`) The rest id or the username of the user , a cached username costs no request. AsyncTweety has no profile
+                        to fall back on and needs it
+        :param since_id: (`str`) Id of the newest tweet already known , only newer tweets are returned and the pagination stops once it is reached
 
 
-        :return: .types.usertweet.UserTweets
+        :return: .types.usertweet.UserTweets , a list of .types.twDataTypes.Tweet for AsyncTweety
         """
-        if wait_time is None:
-            wait_time = 0
 
-        return UserTweets(self.user_id, self.request, replies, wait_time, cursor).get_tweets(pages)
+        raise NotImplementedError
 
-    def get_trends(self):
+    def sync_tweets(self, user_id: str, since_id: str = None, max_pages: int = 50, replies: bool = False, wait_time: int = 0):
         """
-        Get the Trends from you locale
+        Get the tweets a user posted since the last sync
 
-        :return:list of .types.twDataTypes.Trends
+        :param user_id: (`str`) The rest id or the username of the user
+        :param since_id: (`str`) The id returned by the last sync , None for the first one
+        :param max_pages: (`int`) Most pages to request , the sync usually stops long before
+        :param replies: (`boolean`) get the replied tweets of the user too
+        :param wait_time: (`int`) seconds to wait between multiple requests
+
+        :return: ([.types.twDataTypes.Tweet], `str`) The new tweets and the id to pass as `since_id` to the next sync
         """
-        trends = []
-        response = self.request.get_trends()
-        for i in response.json()['timeline']['instructions'][1]['addEntries']['entries'][1]['content']['timelineModule']['items']:
-            data = {
-                "name": i['item']['content']['trend']['name'],
-                "url": str(i['item']['content']['trend']['url']['url']).replace("twitter://",
-                                                                                "https://twitter.com/").replace("query",
-                                                                                                                "q"),
-            }
-            try:
-                if i['item']['content']['trend']['trendMetadata']['metaDescription']:
-                    data['tweet_count'] = i['item']['content']['trend']['trendMetadata']['metaDescription']
-            except:
-                pass
-            trends.append(Trends(data))
-        return trends
 
-    def search(self, keyword: str, pages: int = 1, filter_: str = None, wait_time: int = 2, cursor: str = None):
+        raise NotImplementedError
+
+    def search(self, keyword: str, pages: int = 1, filter_: str = None, wait_time: int = 0, cursor: str = None):
         """
         Search for a keyword or hashtag on Twitter
 
@@ -139,10 +173,28 @@ class Tweety:
 
         :return: .types.search.Search
         """
-        if wait_time is None:
-            wait_time = 0
 
-        return Search(keyword, self.request, pages, filter_, wait_time, cursor)
+        raise NotImplementedError
+
+    def paginate_search(self, keyword: str, pages: int = 1, filter_: str = None, wait_time: int = 0, cursor: str = None, keep_history: bool = False,
+                        job: str = None):
+        """
+        Search for a keyword or hashtag on Twitter , page by page as the pages arrive
+
+        :param keyword: (`str`) The keyword which is supposed to be searched
+        :param pages: (`int`) The number of pages to get
+        :param filter_: (
+           `str`| `filters.SearchFilters.Users()`| `filters.SearchFilters.Latest()` | `filters.SearchFilters.Photos()` | `filters.SearchFilters.Videos()`
+        )
+        :param wait_time : (`int`) seconds to wait between multiple requests
+        :param cursor: (`str`) The `cursor` of a page yielded before , to resume after that page
+        :param keep_history: (`boolean`) Also keep every result in the Search object , only the current page is kept by default
+        :param job: (`str`) Name of the job , its checkpoint is saved after every page and the job resumes from it when it is run again
+
+        :return: generator of .types.page.Page , an async generator for AsyncTweety
+        """
+
+        raise NotImplementedError
 
     def tweet_detail(self, identifier: str):
         """
@@ -153,29 +205,7 @@ class Tweety:
         :return: .types.twDataTypes.Tweet
         """
 
-        if str(identifier).startswith("https://"):
-            if str(identifier).endswith("/"):
-                tweetId = str(identifier)[:-1].split("/")[-1]
-            else:
-                tweetId = str(identifier).split("/")[-1]
-        else:
-            tweetId = identifier
-
-        r = self.request.get_tweet_detail(tweetId)
-
-        try:
-            for entry in r.json()['data']['threaded_conversation_with_injections_v2']['instructions'][0]['entries']:
-                if str(entry['entryId']).split("-")[0] == "tweet":
-                    raw_tweet = entry['content']['itemContent']['tweet_results']['result']
-                    # skip deleted or protected tweets
-                    # raw_tweet[__typename'] = 'TweetTombstone'
-                    if 'rest_id' in raw_tweet:
-                        if raw_tweet['rest_id'] == str(identifier):
-                            return Tweet(r, raw_tweet, self.request, True, False, True)
-
-            raise InvalidTweetIdentifier()
-        except KeyError:
-            raise InvalidTweetKey()
+        raise NotImplementedError
 
     def get_replies(self, tweetId: str):
         """
@@ -186,28 +216,610 @@ class Tweety:
         :return: [.types.twDataTypes.Tweet]
         """
 
+        raise NotImplementedError
+
+    def resolve_replies(self, tweets, concurrency: int = 4):
+        """
+        Set `reply_to` of every reply in `tweets` to the Tweet it replies to ,
+        the parents which aren't in the payloads of `tweets` are requested once each and at the same time
+
+        :param tweets: ([`.types.twDataTypes.Tweet`]) The tweets , e.g. a page of `paginate_tweets(replies=True)`
+        :param concurrency: (`int`) Most TweetDetail requests made at the same time
+
+        :return: tweets
+        """
+
+        raise NotImplementedError
+
+    def iter_replies(self, tweet_id: str, max_pages: int = None, wait_time: int = 0, cursor: str = None, show_more: list = None):
+        """
+        Get all the replies of a tweet , page by page while they are iterated , with `for` or with `async for` for AsyncTweety
+
+        :param tweet_id: (`str`) The unique identifier of the tweet
+        :param max_pages: (`int`) Most pages to request , None to request until the conversation ends
+        :param wait_time: (`int`) seconds to wait between multiple requests
+        :param cursor: (`str`) `cursor` of a previous iteration , to resume from it
+        :param show_more: ([`str`]) `show_more` of a previous iteration , to resume from it
+
+        :return: .types.replies.TweetReplies
+        """
+
+        return TweetReplies(_get_tweet_id(tweet_id), self.request, max_pages, wait_time, cursor, show_more, self.lazy)
+
+    def crawl_timelines(self, screen_names_or_ids, pages: int = 1, replies: bool = False, wait_time: int = 0, concurrency: int = 4):
+        """
+        Get the tweets of many users at once , the results are yielded as soon as the timeline of an account is done
+
+        :param screen_names_or_ids: ([`str` | `int`]) Usernames or rest ids of the users , an `int` or an "id:" prefixed string is a rest id ,
+                                    a string of digits is looked up as a rest id and then as a username
+        :param pages: (`int`) number of pages to be scraped for every user
+        :param replies: (`boolean`) get the replied tweets of the users too
+        :param wait_time: (`int`) seconds to wait between the pages of one user
+        :param concurrency: (`int`) Number of accounts crawled at the same time
+
+        :return: generator of .types.usertweet.TimelineResult , an async generator for AsyncTweety ,
+                 a protected or missing account gives a result with `error` set
+        """
+
+        raise NotImplementedError
+
+    def _cached_user(self, screen_name):
+        cached = self.user_cache.get(screen_name) if self.user_cache is not None else None
+        if cached is not None and cached.profile is not None:
+            return User(cached.profile, 2, self.lazy)
+
+        return None
+
+    def _found_user(self, user, screen_name):
+        if user:
+            _cache_raw_user(self.user_cache, user['data']['user']['result'], screen_name)
+            return User(user, lazy=self.lazy)
+        raise UserNotFound("User {} not Found".format(screen_name))
+
+    def _add_users(self, response, wanted, key, users):
+        _match_users(users, _parse_users(response, self.lazy, self.user_cache), wanted, key)
+
+    def _known_user_id(self, identifier):
+        # The rest id of `identifier` when it is one or when its username is cached , None when it must be looked up
+        user_id = _get_user_id(identifier)
+        if user_id is None and self.user_cache is not None:
+            user_id = self.user_cache.get_rest_id(identifier)
+
+        return user_id
+
+    def _user_tweets(self, user_id, replies=False, wait_time=0, cursor=None, since_id=None):
+        return UserTweets(user_id, self.request, replies, wait_time or 0, cursor=cursor, lazy=self.lazy, since_id=since_id,
+                          profile=self.profile, parse_pool=self.parse_pool)
+
+    def _tweets_job(self, user_id, replies, wait_time, cursor, since_id, job):
+        # The UserTweets of a paginate_tweets call , resumed from the checkpoint of `job` if there is one
+        checkpoint = _load_checkpoint(self.checkpoint_store, job, "tweets", user_id) if job else None
+        userTweets = self._user_tweets(user_id, replies, wait_time, _resume_cursor(checkpoint, cursor), since_id)
+        if checkpoint is not None:
+            userTweets.is_next_page = checkpoint.is_next_page
+
+        return userTweets, checkpoint
+
+    def _search(self, keyword, pages, filter_, wait_time, cursor, keep_history=True):
+        return Search(keyword, self.request, pages, filter_, wait_time or 0, cursor, self.lazy, keep_history, profile=self.profile, parse_pool=self.parse_pool)
+
+    def _search_job(self, keyword, filter_, wait_time, cursor, keep_history, job):
+        checkpoint = _load_checkpoint(self.checkpoint_store, job, "search", _search_target(keyword, filter_)) if job else None
+        search = self._search(keyword, 0, filter_, wait_time, _resume_cursor(checkpoint, cursor), keep_history)
+        if checkpoint is not None:
+            search.is_next_page = checkpoint.is_next_page
+
+        return search, checkpoint
+
+    @staticmethod
+    def _timeline_error(identifier, user, error):
+        return TimelineResult(identifier, user.rest_id if user else _get_user_id(identifier), user, error=error)
+
+
+class Tweety(_TweetyBase):
+    _REQUEST = Request
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.request.close()
+
+    def get_user(self, screen_name: str):
+        user = self._cached_user(screen_name)
+        if user is not None:
+            return user
+
+        return self._found_user(self.request.get_user_by_sceen_name(screen_name), screen_name)
+
+    def get_users(self, screen_names_or_ids, batch_size: int = USERS_BATCH_SIZE):
+        user_ids, screen_names = _split_user_identifiers(screen_names_or_ids)
+        users = {}
+        for chunk in _chunks(list(user_ids), batch_size):
+            self._add_users(self.request.get_users_by_rest_ids(chunk), user_ids, "rest_id", users)
+
+        _add_identifiers(screen_names, _digit_screen_names(users, user_ids))
+        screen_names = _get_cached_users(self.user_cache, users, screen_names, self.lazy)
+        for chunk in _chunks(list(screen_names), batch_size):
+            self._add_users(self.request.get_users_by_screen_names(chunk), screen_names, "screen_name", users)
+
+        return users
+
+    @property
+    def user_id(self):
+        """
+        Get the user unique twitter id
+
+        :return: int
+        """
+
+        return self.user.rest_id
+
+    def paginate_tweets(self, user_id: str, pages: int = 1, replies: bool = False, wait_time: int = 0, cursor: str = None, since_id: str = None,
+                        job: str = None):
+        userTweets, checkpoint = self._tweets_job(self._resolve_user_id(user_id), replies, wait_time, cursor, since_id, job)
+        if checkpoint is None:
+            return userTweets.get_tweets_page_iterator(pages)
+
+        return track(userTweets.get_tweets_page_iterator(pages), self.checkpoint_store, checkpoint)
+
+    def get_tweets(self, pages: int = 1, replies: bool = False, wait_time: int = 0, cursor: str = None, user_id: str = None, since_id: str = None):
+        user_id = self._resolve_user_id(user_id) if user_id is not None else self.user_id
+        return self._user_tweets(user_id, replies, wait_time, cursor, since_id).get_tweets(pages)
+
+    def sync_tweets(self, user_id: str, since_id: str = None, max_pages: int = 50, replies: bool = False, wait_time: int = 0):
+        userTweets = self._user_tweets(self._resolve_user_id(user_id), replies, wait_time, since_id=since_id)
+        tweets = userTweets.get_tweets(max_pages)
+        return tweets, userTweets.newest_id
+
+    def _resolve_user_id(self, identifier):
+        user_id = self._known_user_id(identifier)
+        return user_id if user_id is not None else self.get_user(str(identifier).lstrip("@")).rest_id
+
+    def get_trends(self):
+        """
+        Get the Trends from you locale
+
+        :return:list of .types.twDataTypes.Trends
+        """
+        trends = []
+        response = self.request.get_trends()
+        for i in response['timeline']['instructions'][1]['addEntries']['entries'][1]['content']['timelineModule']['items']:
+            data = {
+                "name": i['item']['content']['trend']['name'],
+                "url": str(i['item']['content']['trend']['url']['url']).replace("twitter://",
+                                                                                "https://twitter.com/").replace("query",
+                                                                                                                "q"),
+            }
+            try:
+                if i['item']['content']['trend']['trendMetadata']['metaDescription']:
+                    data['tweet_count'] = i['item']['content']['trend']['trendMetadata']['metaDescription']
+            except:
+                pass
+            trends.append(Trends(data))
+        return trends
+
+    def search(self, keyword: str, pages: int = 1, filter_: str = None, wait_time: int = 0, cursor: str = None):
+        return self._search(keyword, pages, filter_, wait_time, cursor)
+
+    def paginate_search(self, keyword: str, pages: int = 1, filter_: str = None, wait_time: int = 0, cursor: str = None, keep_history: bool = False,
+                        job: str = None):
+        search, checkpoint = self._search_job(keyword, filter_, wait_time, cursor, keep_history, job)
+        if checkpoint is None:
+            return search.get_search_page_iterator(pages)
+
+        return track(search.get_search_page_iterator(pages), self.checkpoint_store, checkpoint)
+
+    def tweet_detail(self, identifier: str):
+        tweetId = _get_tweet_id(identifier)
         r = self.request.get_tweet_detail(tweetId)
+        return _parse_tweet_detail(r, tweetId, self.request, lazy=self.lazy)
 
-        tweets = []
-        reply_to_tweet = None
+    def get_replies(self, tweetId: str):
+        r = self.request.get_tweet_detail(tweetId)
+        return _parse_replies(r, self.request, lazy=self.lazy)
+
+    def resolve_replies(self, tweets, concurrency: int = 4):
+        return ConversationResolver(self.request, self.lazy, concurrency).resolve(tweets)
+
+    def crawl_timelines(self, screen_names_or_ids, pages: int = 1, replies: bool = False, wait_time: int = 0, concurrency: int = 4):
+        identifiers = list(dict.fromkeys(screen_names_or_ids))
+        # The usernames and strings of digits are resolved with batched lookups before any timeline is requested
+        users, lookup_error = {}, None
         try:
-            for entry in r.json()['data']['threaded_conversation_with_injections_v2']['instructions'][0]['entries']:
-                # entryId is in form "tweet/conversationthread-{tweet_id/conv_id}[-(tweet/cursor-showmore)-{tweet_id/cursor?_id}]"
-                info = str(entry['entryId']).split("-")
-                if info[0] == "tweet":
-                    raw_tweet = entry['content']['itemContent']['tweet_results']['result']
-                    reply_to_tweet = Tweet(r, raw_tweet, self.request, True, False, True)
-                if info[0] == "conversationthread":
-                    replies = entry['content']['items']
-                    for reply in replies:
-                        info = str(reply['entryId']).split("-")
-                        if "cursor" not in info:
-                            raw_tweet = reply['item']['itemContent']['tweet_results']['result']
-                            reply_tweet = Tweet(r, raw_tweet, self.request, True, False, True)
-                            setattr(reply_tweet, 'reply_to', reply_to_tweet)
-                            setattr(reply_tweet, 'is_reply', True)
-                            tweets.append(reply_tweet)
-
-            return tweets
-        except KeyError:
-            raise InvalidTweetIdentifier()
+            users = self.get_users([identifier for identifier in identifiers if _needs_lookup(identifier)])
+        except Exception as e:
+            lookup_error = e
+
+        executor = ThreadPoolExecutor(max_workers=max(1, int(concurrency)))
+        futures = [executor.submit(self._crawl_timeline, identifier, users, lookup_error, pages, replies, wait_time) for identifier in identifiers]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # Nothing new is started once the caller stops iterating
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _crawl_timeline(self, identifier, users, lookup_error, pages, replies, wait_time):
+        user = users.get(identifier)
+        try:
+            user, user_id = _crawl_user(identifier, users, lookup_error)
+            tweets = self._user_tweets(user_id, replies, wait_time).get_tweets(pages)
+            return TimelineResult(identifier, user_id, user, tweets)
+        except Exception as e:
+            return self._timeline_error(identifier, user, e)
+
+
+class AsyncTweety(_TweetyBase):
+    _REQUEST = AsyncRequest
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        await self.request.aclose()
+
+    async def get_user(self, screen_name: str):
+        user = self._cached_user(screen_name)
+        if user is not None:
+            return user
+
+        return self._found_user(await self.request.get_user_by_sceen_name(screen_name), screen_name)
+
+    async def get_users(self, screen_names_or_ids, batch_size: int = USERS_BATCH_SIZE):
+        user_ids, screen_names = _split_user_identifiers(screen_names_or_ids)
+        users = {}
+        screen_names = _get_cached_users(self.user_cache, users, screen_names, self.lazy)
+        by_id = [self.request.get_users_by_rest_ids(chunk) for chunk in _chunks(list(user_ids), batch_size)]
+        by_name = [self.request.get_users_by_screen_names(chunk) for chunk in _chunks(list(screen_names), batch_size)]
+        responses = await asyncio.gather(*by_id, *by_name)
+
+        for index, response in enumerate(responses):
+            if index < len(by_id):
+                self._add_users(response, user_ids, "rest_id", users)
+            else:
+                self._add_users(response, screen_names, "screen_name", users)
+
+        # The strings of digits which aren't a rest id are asked for again as usernames
+        digit_names = _get_cached_users(self.user_cache, users, _digit_screen_names(users, user_ids), self.lazy)
+        by_name = [self.request.get_users_by_screen_names(chunk) for chunk in _chunks(list(digit_names), batch_size)]
+        for response in await asyncio.gather(*by_name):
+            self._add_users(response, digit_names, "screen_name", users)
+
+        return users
+
+    async def paginate_tweets(self, user_id: str, pages: int = 1, replies: bool = False, wait_time: int = 0, cursor: str = None, since_id: str = None,
+                              job: str = None):
+        userTweets, checkpoint = self._tweets_job(await self._resolve_user_id(user_id), replies, wait_time, cursor, since_id, job)
+        pages = userTweets.get_tweets_page_iterator_async(pages)
+        if checkpoint is not None:
+            pages = track_async(pages, self.checkpoint_store, checkpoint)
+
+        async for page in pages:
+            yield page
+
+    async def get_tweets(self, pages: int = 1, replies: bool = False, wait_time: int = 0, cursor: str = None, user_id: str = None, since_id: str = None):
+        if user_id is None:
+            raise ValueError("No User Provided , AsyncTweety has no profile to get the tweets of , pass user_id")
+
+        user_id = await self._resolve_user_id(user_id)
+        return await self._user_tweets(user_id, replies, wait_time, cursor, since_id).get_tweets_async(pages)
+
+    async def sync_tweets(self, user_id: str, since_id: str = None, max_pages: int = 50, replies: bool = False, wait_time: int = 0):
+        userTweets = self._user_tweets(await self._resolve_user_id(user_id), replies, wait_time, since_id=since_id)
+        tweets = await userTweets.get_tweets_async(max_pages)
+        return tweets, userTweets.newest_id
+
+    async def _resolve_user_id(self, identifier):
+        user_id = self._known_user_id(identifier)
+        return user_id if user_id is not None else (await self.get_user(str(identifier).lstrip("@"))).rest_id
+
+    async def search(self, keyword: str, pages: int = 1, filter_: str = None, wait_time: int = 0, cursor: str = None):
+        search = self._search(keyword, 0, filter_, wait_time, cursor)
+        await search._search_async(pages, wait_time or 0)
+        return search
+
+    async def paginate_search(self, keyword: str, pages: int = 1, filter_: str = None, wait_time: int = 0, cursor: str = None, keep_history: bool = False,
+                              job: str = None):
+        search, checkpoint = self._search_job(keyword, filter_, wait_time, cursor, keep_history, job)
+        pages = search.get_search_page_iterator_async(pages)
+        if checkpoint is not None:
+            pages = track_async(pages, self.checkpoint_store, checkpoint)
+
+        async for page in pages:
+            yield page
+
+    async def tweet_detail(self, identifier: str):
+        tweetId = _get_tweet_id(identifier)
+        r = await self.request.get_tweet_detail(tweetId)
+        tweet = _parse_tweet_detail(r, tweetId, self.request, get_reply=False, lazy=self.lazy)
+        await self._resolve_reply_to([tweet])
+        return tweet
+
+    async def get_replies(self, tweetId: str):
+        r = await self.request.get_tweet_detail(tweetId)
+        replies = _parse_replies(r, self.request, get_reply=False, lazy=self.lazy)
+        # The replies answer the focal tweet of the payload , only the tweet the focal one replies to may be missing
+        await self._resolve_reply_to([replies[0].reply_to] if replies else [])
+        return replies
+
+    async def _resolve_reply_to(self, tweets):
+        # An AsyncRequest can't be awaited from inside the Tweet constructor , so the parents the sync client
+        # requests on access are prefetched here , once the tweets are built
+        tweets = [tweet for tweet in tweets if isinstance(tweet, Tweet) and tweet._get_reply_to_id()]
+        resolver = ConversationResolver(self.request, self.lazy)
+        for tweet in tweets:
+            resolver.add_response(tweet._get_raw_response())
+
+        parents = await resolver.prefetch_async([tweet._get_reply_to_id() for tweet in tweets])
+        for tweet, parent in zip(tweets, parents):
+            tweet._set_reply_to(parent)
+
+    async def resolve_replies(self, tweets, concurrency: int = 4):
+        return await ConversationResolver(self.request, self.lazy, concurrency).resolve_async(tweets)
+
+    async def crawl_timelines(self, screen_names_or_ids, pages: int = 1, replies: bool = False, wait_time: int = 0, concurrency: int = 4):
+        identifiers = list(dict.fromkeys(screen_names_or_ids))
+        # The usernames and strings of digits are resolved with batched lookups before any timeline is requested
+        users, lookup_error = {}, None
+        try:
+            users = await self.get_users([identifier for identifier in identifiers if _needs_lookup(identifier)])
+        except Exception as e:
+            lookup_error = e
+
+        semaphore = asyncio.Semaphore(max(1, int(concurrency)))
+        tasks = [asyncio.ensure_future(self._crawl_timeline(identifier, users, lookup_error, pages, replies, wait_time, semaphore))
+                 for identifier in identifiers]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _crawl_timeline(self, identifier, users, lookup_error, pages, replies, wait_time, semaphore):
+        user = users.get(identifier)
+        async with semaphore:
+            try:
+                user, user_id = _crawl_user(identifier, users, lookup_error)
+                tweets = await self._user_tweets(user_id, replies, wait_time).get_tweets_async(pages)
+                return TimelineResult(identifier, user_id, user, tweets)
+            except Exception as e:
+                return self._timeline_error(identifier, user, e)
+
+
+def _parse_proxy(proxy):
+    if proxy and proxy is not None:
+        if proxy.get("http") and proxy.get("https"):
+            return dict(http=proxy['http'], https=proxy['https'])
+        else:
+            raise ProxyParseError()
+
+    return None
+
+
+def _get_tweet_id(identifier):
+    if str(identifier).startswith("https://"):
+        if str(identifier).endswith("/"):
+            return str(identifier)[:-1].split("/")[-1]
+
+        return str(identifier).split("/")[-1]
+
+    return identifier
+
+
+def _load_checkpoint(store, job, kind, target):
+    if store is None:
+        raise ValueError("A named job needs a checkpoint_store , pass one to the Tweety class")
+
+    target = str(target)
+    checkpoint = store.load(job)
+    if checkpoint is None:
+        return Checkpoint(job, kind, target)
+
+    if (checkpoint.kind, checkpoint.target) != (kind, target):
+        raise ValueError(f"Job {job} is a {checkpoint.kind} job of {checkpoint.target} , not of {target}")
+
+    return checkpoint
+
+
+def _resume_cursor(checkpoint, cursor):
+    # A job which already read a page goes on from its checkpoint , a new one starts at the given cursor
+    if checkpoint is not None and checkpoint.pages:
+        return checkpoint.cursor
+
+    return cursor
+
+
+def _search_target(keyword, filter_):
+    filter_ = filter_.lower().strip() if filter_ else None
+    return f"{keyword} ({filter_})" if filter_ else keyword
+
+
+def _get_user_id(identifier):
+    # An int , an "id:" prefixed string or a string of digits is taken as a rest id , anything else (or a name starting with "@")
+    # is looked up as a username
+    if isinstance(identifier, int):
+        return str(identifier)
+
+    identifier = str(identifier)
+    if identifier.startswith(USER_ID_PREFIX) and identifier[len(USER_ID_PREFIX):].isdigit():
+        return identifier[len(USER_ID_PREFIX):]
+
+    if identifier.isdigit():
+        return identifier
+
+    return None
+
+
+def _is_digit_name(identifier):
+    # Only a bare string of digits may be a username too , an int or an "id:" prefix is a rest id for sure
+    return isinstance(identifier, str) and identifier.isdigit()
+
+
+def _needs_lookup(identifier):
+    # Only a username or a string of digits has to be looked up before its timeline is requested
+    return _get_user_id(identifier) is None or _is_digit_name(identifier)
+
+
+def _digit_screen_names(users, user_ids):
+    # The strings of digits no user was found for as a rest id , keyed like the usernames of _split_user_identifiers
+    screen_names = {}
+    for user_id, identifiers in user_ids.items():
+        missing = [identifier for identifier in identifiers if identifier not in users and _is_digit_name(identifier)]
+        if missing:
+            screen_names[user_id] = missing
+
+    return screen_names
+
+
+def _add_identifiers(mapping, other):
+    for key, identifiers in other.items():
+        for identifier in identifiers:
+            if identifier not in mapping.setdefault(key, []):
+                mapping[key].append(identifier)
+
+
+def _split_user_identifiers(identifiers):
+    # Deduplicated rest ids and lowercased usernames , each mapped to every identifier it was given as
+    user_ids, screen_names = {}, {}
+    for identifier in identifiers:
+        user_id = _get_user_id(identifier)
+        if user_id is not None:
+            _add_identifiers(user_ids, {user_id: [identifier]})
+        else:
+            _add_identifiers(screen_names, {str(identifier).lstrip("@").lower(): [identifier]})
+
+    return user_ids, screen_names
+
+
+def _chunks(values, size):
+    size = max(1, int(size))
+    for index in range(0, len(values), size):
+        yield values[index:index + size]
+
+
+def _parse_users(response, lazy=False, cache=None):
+    users = []
+    try:
+        entries = response['data']['users']
+    except (KeyError, TypeError):
+        return users
+
+    for entry in entries:
+        raw_user = (entry or {}).get('result')
+        # skip the suspended / missing users
+        # raw_user['__typename'] = 'UserUnavailable'
+        if raw_user and raw_user.get('rest_id') and raw_user.get('__typename', 'User') == 'User':
+            _cache_raw_user(cache, raw_user)
+            users.append(User(raw_user, 2, lazy))
+
+    return users
+
+
+def _cache_raw_user(cache, raw_user, screen_name=None):
+    if cache is not None:
+        cache.set_raw_user(raw_user, screen_name)
+
+
+def _get_cached_users(cache, users, screen_names, lazy=False):
+    # Fills `users` with the cached profiles , returns the usernames which still have to be requested
+    if cache is None:
+        return screen_names
+
+    missing = {}
+    for screen_name, identifiers in screen_names.items():
+        cached = cache.get(screen_name)
+        if cached is not None and cached.profile is not None:
+            user = User(cached.profile, 2, lazy)
+            for identifier in identifiers:
+                users[identifier] = user
+        else:
+            missing[screen_name] = identifiers
+
+    return missing
+
+
+def _match_users(users, found, wanted, key):
+    for user in found:
+        value = str(user[key])
+        if key == "screen_name":
+            value = value.lower()
+
+        for identifier in wanted.get(value, []):
+            users[identifier] = user
+
+
+def _crawl_user(identifier, users, lookup_error):
+    # The user and rest id whose timeline `identifier` stands for , out of the users `crawl_timelines` looked up at once
+    if not _needs_lookup(identifier):
+        return None, _get_user_id(identifier)
+
+    if lookup_error is not None:
+        raise lookup_error
+
+    user = users.get(identifier)
+    if user is None:
+        raise UserNotFound(f"User {identifier} not Found")
+
+    if user.protected:
+        raise UserProtected(f"User {identifier} is Protected")
+
+    return user, user.rest_id
+
+
+def _parse_tweet_detail(r, tweetId, http, get_reply=True, lazy=False):
+    # AsyncRequest can't be called from inside the Tweet constructor , so the async client passes get_reply=False
+    # and resolves the parent once the tweet is built
+    resolver = ConversationResolver(http, lazy)
+    resolver.add_response(r)
+    try:
+        for entry in r['data']['threaded_conversation_with_injections_v2']['instructions'][0]['entries']:
+            if str(entry['entryId']).split("-")[0] == "tweet":
+                raw_tweet = entry['content']['itemContent']['tweet_results']['result']
+                # skip deleted or protected tweets
+                # raw_tweet[__typename'] = 'TweetTombstone'
+                if 'rest_id' in raw_tweet:
+                    if raw_tweet['rest_id'] == str(tweetId):
+                        return Tweet(r, raw_tweet, http, True, False, get_reply, lazy, resolver)
+
+        raise InvalidTweetIdentifier()
+    except KeyError:
+        raise InvalidTweetKey()
+
+
+def _parse_replies(r, http, get_reply=True, lazy=False):
+    tweets = []
+    reply_to_tweet = None
+    # The replies all answer the focal tweet of the payload , none of them needs a request for its parent
+    resolver = ConversationResolver(http, lazy)
+    resolver.add_response(r)
+    try:
+        for entry in r['data']['threaded_conversation_with_injections_v2']['instructions'][0]['entries']:
+            # entryId is in form "tweet/conversationthread-{tweet_id/conv_id}[-(tweet/cursor-showmore)-{tweet_id/cursor?_id}]"
+            info = str(entry['entryId']).split("-")
+            if info[0] == "tweet":
+                raw_tweet = entry['content']['itemContent']['tweet_results']['result']
+                reply_to_tweet = resolver.add_tweet(Tweet(r, raw_tweet, http, True, False, get_reply, lazy, resolver))
+            if info[0] == "conversationthread":
+                replies = entry['content']['items']
+                for reply in replies:
+                    info = str(reply['entryId']).split("-")
+                    if "cursor" not in info:
+                        raw_tweet = reply['item']['itemContent']['tweet_results']['result']
+                        reply_tweet = Tweet(r, raw_tweet, http, True, False, get_reply, lazy, resolver)
+                        reply_tweet._set_reply_to(reply_to_tweet)
+                        setattr(reply_tweet, 'is_reply', True)
+                        tweets.append(reply_tweet)
+
+        return tweets
+    except KeyError:
+        raise InvalidTweetIdentifier()
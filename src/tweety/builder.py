@@ -1,4 +1,5 @@
-from urllib.parse import urlencode
+import json
+from urllib.parse import urlencode, urlsplit, parse_qs
 import random
 import string
 from functools import wraps
@@ -7,6 +8,22 @@ REQUEST_USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML,
 REQUEST_PLATFORMS = ['Linux', 'Windows']
 REFERRER_USERNAME = 'elonmusk'
 
+def get_variables(url):
+    """
+    The variables a request url was built with : the decoded `variables` of a GraphQL url , the query parameters otherwise
+
+    :param url: (`str`) The request url
+
+    :return: dict , e.g. `userId` and `cursor` of a UserTweets url or `q` and `cursor` of a search url
+    """
+
+    query = parse_qs(urlsplit(str(url)).query)
+    if "variables" in query:
+        return json.loads(query["variables"][0])
+
+    return {key: values[0] for key, values in query.items()}
+
+
 def return_with_headers(func):
 
     @wraps(func)
@@ -21,6 +38,8 @@ class UrlBuilder:
     URL_GUEST_TOKEN = "https://api.twitter.com/1.1/guest/activate.json"
     URL_API_INIT = "https://twitter.com/i/api/1.1/branch/init.json"
     URL_USER_BY_SCREEN_NAME = "https://api.twitter.com/graphql/rePnxwe9LZ51nQ7Sn_xN_A/UserByScreenName"
+    URL_USERS_BY_REST_IDS = "https://twitter.com/i/api/graphql/GD4q8bBE2i6cqWw2iT74Gg/UsersByRestIds"
+    URL_USERS_BY_SCREEN_NAMES = "https://twitter.com/i/api/graphql/KIQMbT_Un5ENLmMAhe0P6A/UsersByScreenNames"
     URL_USER_TWEETS = "https://twitter.com/i/api/graphql/OXXUyHfKYZ-xLx4NcL9-_Q/UserTweets"
     URL_USER_TWEETS_WITH_REPLIES = "https://twitter.com/i/api/graphql/nrdle2catTyGnTyj1Qa7wA/UserTweetsAndReplies"
     URL_TRENDS = "https://twitter.com/i/api/2/guide.json"
@@ -83,6 +102,22 @@ class UrlBuilder:
         }
         return self._build(self.URL_USER_BY_SCREEN_NAME, urlencode(params))
 
+    @return_with_headers
+    def users_by_rest_ids(self, user_ids):
+        params = {
+            'variables': f'{{"userIds":{json.dumps([str(user_id) for user_id in user_ids])},"withSafetyModeUserFields":true,"withSuperFollowsUserFields":true}}',
+            'features': '{"responsive_web_twitter_blue_verified_badge_is_enabled":true,"responsive_web_graphql_exclude_directive_enabled":false,"verified_phone_label_enabled":false,"responsive_web_graphql_skip_user_profile_image_extensions_enabled":false,"responsive_web_graphql_timeline_navigation_enabled":true}',
+        }
+        return self._build(self.URL_USERS_BY_REST_IDS, urlencode(params))
+
+    @return_with_headers
+    def users_by_screen_names(self, screen_names):
+        params = {
+            'variables': f'{{"screen_names":{json.dumps(list(screen_names))},"withSafetyModeUserFields":true,"withSuperFollowsUserFields":true}}',
+            'features': '{"responsive_web_twitter_blue_verified_badge_is_enabled":true,"responsive_web_graphql_exclude_directive_enabled":false,"verified_phone_label_enabled":false,"responsive_web_graphql_skip_user_profile_image_extensions_enabled":false,"responsive_web_graphql_timeline_navigation_enabled":true}',
+        }
+        return self._build(self.URL_USERS_BY_SCREEN_NAMES, urlencode(params))
+
     @return_with_headers
     def user_tweets(self, user_id, replies=False, cursor=None):
         if replies:
@@ -207,9 +242,10 @@ class UrlBuilder:
         return self._build(self.URL_SEARCH, urlencode(params))
 
     @return_with_headers
-    def tweet_detail(self, tweet_id):
+    def tweet_detail(self, tweet_id, cursor=None):
+        cursor = f'"cursor":"{cursor}","referrer":"tweet",' if cursor else ''
         params = {
-            'variables': f'{{"focalTweetId":"{tweet_id}","with_rux_injections":false,"includePromotedContent":true,"withCommunity":true,"withQuickPromoteEligibilityTweetFields":true,"withBirdwatchNotes":false,"withSuperFollowsUserFields":true,"withDownvotePerspective":false,"withReactionsMetadata":false,"withReactionsPerspective":false,"withSuperFollowsTweetFields":true,"withVoice":true,"withV2Timeline":true}}',
+            'variables': f'{{"focalTweetId":"{tweet_id}",{cursor}"with_rux_injections":false,"includePromotedContent":true,"withCommunity":true,"withQuickPromoteEligibilityTweetFields":true,"withBirdwatchNotes":false,"withSuperFollowsUserFields":true,"withDownvotePerspective":false,"withReactionsMetadata":false,"withReactionsPerspective":false,"withSuperFollowsTweetFields":true,"withVoice":true,"withV2Timeline":true}}',
             'features': '{"responsive_web_twitter_blue_verified_badge_is_enabled":true,"responsive_web_graphql_exclude_directive_enabled":false,"verified_phone_label_enabled":false,"responsive_web_graphql_timeline_navigation_enabled":true,"responsive_web_graphql_skip_user_profile_image_extensions_enabled":false,"tweetypie_unmention_optimization_enabled":true,"vibe_api_enabled":true,"responsive_web_edit_tweet_api_enabled":true,"graphql_is_translatable_rweb_tweet_is_translatable_enabled":true,"view_counts_everywhere_api_enabled":true,"longform_notetweets_consumption_enabled":true,"tweet_awards_web_tipping_enabled":false,"freedom_of_speech_not_reach_fetch_enabled":false,"standardized_nudges_misinfo":true,"tweet_with_visibility_results_prefer_gql_limited_actions_policy_enabled":false,"interactive_text_enabled":true,"responsive_web_text_conversations_enabled":false,"responsive_web_enhance_cards_enabled":false}',
         }
         return self._build(self.URL_TWEET_DETAILS, urlencode(params))
\ No newline at end of file
@@ -0,0 +1,176 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from .utils import json_loads
+
+# Seconds a screen name -> rest id mapping and its profile snapshot are trusted for
+USER_CACHE_TTL = 24 * 60 * 60
+
+
+class CachedUser:
+    def __init__(self, screen_name, rest_id, profile=None, updated_at=None):
+        """
+        A cached screen name -> rest id mapping
+
+        :param screen_name: (`str`) The username , lowercased
+        :param rest_id: (`str`) The rest id of the user
+        :param profile: (`dict`) The raw user object as returned by Twitter , None if only the rest id is known
+        :param updated_at: (`float`) Epoch seconds at which the mapping was stored
+        """
+
+        self.screen_name = screen_name
+        self.rest_id = rest_id
+        self.profile = profile
+        self.updated_at = time.time() if updated_at is None else updated_at
+
+    def __repr__(self):
+        return f"CachedUser(screen_name={self.screen_name}, rest_id={self.rest_id})"
+
+    def is_expired(self, ttl):
+        return ttl is not None and time.time() - self.updated_at > ttl
+
+
+class UserCache:
+    def __init__(self, maxsize=1024, ttl=USER_CACHE_TTL, path=None):
+        """
+        Remembers which rest id a screen name belongs to , so a username doesn't cost a
+        `UserByScreenName` request every time it is used
+
+        :param maxsize: (`int`) Number of users kept in memory , the least recently used ones are dropped first
+        :param ttl: (`int`) Seconds a mapping is trusted for , None to keep it forever
+        :param path: (`str`) SQLite database the mappings are also stored in , so they outlive the process
+        """
+
+        self.maxsize = max(1, int(maxsize))
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                "screen_name TEXT PRIMARY KEY, rest_id TEXT NOT NULL, profile TEXT, updated_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def __len__(self):
+        return len(self._users)
+
+    def __contains__(self, screen_name):
+        return self.get(screen_name) is not None
+
+    def __repr__(self):
+        return f"UserCache(users={len(self._users)}, hits={self.hits}, misses={self.misses}, path={self.path})"
+
+    @staticmethod
+    def _key(screen_name):
+        return str(screen_name).lstrip("@").lower()
+
+    def get(self, screen_name):
+        """
+        :param screen_name: (`str`) The username , case doesn't matter
+
+        :return: CachedUser or None if the mapping is unknown or expired
+        """
+
+        key = self._key(screen_name)
+        with self._lock:
+            user = self._users.get(key)
+            if user is None and self._db is not None:
+                user = self._load(key)
+                if user is not None:
+                    self._remember(user)
+
+            if user is not None and user.is_expired(self.ttl):
+                self._forget(key)
+                user = None
+
+            if user is None:
+                self.misses += 1
+                return None
+
+            self._users.move_to_end(key)
+            self.hits += 1
+            return user
+
+    def get_rest_id(self, screen_name):
+        user = self.get(screen_name)
+        return user.rest_id if user is not None else None
+
+    def set(self, screen_name, rest_id, profile=None):
+        """
+        Store a mapping , replacing the one already stored for `screen_name`
+
+        :param screen_name: (`str`) The username
+        :param rest_id: (`str`) The rest id of the user
+        :param profile: (`dict`) The raw user object to keep as the profile snapshot
+        """
+
+        user = CachedUser(self._key(screen_name), str(rest_id), profile)
+        with self._lock:
+            self._remember(user)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO users (screen_name, rest_id, profile, updated_at) VALUES (?, ?, ?, ?)",
+                    (user.screen_name, user.rest_id, json.dumps(profile) if profile is not None else None, user.updated_at)
+                )
+                self._db.commit()
+
+        return user
+
+    def set_raw_user(self, raw_user, screen_name=None):
+        """
+        Store the mapping of a raw user object , e.g. the `result` of a `UserByScreenName` response
+
+        :param raw_user: (`dict`) The raw user object
+        :param screen_name: (`str`) The username it was requested with , the one of the user object by default
+        """
+
+        screen_name = screen_name or raw_user.get("legacy", {}).get("screen_name") or raw_user.get("screen_name")
+        rest_id = raw_user.get("rest_id") or raw_user.get("id_str")
+        if screen_name and rest_id:
+            return self.set(screen_name, rest_id, raw_user)
+
+        return None
+
+    def invalidate(self, screen_name):
+        with self._lock:
+            self._forget(self._key(screen_name))
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM users")
+                self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _remember(self, user):
+        self._users[user.screen_name] = user
+        self._users.move_to_end(user.screen_name)
+        while len(self._users) > self.maxsize:
+            self._users.popitem(last=False)
+
+    def _forget(self, key):
+        self._users.pop(key, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM users WHERE screen_name = ?", (key,))
+            self._db.commit()
+
+    def _load(self, key):
+        row = self._db.execute("SELECT screen_name, rest_id, profile, updated_at FROM users WHERE screen_name = ?", (key,)).fetchone()
+        if row is None:
+            return None
+
+        return CachedUser(row[0], row[1], json_loads(row[2]) if row[2] else None, row[3])
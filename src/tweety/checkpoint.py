@@ -0,0 +1,180 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from .utils import json_loads
+
+
+class Checkpoint:
+    def __init__(self, job, kind=None, target=None, cursor=None, pages=0, last_tweet_id=None, is_next_page=True, updated_at=None):
+        """
+        How far a named crawl went , saved after every page so it can resume after a crash
+
+        :param job: (`str`) Name of the job
+        :param kind: (`str`) `tweets` or `search`
+        :param target: (`str`) The rest id or keyword the job crawls
+        :param cursor: (`str`) Cursor of the next page
+        :param pages: (`int`) Pages fetched so far , over all the runs
+        :param last_tweet_id: (`str`) Id of the last result of the last page
+        :param is_next_page: (`boolean`) False once the job reached the end
+        :param updated_at: (`float`) Epoch seconds of the last save
+        """
+
+        self.job = job
+        self.kind = kind
+        self.target = target
+        self.cursor = cursor
+        self.pages = pages
+        self.last_tweet_id = last_tweet_id
+        self.is_next_page = is_next_page
+        self.updated_at = updated_at
+
+    def __repr__(self):
+        return f"Checkpoint(job={self.job}, pages={self.pages}, cursor={self.cursor}, is_next_page={self.is_next_page})"
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def update(self, page):
+        """
+        Move the checkpoint past a page
+
+        :param page: (`.types.page.Page`) The page which was just read
+        """
+
+        self.cursor = page.cursor
+        self.is_next_page = page.is_next_page
+        self.pages += 1
+        if len(page):
+            # a User result is identified by its rest id , a Tweet by its id
+            self.last_tweet_id = str(getattr(page[-1], "rest_id", None) or page[-1].id)
+        self.updated_at = time.time()
+
+
+class FileCheckpointStore:
+    def __init__(self, path="tweety_checkpoints.json"):
+        """
+        Keeps the checkpoints in a JSON file , rewritten atomically on every save
+
+        :param path: (`str`) The file
+        """
+
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"FileCheckpointStore(path={self.path})"
+
+    def _read(self):
+        try:
+            with open(self.path, "rb") as f:
+                return json_loads(f.read() or b"{}")
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, checkpoints):
+        # written next to the file and renamed over it , a crash mid-write leaves the previous version intact
+        temp = f"{self.path}.tmp"
+        with open(temp, "w") as f:
+            json.dump(checkpoints, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, self.path)
+
+    def load(self, job):
+        with self._lock:
+            data = self._read().get(job)
+
+        return Checkpoint.from_dict(data) if data else None
+
+    def save(self, checkpoint):
+        with self._lock:
+            checkpoints = self._read()
+            checkpoints[checkpoint.job] = checkpoint.to_dict()
+            self._write(checkpoints)
+
+    def delete(self, job):
+        with self._lock:
+            checkpoints = self._read()
+            if checkpoints.pop(job, None) is not None:
+                self._write(checkpoints)
+
+    def jobs(self):
+        with self._lock:
+            return list(self._read())
+
+
+class SQLiteCheckpointStore:
+    def __init__(self, path="tweety_checkpoints.db"):
+        """
+        Keeps the checkpoints in a SQLite database , one row per job
+
+        :param path: (`str`) The database file
+        """
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS checkpoints (job TEXT PRIMARY KEY, data TEXT NOT NULL)")
+        self._db.commit()
+
+    def __repr__(self):
+        return f"SQLiteCheckpointStore(path={self.path})"
+
+    def load(self, job):
+        with self._lock:
+            row = self._db.execute("SELECT data FROM checkpoints WHERE job = ?", (job,)).fetchone()
+
+        return Checkpoint.from_dict(json_loads(row[0])) if row else None
+
+    def save(self, checkpoint):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO checkpoints (job, data) VALUES (?, ?)", (checkpoint.job, json.dumps(checkpoint.to_dict())))
+            self._db.commit()
+
+    def delete(self, job):
+        with self._lock:
+            self._db.execute("DELETE FROM checkpoints WHERE job = ?", (job,))
+            self._db.commit()
+
+    def jobs(self):
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT job FROM checkpoints")]
+
+    def close(self):
+        self._db.close()
+
+
+def track(pages, store, checkpoint):
+    """
+    Save `checkpoint` after every page of `pages` is read
+
+    The save happens once the caller asks for the next page , a page the caller stopped in the middle of is read again on resume
+
+    :param pages: (generator of `.types.page.Page`) The pages of the job
+    :param store: (`FileCheckpointStore` | `SQLiteCheckpointStore`) Where the checkpoint is saved
+    :param checkpoint: (`Checkpoint`) The checkpoint of the job
+    """
+
+    for page in pages:
+        yield page
+        checkpoint.update(page)
+        store.save(checkpoint)
+
+
+async def track_async(pages, store, checkpoint):
+    """
+    Same as `track` , for an async generator of pages. The checkpoint is written on a thread of the default executor ,
+    not on the event loop
+    """
+
+    async for page in pages:
+        yield page
+        checkpoint.update(page)
+        await asyncio.get_running_loop().run_in_executor(None, store.save, checkpoint)
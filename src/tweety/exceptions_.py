@@ -546,3 +546,16 @@ class UnknownError(Exception):
             error = traceback.format_exc().splitlines()[-1]
             self.message = error
             super().__init__(self.message)
+
+
+class RequestNotRecorded(Exception):
+    """
+    Exception Raised when a replaying cassette has no recorded response for a request
+
+    Attributes:
+        message -- explanation of the error
+    """
+
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,217 @@
+import csv
+from datetime import datetime, timezone
+from .types.twDataTypes import WORKBOOK_HEADERS
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# How a header of WORKBOOK_HEADERS is read out of a tweet
+COLUMNS = {
+    'Created on': lambda tweet: tweet.created_on,
+    'author': lambda tweet: tweet.author.username if tweet.author is not None else None,
+    'is_retweet': lambda tweet: tweet.is_retweet,
+    'is_reply': lambda tweet: tweet.is_reply,
+    'tweet_id': lambda tweet: tweet.id,
+    'tweet_body': lambda tweet: tweet.text,
+    'language': lambda tweet: tweet.language,
+    'likes': lambda tweet: tweet.likes,
+    'retweet_count': lambda tweet: tweet.retweet_counts,
+    'source': lambda tweet: tweet.source,
+    'medias': lambda tweet: tweet.media,
+    'user_mentioned': lambda tweet: tweet.user_mentions,
+    'urls': lambda tweet: tweet.urls,
+    'hashtags': lambda tweet: tweet.hashtags,
+    'symbols': lambda tweet: tweet.symbols,
+}
+
+# Default flattening of the list columns : the key picked out of every item , the picked values are joined by `separator`
+FLATTEN = {
+    'medias': 'media_url_https',
+    'user_mentioned': 'screen_name',
+    'urls': 'expanded_url',
+    'hashtags': 'text',
+    'symbols': 'text',
+}
+
+# Arrow type of the columns which aren't strings
+_ARROW_TYPES = {
+    'Created on': lambda: pyarrow.timestamp("s", tz="UTC"),
+    'is_retweet': lambda: pyarrow.bool_(),
+    'is_reply': lambda: pyarrow.bool_(),
+    'likes': lambda: pyarrow.int64(),
+    'retweet_count': lambda: pyarrow.int64(),
+}
+
+
+def _get(item, key):
+    # Media and ShortUser are dicts , their records aren't
+    return item.get(key) if isinstance(item, dict) else getattr(item, key, None)
+
+
+def _iter_tweets(tweets):
+    # A page of `paginate_tweets` is a list of tweets , a Tweet is a dict
+    for item in tweets:
+        if isinstance(item, list):
+            yield from item
+        else:
+            yield item
+
+
+class TweetFlattener:
+    def __init__(self, headers=WORKBOOK_HEADERS, flatten=None, separator=" "):
+        """
+        Turns a tweet into one row of scalars
+
+        :param headers: ([`str`]) The columns , out of `WORKBOOK_HEADERS`
+        :param flatten: (`dict`) Per list column , the key to pick out of every item or a callable taking the whole list , on top of `FLATTEN`
+        :param separator: (`str`) What the picked values are joined with
+        """
+
+        unknown = [header for header in headers if header not in COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown columns {unknown} , the columns are {list(COLUMNS)}")
+
+        self.headers = list(headers)
+        self.flatten = {**FLATTEN, **(flatten or {})}
+        self.separator = separator
+
+    def __repr__(self):
+        return f"TweetFlattener(headers={len(self.headers)}, separator={self.separator!r})"
+
+    def row(self, tweet):
+        """
+        :return: list of the values of `tweet` , in the order of `headers`
+        """
+
+        return [self._flatten(header, COLUMNS[header](tweet)) for header in self.headers]
+
+    def _flatten(self, header, value):
+        rule = self.flatten.get(header)
+        if rule is None or not isinstance(value, (list, tuple)):
+            return value
+
+        if callable(rule):
+            return rule(value)
+
+        return self.separator.join(str(picked) for picked in (_get(item, rule) for item in value) if picked is not None)
+
+
+def export_csv(tweets, path, flattener: TweetFlattener = None, **kwargs):
+    """
+    Write the tweets to a CSV file , one row at a time
+
+    :param tweets: (iterable of `.types.twDataTypes.Tweet` or of pages) e.g. the generator returned by `paginate_tweets`
+    :param path: (`str`) The file
+    :param flattener: (`TweetFlattener`) The columns and how they are flattened , the WORKBOOK_HEADERS by default
+    :param kwargs: Handed to `csv.writer` , e.g. `delimiter`
+
+    :return: int , the number of tweets written
+    """
+
+    flattener = flattener or TweetFlattener()
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, **kwargs)
+        writer.writerow(flattener.headers)
+        for tweet in _iter_tweets(tweets):
+            writer.writerow(flattener.row(tweet))
+            count += 1
+
+    return count
+
+
+def export_xlsx(tweets, path, flattener: TweetFlattener = None, sheet_title="Tweets"):
+    """
+    Write the tweets to an Excel workbook with a write-only openpyxl workbook , the rows aren't kept in memory
+
+    :param tweets: (iterable of `.types.twDataTypes.Tweet` or of pages) e.g. the generator returned by `paginate_tweets`
+    :param path: (`str`) The file
+    :param flattener: (`TweetFlattener`) The columns and how they are flattened , the WORKBOOK_HEADERS by default
+    :param sheet_title: (`str`) Title of the sheet
+
+    :return: int , the number of tweets written
+    """
+
+    if openpyxl is None:
+        raise ImportError("export_xlsx needs openpyxl , install it with `pip install openpyxl`")
+
+    flattener = flattener or TweetFlattener()
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_title)
+    sheet.append(flattener.headers)
+    count = 0
+    for tweet in _iter_tweets(tweets):
+        sheet.append([_to_naive_utc(value) for value in flattener.row(tweet)])
+        count += 1
+
+    workbook.save(path)
+    return count
+
+
+def export_parquet(tweets, path, flattener: TweetFlattener = None, batch_size: int = 10000):
+    """
+    Write the tweets to a Parquet file , one row group per `batch_size` tweets
+
+    :param tweets: (iterable of `.types.twDataTypes.Tweet` or of pages) e.g. the generator returned by `paginate_tweets`
+    :param path: (`str`) The file
+    :param flattener: (`TweetFlattener`) The columns and how they are flattened , the WORKBOOK_HEADERS by default
+    :param batch_size: (`int`) Number of tweets kept in memory before they are written
+
+    :return: int , the number of tweets written
+    """
+
+    if pyarrow is None:
+        raise ImportError("export_parquet needs pyarrow , install it with `pip install pyarrow`")
+
+    flattener = flattener or TweetFlattener()
+    schema = pyarrow.schema([
+        (header, _ARROW_TYPES[header]() if header in _ARROW_TYPES else pyarrow.string())
+        for header in flattener.headers
+    ])
+    count = 0
+    with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+        for batch in _batches(_iter_tweets(tweets), batch_size):
+            columns = list(zip(*[flattener.row(tweet) for tweet in batch]))
+            arrays = [
+                pyarrow.array(values if field.type != pyarrow.string() else [_to_str(value) for value in values], type=field.type)
+                for field, values in zip(schema, columns)
+            ]
+            writer.write_table(pyarrow.Table.from_arrays(arrays, schema=schema))
+            count += len(batch)
+
+    return count
+
+
+def _batches(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def _to_str(value):
+    if value is None or isinstance(value, str):
+        return value
+
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+def _to_naive_utc(value):
+    # Excel has no time zones
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+    return value
@@ -0,0 +1,59 @@
+import threading
+
+# event -> keyword arguments its callbacks are called with
+EVENTS = {
+    "before_request": ("endpoint", "request_data", "attempt"),
+    "after_response": ("endpoint", "response", "elapsed", "attempt"),
+    "on_retry": ("endpoint", "response", "attempt"),
+    "on_parse": ("endpoint", "size", "elapsed"),
+    "on_guest_token": ("token", "elapsed"),
+}
+
+
+class Hooks:
+    def __init__(self):
+        """
+        Callbacks a `Request` calls while it works , every callback gets the keyword arguments listed in `EVENTS`
+
+        `before_request` is called right before a request is sent , `after_response` once its body is read ,
+        `on_retry` when the response retired the guest token and the request is sent again with another one ,
+        `on_parse` once the body is decoded and `on_guest_token` when a new guest token was fetched.
+        `elapsed` is in seconds , `size` in bytes. The callbacks run on the thread or the event loop of the request ,
+        so they should return quickly
+        """
+
+        self._callbacks = {event: () for event in EVENTS}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"Hooks({', '.join(f'{event}={len(callbacks)}' for event, callbacks in self._callbacks.items() if callbacks)})"
+
+    def __bool__(self):
+        return any(self._callbacks.values())
+
+    def add(self, event, callback):
+        """
+        :param event: (`str`) One of `EVENTS`
+        :param callback: (`callable`) Called with the keyword arguments of the event
+
+        :return: callback
+        """
+
+        if event not in EVENTS:
+            raise ValueError(f"Unknown event {event} , expected one of {', '.join(EVENTS)}")
+
+        # Copied on write , so emit never holds the lock and a callback may add or remove callbacks
+        with self._lock:
+            self._callbacks[event] = self._callbacks[event] + (callback,)
+
+        return callback
+
+    def remove(self, event, callback):
+        with self._lock:
+            callbacks = list(self._callbacks[event])
+            callbacks.remove(callback)
+            self._callbacks[event] = tuple(callbacks)
+
+    def emit(self, event, **kwargs):
+        for callback in self._callbacks[event]:
+            callback(**kwargs)
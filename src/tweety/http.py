@@ -1,52 +1,199 @@
+import asyncio
+import threading
+import time
+import weakref
 import httpx as s
 from .exceptions_ import GuestTokenNotFound, UnknownError
-from .utils import custom_json
+from .utils import custom_json, decode_response, json_loads as default_json_loads
 from .builder import UrlBuilder
+from .tokens import GuestToken, GuestTokenPool, RETIRE_STATUS_CODES, DISCARD_GRACE
+from .ratelimit import RateLimitScheduler, get_endpoint
+from .singleflight import SingleFlight, DETAIL_CACHE_TTL
+from .hooks import Hooks
+from .profiling import current_page, measure
 
 s.Response.json_ = custom_json
 
+# Seconds between two checks of the background token refresher
+TOKEN_REFRESH_INTERVAL = 60
+
+
+class _BaseRequest:
+    # The httpx client class every guest token session is made with
+    _SESSION = None
+
+    def __init__(self, max_retries=10, proxy=None, json_loads=None, pool_size=1, token_strategy=GuestTokenPool.ROUND_ROBIN,
+                 detail_cache_ttl=DETAIL_CACHE_TTL, archive=None, transport=None, hooks=None):
+        """
+        What Request and AsyncRequest share : the request building , the token and rate limit bookkeeping and the decoding.
+        They only differ by how a request is sent , so the endpoint methods return whatever `_get` returns ,
+        the payload for a Request and an awaitable of it for an AsyncRequest
+        """
 
-class Request:
-    def __init__(self, max_retries=10, proxy=None):
         self.__builder = UrlBuilder()
-        self.__session = s.Client()
-        self.__session.proxies = proxy
-        self.__guest_token = self._get_guest_token(max_retries)
-        self._init_api()
+        self.__proxy = proxy
+        self.__archive = archive
+        self.__transport = transport
+        self.__hooks = hooks if hooks is not None else Hooks()
+        self.__max_retries = max_retries
+        self.__json_loads = json_loads or default_json_loads
+        self.__pool = GuestTokenPool(pool_size, strategy=token_strategy)
+        self.__scheduler = RateLimitScheduler()
+        self.__detail_flight = SingleFlight(ttl=detail_cache_ttl)
 
-    def _get_guest_token(self, max_retries=10):
-        for retry in range(max_retries):
-            response = self.__session.post(**self.__builder.get_guest_token())
+    @property
+    def token_pool(self):
+        return self.__pool
 
-            if response.json_(): # noqa
-                token = self.__builder.guest_token = response.json_()['guest_token'] # noqa
-                return token
+    @property
+    def scheduler(self):
+        return self.__scheduler
 
-        raise GuestTokenNotFound(f"Guest Token couldn't be found after {max_retries} retires.")
+    @property
+    def detail_flight(self):
+        return self.__detail_flight
+
+    @property
+    def archive(self):
+        return self.__archive
+
+    @property
+    def hooks(self):
+        return self.__hooks
+
+    @property
+    def max_retries(self):
+        return self.__max_retries
+
+    def _discarded_sessions(self, grace=DISCARD_GRACE):
+        # A session built on a given transport owns no connections , closing it would close the transport of the others
+        tokens = self.__pool.take_discarded(grace)
+        return [token.session for token in tokens] if self.__transport is None else []
+
+    def _decode(self, response):
+        # Every body is decoded exactly once here , the parsed payload is what the models receive
+        return decode_response(response, self.__json_loads)
 
-    def _init_api(self):
+    def _parse(self, endpoint, response):
+        with measure("decode"):
+            if not self.__hooks:
+                return self._decode(response)
+
+            start = time.perf_counter()
+            data = self._decode(response)
+            self.__hooks.emit("on_parse", endpoint=endpoint, size=len(response.content), elapsed=time.perf_counter() - start)
+            return data
+
+    def _archive(self, request_data, response):
+        # The raw body is kept as it came , so it can be parsed again offline
+        if self.__archive is not None and response is not None:
+            self.__archive.add(request_data['url'], response.content, response.status_code)
+
+    def _new_session(self):
+        session = self._SESSION(transport=self.__transport)
+        session.proxies = self.__proxy
+        return session
+
+    def _guest_token_request(self):
+        request_data = self.__builder.get_guest_token()
+        request_data['headers'].pop('x-guest-token', None)
+        return request_data
+
+    def _read_guest_token(self, response):
+        data = self._decode(response)
+        if data:
+            self.__builder.guest_token = data['guest_token']
+            return data['guest_token']
+
+        return None
+
+    def _init_api_request(self, token):
         data = self.__builder.init_api()
         data['json'] = {}
-        self.__session.post(**data)
+        data['headers']['x-guest-token'] = token.value
+        return data
 
-    def get_user_by_sceen_name(self, screen_name):
-        response = self.__session.get(**self.__builder.user_by_screen_name(screen_name))
+    def _token_created(self, token, start):
+        self.__hooks.emit("on_guest_token", token=token, elapsed=time.perf_counter() - start)
+        return token
+
+    def _pick_token(self, endpoint, acquire):
+        # Prefer a token which still has budget for the endpoint , else the one whose window resets first
+        candidates = []
+        for _ in range(max(1, len(self.__pool))):
+            token = acquire()
+            delay = self.__scheduler.delay(endpoint, token.value)
+            if not delay:
+                return token
+
+            candidates.append((delay, token))
 
-        if response.json_() and response.json().get("data"): # noqa
-            return response.json()
+        return min(candidates, key=lambda candidate: candidate[0])[1]
+
+    def _start_request(self, request_data):
+        endpoint = get_endpoint(request_data['url'])
+        page = current_page()
+        if page is not None:
+            page.endpoint = endpoint
+
+        return endpoint, page
+
+    def _before_request(self, endpoint, token, request_data, attempt):
+        request_data['headers']['x-guest-token'] = token.value
+        self.__hooks.emit("before_request", endpoint=endpoint, request_data=request_data, attempt=attempt)
+        return time.perf_counter()
+
+    def _on_response(self, endpoint, token, response, start, attempt, page):
+        """
+        Record a response in the hooks , the page profile , the rate limits and the token pool
+
+        :return: True if the response is final , False when the request is to be retried on another token
+        """
+
+        self.__hooks.emit("after_response", endpoint=endpoint, response=response, elapsed=time.perf_counter() - start, attempt=attempt)
+        if page is not None:
+            page.requests += 1
+
+        limit = self.__scheduler.update(endpoint, token.value, response.headers, response.status_code)
+        if limit is not None and limit.remaining == 0:
+            self.__pool.mark_limited(token)
+
+        if response.status_code not in RETIRE_STATUS_CODES:
+            return True
+
+        self.__pool.retire(token)
+        self.__scheduler.forget(token.value)
+        if attempt < self.__pool.size:
+            self.__hooks.emit("on_retry", endpoint=endpoint, response=response, attempt=attempt)
+        return False
+
+    def _result(self, endpoint, response, raw=False):
+        if raw:
+            return response.content
+
+        return self._parse(endpoint, response)
+
+    @staticmethod
+    def _user_or_false(data):
+        if data and data.get("data"):
+            return data
 
         return False
 
-    def get_tweets(self, user_id, replies=False, cursor=None):
+    def get_users_by_rest_ids(self, user_ids):
+        return self._get(self.__builder.users_by_rest_ids(user_ids))
+
+    def get_users_by_screen_names(self, screen_names):
+        return self._get(self.__builder.users_by_screen_names(screen_names))
+
+    def get_tweets(self, user_id, replies=False, cursor=None, raw=False):
         request_data = self.__builder.user_tweets(user_id=user_id, replies=replies, cursor=cursor)
-        response = self.__session.get(**request_data)
-        return response
+        return self._get(request_data, raw)
 
     def get_trends(self):
-        response = self.__session.get(**self.__builder.trends())
-        return response
+        return self._get(self.__builder.trends())
 
-    def perform_search(self, keyword, cursor, filter_):
+    def perform_search(self, keyword, cursor, filter_, raw=False):
         if keyword.startswith("#"):
             keyword = f"%23{keyword[1:]}"
 
@@ -54,9 +201,190 @@ class Request:
         del request_data['headers']['content-type']
         request_data['headers']['referer'] = f"https://twitter.com/search?q={keyword}"
 
-        response = self.__session.get(**request_data)
-        return response
+        return self._get(request_data, raw)
+
+    def _user_by_screen_name(self, screen_name):
+        return self._get(self.__builder.user_by_screen_name(screen_name))
+
+    def _tweet_detail(self, tweetId, cursor=None):
+        return self._get(self.__builder.tweet_detail(tweetId, cursor))
+
+    def _get(self, request_data, raw=False):
+        raise NotImplementedError
+
+
+class Request(_BaseRequest):
+    _SESSION = s.Client
+
+    def __init__(self, max_retries=10, proxy=None, json_loads=None, pool_size=1, token_strategy=GuestTokenPool.ROUND_ROBIN,
+                 detail_cache_ttl=DETAIL_CACHE_TTL, archive=None, transport=None, hooks=None):
+        super().__init__(max_retries, proxy, json_loads, pool_size, token_strategy, detail_cache_ttl, archive, transport, hooks)
+        self.token_pool.refresh(self._new_token)
+        self.__closed = threading.Event()
+        self.__refresher = threading.Thread(target=_refresh_tokens, args=(weakref.ref(self), self.__closed), daemon=True)
+        self.__refresher.start()
+
+    def close(self):
+        self.__closed.set()
+        # A refresh in progress would add tokens whose session is never closed
+        if self.__refresher is not threading.current_thread():
+            self.__refresher.join()
+
+        for token in self.token_pool.tokens:
+            token.session.close()
+        self._close_discarded(grace=0)
+
+    def _close_discarded(self, grace=DISCARD_GRACE):
+        for session in self._discarded_sessions(grace):
+            session.close()
+
+    def _new_token(self):
+        # Each token gets its own session , so the cookies set for one token never leak into another
+        start = time.perf_counter()
+        session = self._new_session()
+        token = GuestToken(self._get_guest_token(session, self.max_retries), session)
+        session.post(**self._init_api_request(token))
+        return self._token_created(token, start)
+
+    def _refresh_tokens(self):
+        self.token_pool.refresh(self._new_token)
+        self._close_discarded()
+
+    def _get_guest_token(self, session, max_retries=10):
+        for retry in range(max_retries):
+            token = self._read_guest_token(session.post(**self._guest_token_request()))
+            if token:
+                return token
+
+        raise GuestTokenNotFound(f"Guest Token couldn't be found after {max_retries} retires.")
+
+    def _acquire(self, endpoint):
+        return self._pick_token(endpoint, lambda: self.token_pool.acquire() or self.token_pool.add(self._new_token()))
+
+    def _get(self, request_data, raw=False):
+        response = None
+        endpoint, page = self._start_request(request_data)
+
+        # A token answering with 429/403 is retired and the request is retried on another one
+        for retry in range(self.token_pool.size + 1):
+            token = self._acquire(endpoint)
+            delay = self.scheduler.reserve(endpoint, token.value)
+            if delay:
+                with measure("throttle"):
+                    time.sleep(delay)
+
+            start = self._before_request(endpoint, token, request_data, retry)
+            with measure("network"):
+                response = token.session.get(**request_data)
+
+            if self._on_response(endpoint, token, response, start, retry, page):
+                break
+
+        self._archive(request_data, response)
+        return self._result(endpoint, response, raw)
+
+    def get_user_by_sceen_name(self, screen_name):
+        return self._user_or_false(self._user_by_screen_name(screen_name))
+
+    def get_tweet_detail(self, tweetId, cursor=None):
+        # The same conversation is asked for by tweet_detail , the threads and every reply of it , they share one request
+        return self.detail_flight.do((str(tweetId), cursor), lambda: self._tweet_detail(tweetId, cursor))
+
+
+def _refresh_tokens(request_ref, closed):
+    # Only holds a weak reference , the thread ends with the Request it refreshes
+    while not closed.wait(TOKEN_REFRESH_INTERVAL):
+        request = request_ref()
+        if request is None:
+            return
+
+        try:
+            request._refresh_tokens()
+        except Exception:
+            pass
+
+        del request
+
+
+class AsyncRequest(_BaseRequest):
+    _SESSION = s.AsyncClient
+
+    def __init__(self, max_retries=10, proxy=None, json_loads=None, pool_size=1, token_strategy=GuestTokenPool.ROUND_ROBIN,
+                 detail_cache_ttl=DETAIL_CACHE_TTL, archive=None, transport=None, hooks=None):
+        super().__init__(max_retries, proxy, json_loads, pool_size, token_strategy, detail_cache_ttl, archive, transport, hooks)
+        self.__lock = None
+
+    async def aclose(self):
+        for token in self.token_pool.tokens:
+            await token.session.aclose()
+        await self._close_discarded(grace=0)
+
+    async def _close_discarded(self, grace=DISCARD_GRACE):
+        for session in self._discarded_sessions(grace):
+            await session.aclose()
+
+    async def _ensure_guest_token(self):
+        # The tokens can't be fetched from __init__ , so they are fetched on the event loop when the pool runs short
+        await self._close_discarded()
+        if self.token_pool.missing <= 0:
+            return
+
+        if self.__lock is None:
+            self.__lock = asyncio.Lock()
+
+        async with self.__lock:
+            missing = self.token_pool.missing
+            if missing > 0:
+                for token in await asyncio.gather(*[self._new_token() for _ in range(missing)]):
+                    self.token_pool.add(token)
+
+    async def _archive(self, request_data, response):
+        # The file and the index are written on a thread of the default executor , not on the event loop
+        if self.archive is not None and response is not None:
+            await asyncio.get_running_loop().run_in_executor(None, super()._archive, request_data, response)
+
+    async def _new_token(self):
+        start = time.perf_counter()
+        session = self._new_session()
+        token = GuestToken(await self._get_guest_token(session, self.max_retries), session)
+        await session.post(**self._init_api_request(token))
+        return self._token_created(token, start)
+
+    async def _get_guest_token(self, session, max_retries=10):
+        for retry in range(max_retries):
+            token = self._read_guest_token(await session.post(**self._guest_token_request()))
+            if token:
+                return token
+
+        raise GuestTokenNotFound(f"Guest Token couldn't be found after {max_retries} retires.")
+
+    def _acquire(self, endpoint):
+        return self._pick_token(endpoint, self.token_pool.acquire)
+
+    async def _get(self, request_data, raw=False):
+        response = None
+        endpoint, page = self._start_request(request_data)
+
+        for retry in range(self.token_pool.size + 1):
+            await self._ensure_guest_token()
+            token = self._acquire(endpoint)
+            delay = self.scheduler.reserve(endpoint, token.value)
+            if delay:
+                with measure("throttle"):
+                    await asyncio.sleep(delay)
+
+            start = self._before_request(endpoint, token, request_data, retry)
+            with measure("network"):
+                response = await token.session.get(**request_data)
+
+            if self._on_response(endpoint, token, response, start, retry, page):
+                break
+
+        await self._archive(request_data, response)
+        return self._result(endpoint, response, raw)
+
+    async def get_user_by_sceen_name(self, screen_name):
+        return self._user_or_false(await self._user_by_screen_name(screen_name))
 
-    def get_tweet_detail(self, tweetId):
-        response = self.__session.get(**self.__builder.tweet_detail(tweetId))
-        return response
+    async def get_tweet_detail(self, tweetId, cursor=None):
+        return await self.detail_flight.do_async((str(tweetId), cursor), lambda: self._tweet_detail(tweetId, cursor))
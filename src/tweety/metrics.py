@@ -0,0 +1,182 @@
+import bisect
+import threading
+from .hooks import Hooks
+
+# Upper bounds in seconds of the latency buckets , the last bucket (+Inf) is implied
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def __repr__(self):
+        return f"Histogram(count={self.count}, sum={self.sum:.3f})"
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """
+        :return: [(`str`, `int`)] (upper bound , observations up to it) , like the buckets of a Prometheus histogram
+        """
+
+        total, result = 0, []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return result
+
+    def to_dict(self):
+        return {"count": self.count, "sum": round(self.sum, 6), "buckets": dict(self.cumulative())}
+
+
+class MetricsCollector:
+    # name -> (type , help) of every exported metric
+    METRICS = {
+        "tweety_requests_total": ("counter", "Responses received , by endpoint and status code"),
+        "tweety_response_bytes_total": ("counter", "Bytes of the response bodies , by endpoint"),
+        "tweety_retries_total": ("counter", "Requests sent again with another guest token , by endpoint and status code"),
+        "tweety_guest_tokens_total": ("counter", "Guest tokens fetched"),
+        "tweety_request_seconds": ("histogram", "Time from sending a request to reading its body , by endpoint"),
+        "tweety_parse_seconds": ("histogram", "Time spent decoding the response bodies , by endpoint"),
+        "tweety_guest_token_seconds": ("histogram", "Time spent fetching a guest token"),
+    }
+
+    def __init__(self, hooks=None, buckets=LATENCY_BUCKETS):
+        """
+        Counts the requests , bytes , status codes , retries and guest tokens of a `Request` and keeps the latencies
+        of the network and of the decoding apart , pass its `hooks` to `Tweety(hooks=...)`
+
+        :param hooks: (`.hooks.Hooks`) Hooks to collect from , new ones when None
+        :param buckets: ([`float`]) Upper bounds in seconds of the latency buckets
+        """
+
+        self.hooks = hooks if hooks is not None else Hooks()
+        self.buckets = tuple(buckets)
+        self._requests = {}
+        self._bytes = {}
+        self._retries = {}
+        self._request_seconds = {}
+        self._parse_seconds = {}
+        self._guest_tokens = 0
+        self._guest_token_seconds = Histogram(self.buckets)
+        self._lock = threading.Lock()
+
+        self.hooks.add("after_response", self._after_response)
+        self.hooks.add("on_retry", self._on_retry)
+        self.hooks.add("on_parse", self._on_parse)
+        self.hooks.add("on_guest_token", self._on_guest_token)
+
+    def __repr__(self):
+        return f"MetricsCollector(requests={sum(self._requests.values())}, endpoints={len(self._request_seconds)})"
+
+    def _histogram(self, histograms, endpoint):
+        histogram = histograms.get(endpoint)
+        if histogram is None:
+            histogram = histograms[endpoint] = Histogram(self.buckets)
+        return histogram
+
+    def _after_response(self, endpoint, response, elapsed, attempt):
+        key = (endpoint, response.status_code)
+        with self._lock:
+            self._requests[key] = self._requests.get(key, 0) + 1
+            self._bytes[endpoint] = self._bytes.get(endpoint, 0) + len(response.content)
+            self._histogram(self._request_seconds, endpoint).observe(elapsed)
+
+    def _on_retry(self, endpoint, response, attempt):
+        key = (endpoint, response.status_code)
+        with self._lock:
+            self._retries[key] = self._retries.get(key, 0) + 1
+
+    def _on_parse(self, endpoint, size, elapsed):
+        with self._lock:
+            self._histogram(self._parse_seconds, endpoint).observe(elapsed)
+
+    def _on_guest_token(self, token, elapsed):
+        with self._lock:
+            self._guest_tokens += 1
+            self._guest_token_seconds.observe(elapsed)
+
+    def reset(self):
+        with self._lock:
+            self._requests, self._bytes, self._retries = {}, {}, {}
+            self._request_seconds, self._parse_seconds = {}, {}
+            self._guest_tokens = 0
+            self._guest_token_seconds = Histogram(self.buckets)
+
+    def snapshot(self):
+        """
+        :return: `dict` of the totals , the guest tokens and every endpoint with its requests by status code ,
+                 bytes , retries and the network / parse latency histograms
+        """
+
+        with self._lock:
+            endpoints = {}
+            for endpoint in sorted({endpoint for endpoint, _ in self._requests} | set(self._parse_seconds)):
+                statuses = {status: count for (name, status), count in sorted(self._requests.items()) if name == endpoint}
+                network = self._request_seconds.get(endpoint) or Histogram(self.buckets)
+                parse = self._parse_seconds.get(endpoint) or Histogram(self.buckets)
+                endpoints[endpoint] = {
+                    "requests": sum(statuses.values()),
+                    "statuses": statuses,
+                    "bytes": self._bytes.get(endpoint, 0),
+                    "retries": sum(count for (name, _), count in self._retries.items() if name == endpoint),
+                    "network_seconds": network.to_dict(),
+                    "parse_seconds": parse.to_dict(),
+                }
+
+            return {
+                "requests": sum(self._requests.values()),
+                "bytes": sum(self._bytes.values()),
+                "retries": sum(self._retries.values()),
+                "guest_tokens": {"fetched": self._guest_tokens, "seconds": self._guest_token_seconds.to_dict()},
+                "endpoints": endpoints,
+            }
+
+    def to_prometheus(self):
+        """
+        :return: `str` of the metrics in the Prometheus text exposition format
+        """
+
+        with self._lock:
+            samples = {
+                "tweety_requests_total": [({"endpoint": endpoint, "status": status}, count)
+                                          for (endpoint, status), count in sorted(self._requests.items())],
+                "tweety_response_bytes_total": [({"endpoint": endpoint}, size) for endpoint, size in sorted(self._bytes.items())],
+                "tweety_retries_total": [({"endpoint": endpoint, "status": status}, count)
+                                         for (endpoint, status), count in sorted(self._retries.items())],
+                "tweety_guest_tokens_total": [({}, self._guest_tokens)],
+                "tweety_request_seconds": [({"endpoint": endpoint}, histogram) for endpoint, histogram in sorted(self._request_seconds.items())],
+                "tweety_parse_seconds": [({"endpoint": endpoint}, histogram) for endpoint, histogram in sorted(self._parse_seconds.items())],
+                "tweety_guest_token_seconds": [({}, self._guest_token_seconds)],
+            }
+
+            lines = []
+            for name, (kind, help_) in self.METRICS.items():
+                lines.append(f"# HELP {name} {help_}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples[name]:
+                    if kind == "counter":
+                        lines.append(f"{name}{_labels(labels)} {value}")
+                        continue
+
+                    for bound, count in value.cumulative():
+                        lines.append(f"{name}_bucket{_labels(dict(labels, le=bound))} {count}")
+                    lines.append(f"{name}_sum{_labels(labels)} {value.sum}")
+                    lines.append(f"{name}_count{_labels(labels)} {value.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+
+    values = (str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for value in labels.values())
+    return "{" + ",".join(f'{key}="{value}"' for key, value in zip(labels, values)) + "}"
@@ -0,0 +1,91 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from .utils import json_loads
+from .types.records import to_record
+from .types.search import Search
+from .types.usertweet import UserTweets
+
+
+def _load(body):
+    return json_loads(body) if isinstance(body, (bytes, bytearray, str)) else body
+
+
+def parse_timeline_page(body, get_replies=False, cursor=None, since_id=None, newest_id=None):
+    """
+    Build a UserTweets page into records , what a worker process runs
+
+    :param body: (`bytes` | `dict`) The raw body of the page , or its decoded payload
+    :param get_replies: (`boolean`) The page is of UserTweetsAndReplies
+    :param cursor: (`str`) The cursor the page was requested with
+    :param since_id: (`str`) `since_id` of the timeline
+    :param newest_id: (`str`) `newest_id` of the timeline before this page
+
+    :return: ([`.types.records.TweetRecord`], `str`, `boolean`, `str`) The tweets , the next cursor ,
+             whether there is a next page and the new `newest_id` , None if the payload has no timeline
+    """
+
+    payload = _load(body)
+    # Built eagerly , so a malformed tweet fails inside the per tweet try of _parse_page and is skipped like in the serial parser
+    timeline = UserTweets(None, None, get_replies, 0, cursor=cursor, lazy=False, since_id=since_id)
+    timeline.newest_id = newest_id
+    try:
+        entries = timeline._get_entries(payload)
+    except Exception:
+        return None
+
+    tweets = timeline._parse_page(payload, entries)
+    return [to_record(tweet) for tweet in tweets], timeline.cursor, timeline.is_next_page, timeline.newest_id
+
+
+def parse_search_page(body, keyword, filter_=None, cursor=None):
+    """
+    Build a search page into records , what a worker process runs
+
+    :return: ([`.types.records.TweetRecord`] | [`.types.records.UserRecord`], `str`, `boolean`) The results ,
+             the next cursor and whether there is a next page
+    """
+
+    search = Search(keyword, None, 0, filter_, 0, cursor, False, False)
+    results = search._parse_response(_load(body))
+    return [to_record(result) for result in results], search.cursor, search.is_next_page
+
+
+class ParsePool:
+    def __init__(self, workers=None, mp_context=None):
+        """
+        Builds the timeline and search pages in worker processes , so the parsing of many concurrent crawls uses
+        every core. Only the raw bodies are sent to the workers and the results come back as the picklable ,
+        http free `.types.records.TweetRecord` / `UserRecord` in place of `Tweet` / `User`
+
+        :param workers: (`int`) Number of worker processes , the number of CPUs by default
+        :param mp_context: (`multiprocessing.context.BaseContext`) How the workers are started
+        """
+
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp_context)
+
+    def __repr__(self):
+        return f"ParsePool(workers={self.workers})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def submit_timeline(self, body, get_replies=False, cursor=None, since_id=None, newest_id=None):
+        """
+        :return: `concurrent.futures.Future` of the result of `parse_timeline_page`
+        """
+
+        return self._executor.submit(parse_timeline_page, body, get_replies, cursor, since_id, newest_id)
+
+    def submit_search(self, body, keyword, filter_=None, cursor=None):
+        """
+        :return: `concurrent.futures.Future` of the result of `parse_search_page`
+        """
+
+        return self._executor.submit(parse_search_page, body, keyword, filter_, cursor)
+
+    def close(self, wait=True):
+        self._executor.shutdown(wait=wait)
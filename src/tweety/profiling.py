@@ -0,0 +1,165 @@
+import contextlib
+import contextvars
+import threading
+import time
+from collections import deque
+
+# The phases a page is made of : waiting before it , waiting on the rate limit , the HTTP round trip ,
+# decoding the body and building the Tweet / User objects
+PHASES = ("sleep", "throttle", "network", "decode", "build")
+
+# The page being profiled on this thread or asyncio task , the requests made for it are timed into it
+_current_page = contextvars.ContextVar("tweety_profile_page", default=None)
+
+
+def current_page():
+    return _current_page.get()
+
+
+class PageProfile:
+    def __init__(self, cursor=None):
+        """
+        Wall and CPU seconds spent on each phase of one page
+
+        :param cursor: (`str`) The cursor the page was requested with
+        """
+
+        self.cursor = cursor
+        self.endpoint = None
+        self.requests = 0
+        self.items = 0
+        self.wall = dict.fromkeys(PHASES, 0.0)
+        self.cpu = dict.fromkeys(PHASES, 0.0)
+
+    def __repr__(self):
+        return f"PageProfile(endpoint={self.endpoint}, items={self.items}, " + \
+               ", ".join(f"{phase}={wall * 1000:.1f}ms" for phase, wall in self.wall.items() if wall) + ")"
+
+    def add(self, phase, wall, cpu=0.0):
+        self.wall[phase] += wall
+        self.cpu[phase] += cpu
+
+    def to_dict(self):
+        return {"cursor": self.cursor, "endpoint": self.endpoint, "requests": self.requests, "items": self.items,
+                "wall": dict(self.wall), "cpu": dict(self.cpu)}
+
+
+class _Measure:
+    __slots__ = ("phase", "page", "wall", "cpu", "profile")
+
+    def __init__(self, phase, page, profile=None):
+        self.phase = phase
+        self.page = page
+        self.profile = profile
+
+    def __enter__(self):
+        if self.page is not None:
+            self.wall, self.cpu = time.perf_counter(), time.thread_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.page is None:
+            return
+
+        wall, cpu = time.perf_counter() - self.wall, time.thread_time() - self.cpu
+        if self.profile is not None:
+            self.profile.add(self.page, self.phase, wall, cpu)
+        else:
+            self.page.add(self.phase, wall, cpu)
+
+
+def measure(phase):
+    """
+    Time a phase into the page being profiled , does nothing when no page is
+
+    :param phase: (`str`) One of `PHASES`
+    """
+
+    return _Measure(phase, _current_page.get())
+
+
+class Profile:
+    def __init__(self, keep_pages=100):
+        """
+        Where the phases of the profiled pages are recorded , per page and per endpoint
+
+        The CPU time is the one of the thread , with asyncio it includes the other tasks which ran while a request was awaited
+
+        :param keep_pages: (`int`) Most recent pages kept in `pages` , the endpoint totals count all of them
+        """
+
+        self.pages = deque(maxlen=keep_pages)
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"Profile(pages={sum(totals['pages'] for totals in self._endpoints.values())}, endpoints={list(self._endpoints)})"
+
+    @contextlib.contextmanager
+    def page(self, cursor=None):
+        """
+        Profile the page requested in the block , the requests made in it are timed into the page
+
+        :return: PageProfile
+        """
+
+        page = PageProfile(cursor)
+        token = _current_page.set(page)
+        try:
+            yield page
+        finally:
+            _current_page.reset(token)
+            self._close(page)
+
+    def sleeping(self, page):
+        """
+        Time the wait after a page , into that page and its endpoint
+
+        :param page: (`PageProfile`) The page before the wait
+        """
+
+        return _Measure("sleep", page, self)
+
+    def _totals(self, endpoint):
+        totals = self._endpoints.get(endpoint)
+        if totals is None:
+            totals = self._endpoints[endpoint] = {"pages": 0, "requests": 0, "items": 0,
+                                                  "wall": dict.fromkeys(PHASES, 0.0), "cpu": dict.fromkeys(PHASES, 0.0)}
+        return totals
+
+    def _close(self, page):
+        with self._lock:
+            self.pages.append(page)
+            totals = self._totals(page.endpoint)
+            totals["pages"] += 1
+            totals["requests"] += page.requests
+            totals["items"] += page.items
+            for phase in PHASES:
+                totals["wall"][phase] += page.wall[phase]
+                totals["cpu"][phase] += page.cpu[phase]
+
+    def add(self, page, phase, wall, cpu=0.0):
+        # For the time spent after a page was closed
+        with self._lock:
+            page.add(phase, wall, cpu)
+            totals = self._totals(page.endpoint)
+            totals["wall"][phase] += wall
+            totals["cpu"][phase] += cpu
+
+    def summary(self):
+        """
+        :return: `dict` of endpoint -> pages , requests , items and the wall / CPU seconds of every phase
+        """
+
+        with self._lock:
+            return {endpoint: {key: dict(value) if isinstance(value, dict) else value for key, value in totals.items()}
+                    for endpoint, totals in self._endpoints.items()}
+
+
+def profile_page(profile, cursor=None):
+    # What the paginators use , a no-op giving None when they aren't profiled
+    return profile.page(cursor) if profile is not None else contextlib.nullcontext()
+
+
+def sleeping(profile, page):
+    return profile.sleeping(page) if profile is not None else contextlib.nullcontext()
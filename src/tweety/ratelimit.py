@@ -0,0 +1,168 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+# Seconds added to x-rate-limit-reset , so the first request after a reset doesn't race the server clock
+RESET_MARGIN = 1
+
+# Seconds to wait after a 429 which tells neither x-rate-limit-reset nor Retry-After , doubled on every
+# 429 in a row up to RETRY_BACKOFF_MAX
+RETRY_BACKOFF = 5
+RETRY_BACKOFF_MAX = 300
+
+
+def get_endpoint(url):
+    """
+    Name of the endpoint a request goes to , e.g. `UserTweets` or `adaptive.json`
+
+    :param url: (`str`) The request url
+    """
+
+    return urlsplit(str(url)).path.rsplit("/", 1)[-1]
+
+
+class RateLimit:
+    def __init__(self, limit=None, remaining=None, reset=None):
+        """
+        The budget of one endpoint for one guest token , as reported by the x-rate-limit-* headers
+
+        :param limit: (`int`) Requests allowed per window
+        :param remaining: (`int`) Requests left in the current window
+        :param reset: (`float`) Epoch seconds at which the window resets
+        """
+
+        self.limit = limit
+        self.remaining = remaining
+        self.reset = reset
+        # The 429s in a row without a reset time , for the fallback backoff
+        self.retries = 0
+
+    def __repr__(self):
+        return f"RateLimit(limit={self.limit}, remaining={self.remaining}, reset={self.reset})"
+
+
+class RateLimitScheduler:
+    def __init__(self):
+        """
+        Spends the rate limit budget of every (endpoint , token) as fast as it is available and
+        only makes a request wait until the reset once that budget is spent
+        """
+
+        self._limits = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"RateLimitScheduler(endpoints={len(self._limits)})"
+
+    def get(self, endpoint, key=None):
+        return self._limits.get((endpoint, key))
+
+    def reserve(self, endpoint, key=None):
+        """
+        Take one request from the budget
+
+        :param endpoint: (`str`) Name of the endpoint
+        :param key: (`str`) The guest token the request is sent with
+
+        :return: Seconds to wait before sending the request , 0 if it can be sent now
+        """
+
+        with self._lock:
+            limit = self._limits.get((endpoint, key))
+            if limit is None or limit.remaining is None:
+                return 0
+
+            now = time.time()
+            if limit.reset is not None and now >= limit.reset:
+                # The window is over , the next response tells the new budget
+                limit.remaining = None
+                return 0
+
+            if limit.remaining > 0:
+                limit.remaining -= 1
+                return 0
+
+            return max(0, limit.reset - now) if limit.reset is not None else 0
+
+    def delay(self, endpoint, key=None):
+        """
+        :return: Seconds until a request to `endpoint` with `key` may be sent , without reserving it
+        """
+
+        with self._lock:
+            limit = self._limits.get((endpoint, key))
+            if limit is None or limit.remaining is None or limit.remaining > 0 or limit.reset is None:
+                return 0
+
+            return max(0, limit.reset - time.time())
+
+    def update(self, endpoint, key, headers, status_code=200):
+        """
+        Record the budget reported by a response
+
+        :param headers: (`httpx.Headers` | `dict`) Headers of the response
+        :param status_code: (`int`) A 429 means the budget is spent whatever the headers say
+
+        :return: RateLimit or None if the response has no rate limit headers
+        """
+
+        remaining = headers.get("x-rate-limit-remaining")
+        reset = headers.get("x-rate-limit-reset")
+        if remaining is None and status_code != 429:
+            return None
+
+        with self._lock:
+            limit = self._limits.setdefault((endpoint, key), RateLimit())
+            try:
+                limit.limit = int(headers.get("x-rate-limit-limit", limit.limit or 0)) or None
+                limit.remaining = 0 if status_code == 429 else int(remaining)
+                limit.reset = int(reset) + RESET_MARGIN if reset is not None else limit.reset
+            except ValueError:
+                pass
+
+            if status_code != 429:
+                limit.retries = 0
+            elif reset is None:
+                # Without a reset time the 429 would be retried right away
+                limit.reset = time.time() + _retry_after(headers.get("retry-after"), limit.retries)
+                limit.retries += 1
+
+            return limit
+
+    def forget(self, key):
+        """
+        Drop the budgets of a guest token , e.g. once it is retired
+        """
+
+        with self._lock:
+            for limit_key in [limit_key for limit_key in self._limits if limit_key[1] == key]:
+                del self._limits[limit_key]
+
+    def snapshot(self):
+        with self._lock:
+            return {f"{endpoint}:{key}": dict(vars(limit)) for (endpoint, key), limit in self._limits.items()}
+
+
+def _retry_after(value, retries):
+    """
+    Seconds to wait before retrying a rate limited request
+
+    :param value: (`str`) The Retry-After header , seconds or an HTTP date
+    :param retries: (`int`) The 429s in a row already waited for
+
+    :return: Retry-After if it can be read , the fallback backoff otherwise
+    """
+
+    if value is not None:
+        try:
+            return max(0, int(value))
+        except ValueError:
+            pass
+
+        try:
+            return max(0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+
+    return min(RETRY_BACKOFF * 2 ** retries, RETRY_BACKOFF_MAX)
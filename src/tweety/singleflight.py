@@ -0,0 +1,143 @@
+import asyncio
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+# Seconds a TweetDetail payload is served again without a new request , 0 only shares the requests in flight
+DETAIL_CACHE_TTL = 0
+
+
+class _Call:
+    def __init__(self, future=None):
+        self.event = threading.Event()
+        self.future = future
+        self.result = None
+        self.error = None
+        # Number of callers waiting on the call besides the one making it
+        self.shared = 0
+
+
+class SingleFlight:
+    def __init__(self, ttl=0, maxsize=256):
+        """
+        Makes the identical calls running at the same time share one call , and keeps
+        the results for `ttl` seconds so the calls made right after are served too.
+        Every caller gets its own copy of a shared or kept result , so it may change it
+
+        :param ttl: (`int`) Seconds a result is kept for , 0 to only share the calls in flight
+        :param maxsize: (`int`) Number of results kept , the oldest ones are dropped first
+        """
+
+        self.ttl = ttl
+        self.maxsize = max(1, int(maxsize))
+        self.calls = 0
+        self.shared = 0
+        self.hits = 0
+        self._calls = {}
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"SingleFlight(calls={self.calls}, shared={self.shared}, hits={self.hits})"
+
+    def do(self, key, func):
+        """
+        Call `func` unless a call for `key` is in flight or its result is still fresh
+
+        :param key: (`hashable`) What identifies the call
+        :param func: (`callable`) Makes the call
+
+        :return: The result of the call , an exception raised by the call is raised to every caller sharing it
+        """
+
+        with self._lock:
+            found, result = self._get_result(key)
+            if found:
+                return copy.deepcopy(result)
+
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                call.shared += 1
+                self.shared += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        kept = False
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is None:
+                    kept = self._set_result(key, call.result)
+            call.event.set()
+
+        # The result is only handed out as is when no other caller or the cache reads it
+        return copy.deepcopy(call.result) if kept or call.shared else call.result
+
+    async def do_async(self, key, func):
+        """
+        Same as `do` , for the coroutines of one event loop
+
+        :param func: (`callable`) Returns the awaitable making the call
+        """
+
+        found, result = self._get_result(key)
+        if found:
+            return copy.deepcopy(result)
+
+        call = self._calls.get(key)
+        if call is not None:
+            call.shared += 1
+            self.shared += 1
+            # shield , so a cancelled follower doesn't cancel the call the others wait for
+            return copy.deepcopy(await asyncio.shield(call.future))
+
+        call = self._calls[key] = _Call(asyncio.ensure_future(func()))
+        self.calls += 1
+        try:
+            result = await asyncio.shield(call.future)
+        finally:
+            self._calls.pop(key, None)
+
+        kept = self._set_result(key, result)
+        return copy.deepcopy(result) if kept or call.shared else result
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+    def _get_result(self, key):
+        if not self.ttl or key not in self._results:
+            return False, None
+
+        stored_at, result = self._results[key]
+        if time.monotonic() - stored_at > self.ttl:
+            del self._results[key]
+            return False, None
+
+        self.hits += 1
+        return True, result
+
+    def _set_result(self, key, result):
+        # A failed decode (None) is asked for again instead of being served from the cache
+        if not self.ttl or result is None:
+            return False
+
+        self._results[key] = (time.monotonic(), result)
+        self._results.move_to_end(key)
+        while len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+        return True
@@ -0,0 +1,243 @@
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+# Columns of every table , the first ones make up the primary key
+TABLES = {
+    "users": (
+        ("id",), ("screen_name", "name", "description", "location", "created_at", "followers_count", "friends_count",
+                  "favourites_count", "statuses_count", "media_count", "listed_count", "verified", "protected",
+                  "profile_image_url_https", "profile_banner_url", "updated_at")
+    ),
+    "tweets": (
+        ("id",), ("author_id", "created_on", "text", "language", "likes", "retweet_counts", "quote_counts", "reply_counts",
+                  "views", "source", "is_retweet", "is_quoted", "is_reply", "is_possibly_sensitive", "retweeted_tweet_id",
+                  "quoted_tweet_id", "reply_to_id", "updated_at")
+    ),
+    "media": (
+        ("tweet_id", "id"), ("type", "url", "media_url_https", "expanded_url", "display_url")
+    ),
+    "entities": (
+        ("tweet_id", "kind", "position"), ("value", "target")
+    ),
+}
+
+# Tables whose rows belong to a tweet , they are replaced as a whole when the tweet is saved again
+TWEET_CHILD_TABLES = ("media", "entities")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY, screen_name TEXT, name TEXT, description TEXT, location TEXT, created_at TEXT,
+    followers_count INTEGER, friends_count INTEGER, favourites_count INTEGER, statuses_count INTEGER,
+    media_count INTEGER, listed_count INTEGER, verified INTEGER, protected INTEGER,
+    profile_image_url_https TEXT, profile_banner_url TEXT, updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS users_screen_name ON users (screen_name);
+
+CREATE TABLE IF NOT EXISTS tweets (
+    id TEXT PRIMARY KEY, author_id TEXT, created_on TEXT, text TEXT, language TEXT, likes INTEGER,
+    retweet_counts INTEGER, quote_counts INTEGER, reply_counts INTEGER, views INTEGER, source TEXT,
+    is_retweet INTEGER, is_quoted INTEGER, is_reply INTEGER, is_possibly_sensitive INTEGER,
+    retweeted_tweet_id TEXT, quoted_tweet_id TEXT, reply_to_id TEXT, updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tweets_author_id ON tweets (author_id, created_on);
+CREATE INDEX IF NOT EXISTS tweets_created_on ON tweets (created_on);
+
+CREATE TABLE IF NOT EXISTS media (
+    tweet_id TEXT NOT NULL, id TEXT NOT NULL, type TEXT, url TEXT, media_url_https TEXT, expanded_url TEXT,
+    display_url TEXT, PRIMARY KEY (tweet_id, id)
+);
+
+CREATE TABLE IF NOT EXISTS entities (
+    tweet_id TEXT NOT NULL, kind TEXT NOT NULL, position INTEGER NOT NULL, value TEXT, target TEXT,
+    PRIMARY KEY (tweet_id, kind, position)
+);
+CREATE INDEX IF NOT EXISTS entities_value ON entities (kind, value);
+"""
+
+
+def _upsert_sql(table):
+    keys, columns = TABLES[table]
+    names = keys + columns
+    # A row seen again (e.g. a tweet on two pages) is updated in place , its counts are the latest ones
+    return "INSERT INTO {} ({}) VALUES ({}) ON CONFLICT ({}) DO UPDATE SET {}".format(
+        table, ", ".join(names), ", ".join("?" * len(names)), ", ".join(keys),
+        ", ".join(f"{column} = excluded.{column}" for column in columns)
+    )
+
+
+def _to_sql(value):
+    if isinstance(value, datetime):
+        # stored in UTC , so the ISO strings sort in time order
+        return value.astimezone(timezone.utc).isoformat() if value.tzinfo else value.isoformat()
+
+    if isinstance(value, bool):
+        return int(value)
+
+    if isinstance(value, (list, tuple, dict)):
+        return json.dumps(value, default=str)
+
+    return value
+
+
+def _to_int(value):
+    # `views` is "Unavailable" when Twitter doesn't count them
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _reply_to_id(tweet):
+    # Tweet.reply_to can cost a request , the id is read from the raw tweet instead. A TweetRecord keeps it in `reply_to_id` ,
+    # its `reply_to` is only set when the parent was built
+    if hasattr(tweet, "_get_reply_to_id"):
+        return tweet._get_reply_to_id()
+
+    if getattr(tweet, "reply_to_id", None) is not None:
+        return tweet.reply_to_id
+
+    return getattr(tweet.reply_to, "id", None)
+
+
+def _is_tweet(item):
+    return item is not None and not isinstance(item, str) and hasattr(item, "created_on")
+
+
+class SQLiteStorage:
+    def __init__(self, path="tweety.db"):
+        """
+        Stores the tweets , their authors , media and entities in a normalized SQLite database ,
+        one transaction per saved page
+
+        :param path: (`str`) The database file
+        """
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.executescript(SCHEMA)
+        self._statements = {table: _upsert_sql(table) for table in TABLES}
+
+    def __repr__(self):
+        return f"SQLiteStorage(path={self.path})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def save(self, page):
+        """
+        Upsert a page of results in one transaction
+
+        :param page: ([`.types.twDataTypes.Tweet` | `.types.twDataTypes.User`]) A page of `paginate_tweets` , `paginate_search` or `iter_replies` , records work too
+
+        :return: int , the number of tweets and users of the page
+        """
+
+        rows = {table: {} for table in TABLES}
+        for item in page:
+            if _is_tweet(item):
+                self._add_tweet(rows, item)
+            else:
+                self._add_user(rows, item)
+
+        with self._lock, self._db:
+            # An entity or a media removed since the tweet was last saved mustn't stay behind its position
+            tweet_ids = [(tweet_id,) for tweet_id in rows["tweets"]]
+            for table in TWEET_CHILD_TABLES:
+                if tweet_ids:
+                    self._db.executemany(f"DELETE FROM {table} WHERE tweet_id = ?", tweet_ids)
+
+            for table, table_rows in rows.items():
+                if table_rows:
+                    self._db.executemany(self._statements[table], table_rows.values())
+
+        return len(page)
+
+    def save_all(self, pages):
+        """
+        Save every page of `pages` as it arrives
+
+        :param pages: (iterable of pages) e.g. the generator returned by `paginate_tweets`
+
+        :return: int , the number of tweets and users saved
+        """
+
+        return sum(self.save(page) for page in pages)
+
+    def count(self, table="tweets"):
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def get_tweet(self, tweet_id):
+        """
+        :return: dict of the columns of the tweet or None if it isn't stored
+        """
+
+        return self._get_row("tweets", tweet_id)
+
+    def get_user(self, user_id):
+        """
+        :return: dict of the columns of the user or None if it isn't stored
+        """
+
+        return self._get_row("users", user_id)
+
+    def close(self):
+        self._db.close()
+
+    def _get_row(self, table, row_id):
+        with self._lock:
+            cursor = self._db.execute(f"SELECT * FROM {table} WHERE id = ?", (str(row_id),))
+            row = cursor.fetchone()
+
+        return dict(zip([column[0] for column in cursor.description], row)) if row else None
+
+    def _add_user(self, rows, user):
+        rest_id = getattr(user, "rest_id", None) or getattr(user, "id", None)
+        if rest_id is None:
+            return None
+
+        rows["users"][str(rest_id)] = (str(rest_id), *[_to_sql(getattr(user, column, None)) for column in TABLES["users"][1][:-1]], time.time())
+        return str(rest_id)
+
+    def _add_tweet(self, rows, tweet):
+        tweet_id = str(tweet.id)
+        if tweet_id in rows["tweets"]:
+            return tweet_id
+
+        author_id = self._add_user(rows, tweet.author) if tweet.author is not None else None
+        nested = {}
+        for key in ("retweeted_tweet", "quoted_tweet"):
+            nested[key] = self._add_tweet(rows, getattr(tweet, key)) if _is_tweet(getattr(tweet, key)) else None
+
+        rows["tweets"][tweet_id] = (
+            tweet_id, author_id, _to_sql(tweet.created_on), tweet.text, tweet.language, tweet.likes, tweet.retweet_counts,
+            tweet.quote_counts, tweet.reply_counts, _to_int(tweet.views), tweet.source, _to_sql(tweet.is_retweet),
+            _to_sql(tweet.is_quoted), _to_sql(tweet.is_reply), _to_sql(tweet.is_possibly_sensitive),
+            nested["retweeted_tweet"], nested["quoted_tweet"], _reply_to_id(tweet), time.time()
+        )
+
+        for media in tweet.media or []:
+            rows["media"][(tweet_id, media.id)] = (
+                tweet_id, media.id, media.type, media.url, media.media_url_https, media.expanded_url, media.display_url
+            )
+
+        entities = {
+            "mention": [(user.screen_name, user.id) for user in tweet.user_mentions or []],
+            "url": [(url.get("expanded_url"), url.get("url")) for url in tweet.urls or []],
+            "hashtag": [(hashtag.get("text"), None) for hashtag in tweet.hashtags or []],
+            "symbol": [(symbol.get("text"), None) for symbol in tweet.symbols or []],
+        }
+        for kind, values in entities.items():
+            for position, (value, target) in enumerate(values):
+                rows["entities"][(tweet_id, kind, position)] = (tweet_id, kind, position, value, target)
+
+        return tweet_id
@@ -0,0 +1,175 @@
+import threading
+import time
+
+# Guest tokens stop working after a few hours , they are replaced a bit before that
+GUEST_TOKEN_TTL = 3 * 60 * 60 - 300
+
+# Responses which mean the guest token can't be used anymore
+RETIRE_STATUS_CODES = (403, 429)
+
+# Seconds a retired or expired token is kept before its session is closed , so a request still using it can finish
+DISCARD_GRACE = 30
+
+
+class GuestToken:
+    def __init__(self, value, session):
+        """
+        A guest token and the session (cookie jar) it was activated with
+
+        :param value: (`str`) The guest token
+        :param session: (`httpx.Client` | `httpx.AsyncClient`) The session used for the requests made with this token
+        """
+
+        self.value = value
+        self.session = session
+        self.created_at = time.monotonic()
+        self.last_used = 0
+        self.limited_at = 0
+        self.discarded_at = None
+        self.uses = 0
+
+    def __repr__(self):
+        return f"GuestToken(value={self.value}, uses={self.uses})"
+
+    def is_expired(self, ttl):
+        return time.monotonic() - self.created_at > ttl
+
+
+class GuestTokenPool:
+    ROUND_ROBIN = "round_robin"
+    LEAST_RECENTLY_LIMITED = "least_recently_limited"
+
+    def __init__(self, size=1, ttl=GUEST_TOKEN_TTL, strategy=ROUND_ROBIN):
+        """
+        Holds up to `size` guest tokens and hands them out to the requests
+
+        :param size: (`int`) Number of tokens to keep
+        :param ttl: (`int`) Seconds after which a token is considered expired
+        :param strategy: (`str`) `round_robin` or `least_recently_limited`
+        """
+
+        if strategy not in (self.ROUND_ROBIN, self.LEAST_RECENTLY_LIMITED):
+            raise ValueError(f"Unknown token strategy {strategy}")
+
+        self.size = max(1, int(size))
+        self.ttl = ttl
+        self.strategy = strategy
+        self.retired = 0
+        self._tokens = []
+        self._discarded = []
+        # Tokens a refresh is creating , they count towards the size so two refreshes don't both fill the pool
+        self._claimed = 0
+        self._index = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._tokens)
+
+    def __repr__(self):
+        return f"GuestTokenPool(size={self.size}, tokens={len(self._tokens)}, retired={self.retired})"
+
+    @property
+    def tokens(self):
+        return list(self._tokens)
+
+    @property
+    def missing(self):
+        """
+        Number of tokens to create to get the pool back to its size , counting the expired ones
+        """
+
+        with self._lock:
+            return self.size - len([token for token in self._tokens if not token.is_expired(self.ttl)])
+
+    def add(self, token):
+        with self._lock:
+            self._tokens.append(token)
+            if len(self._tokens) > self.size:
+                self._drop_expired()
+
+        return token
+
+    def acquire(self):
+        """
+        Pick the token for the next request
+
+        :return: GuestToken or None if the pool has no usable token
+        """
+
+        with self._lock:
+            tokens = [token for token in self._tokens if not token.is_expired(self.ttl)]
+            if not tokens:
+                return None
+
+            if self.strategy == self.LEAST_RECENTLY_LIMITED:
+                token = min(tokens, key=lambda _token: (_token.limited_at, _token.last_used))
+            else:
+                self._index = (self._index + 1) % len(tokens)
+                token = tokens[self._index]
+
+            token.last_used = time.monotonic()
+            token.uses += 1
+            return token
+
+    def mark_limited(self, token):
+        token.limited_at = time.monotonic()
+
+    def retire(self, token):
+        with self._lock:
+            if token in self._tokens:
+                self._tokens.remove(token)
+                self._discard([token])
+
+    def refresh(self, new_token):
+        """
+        Replace the expired tokens and refill the pool to its size
+
+        :param new_token: (`callable`) Returns a new activated GuestToken
+        """
+
+        with self._lock:
+            self._drop_expired()
+            claimed = max(0, self.size - len(self._tokens) - self._claimed)
+            self._claimed += claimed
+
+        try:
+            while claimed:
+                token = new_token()
+                with self._lock:
+                    claimed -= 1
+                    self._claimed -= 1
+                    # The pool may have been filled meanwhile , e.g. by `add`
+                    if len(self._tokens) < self.size:
+                        self._tokens.append(token)
+                    else:
+                        token.discarded_at = time.monotonic()
+                        self._discarded.append(token)
+        finally:
+            with self._lock:
+                self._claimed -= claimed
+
+    def take_discarded(self, grace=DISCARD_GRACE):
+        """
+        The retired and expired tokens whose session can be closed now , they are handed out once
+
+        :param grace: (`float`) Seconds a token must have been out of the pool , 0 for all of them
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            ready = [token for token in self._discarded if now - token.discarded_at >= grace]
+            self._discarded = [token for token in self._discarded if now - token.discarded_at < grace]
+
+        return ready
+
+    def _discard(self, tokens):
+        now = time.monotonic()
+        for token in tokens:
+            token.discarded_at = now
+        self._discarded.extend(tokens)
+        self.retired += len(tokens)
+
+    def _drop_expired(self):
+        alive = [token for token in self._tokens if not token.is_expired(self.ttl)]
+        self._discard([token for token in self._tokens if token not in alive])
+        self._tokens = alive
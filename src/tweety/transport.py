@@ -0,0 +1,174 @@
+import base64
+import json
+import os
+import threading
+import httpx
+from .builder import get_variables
+from .exceptions_ import RequestNotRecorded
+from .ratelimit import get_endpoint
+
+# Response headers which describe the body as it went over the wire , a cassette keeps the decoded body
+_WIRE_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+def get_request_key(method, url):
+    """
+    What two requests must share to be served the same recorded response : the method , the endpoint ,
+    the variables and the cursor. The guest token , the csrf token and the other headers don't matter
+
+    :param method: (`str`) The HTTP method
+    :param url: (`str`) The request url
+    """
+
+    variables = get_variables(url)
+    cursor = variables.pop("cursor", None)
+    return method.upper(), get_endpoint(url), json.dumps(variables, sort_keys=True), cursor
+
+
+class CassetteTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    RECORD = "record"
+    REPLAY = "replay"
+    AUTO = "auto"
+
+    def __init__(self, path, mode=REPLAY, transport=None, async_transport=None):
+        """
+        Records the exchanges of a session to a cassette file and replays them , for `httpx.Client` and `httpx.AsyncClient`
+
+        A request recorded more than once is answered with the recordings in the order they were made , the last one
+        is repeated after that. The new recordings are written to the cassette when a session using it is closed ,
+        or with `save`
+
+        :param path: (`str`) The cassette file
+        :param mode: (`str`) `replay` to only serve recorded responses , `record` to make the requests and record them ,
+                     `auto` to replay what is recorded and record the rest
+        :param transport: (`httpx.BaseTransport`) Makes the real requests of a `Client` , `httpx.HTTPTransport` by default
+        :param async_transport: (`httpx.AsyncBaseTransport`) Makes the real requests of an `AsyncClient` , `httpx.AsyncHTTPTransport` by default
+        """
+
+        if mode not in (self.RECORD, self.REPLAY, self.AUTO):
+            raise ValueError(f"Unknown cassette mode {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.recorded = 0
+        self.played = 0
+        self._saved = 0
+        self._transport = transport
+        self._async_transport = async_transport
+        self._interactions = []
+        self._recordings = {}
+        self._plays = {}
+        self._lock = threading.Lock()
+
+        # recording from scratch overwrites the cassette
+        if mode != self.RECORD and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for interaction in json.load(f)["interactions"]:
+                    self._add(interaction)
+
+        if mode == self.REPLAY and not os.path.exists(path):
+            raise FileNotFoundError(f"No cassette at {path}")
+
+    def __repr__(self):
+        return f"CassetteTransport(path={self.path}, mode={self.mode}, interactions={len(self._interactions)})"
+
+    def _add(self, interaction):
+        self._interactions.append(interaction)
+        key = get_request_key(interaction["method"], interaction["url"])
+        self._recordings.setdefault(key, []).append(interaction)
+
+    def _play(self, request):
+        key = get_request_key(request.method, str(request.url))
+        with self._lock:
+            recordings = self._recordings.get(key)
+            if not recordings or self.mode == self.RECORD:
+                return None
+
+            index = self._plays.get(key, 0)
+            self._plays[key] = index + 1
+            self.played += 1
+            interaction = recordings[min(index, len(recordings) - 1)]
+
+        body = interaction.get("body")
+        content = body.encode("utf-8") if body is not None else base64.b64decode(interaction["body_base64"])
+        return httpx.Response(interaction["status"], headers=interaction["headers"], content=content, request=request)
+
+    def _miss(self, request):
+        if self.mode == self.REPLAY:
+            raise RequestNotRecorded(f"{request.method} {get_endpoint(str(request.url))} isn't recorded in {self.path}")
+
+    def _record(self, request, response, content):
+        interaction = {
+            "method": request.method,
+            "url": str(request.url),
+            "status": response.status_code,
+            "headers": [[key, value] for key, value in response.headers.items() if key.lower() not in _WIRE_HEADERS],
+        }
+        try:
+            interaction["body"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            interaction["body_base64"] = base64.b64encode(content).decode("ascii")
+
+        with self._lock:
+            self._add(interaction)
+            self.recorded += 1
+
+        return httpx.Response(response.status_code, headers=interaction["headers"], content=content, request=request)
+
+    def save(self):
+        """
+        Write the cassette , to a temporary file renamed over it so a crash never leaves half a cassette
+        """
+
+        with self._lock:
+            temp = f"{self.path}.tmp"
+            with open(temp, "w", encoding="utf-8") as f:
+                json.dump({"interactions": self._interactions}, f, indent=1)
+            os.replace(temp, self.path)
+            self._saved = self.recorded
+
+    def handle_request(self, request):
+        response = self._play(request)
+        if response is not None:
+            return response
+
+        self._miss(request)
+        if self._transport is None:
+            self._transport = httpx.HTTPTransport()
+
+        response = self._transport.handle_request(request)
+        try:
+            content = response.read()
+        finally:
+            response.close()
+
+        return self._record(request, response, content)
+
+    async def handle_async_request(self, request):
+        response = self._play(request)
+        if response is not None:
+            return response
+
+        self._miss(request)
+        if self._async_transport is None:
+            self._async_transport = httpx.AsyncHTTPTransport()
+
+        response = await self._async_transport.handle_async_request(request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+
+        return self._record(request, response, content)
+
+    def _save_recorded(self):
+        if self.recorded != self._saved:
+            self.save()
+
+    def close(self):
+        # The sessions of every guest token share the cassette , closing one of them only writes what it recorded
+        # and the cassette can still be used by the others
+        self._save_recorded()
+
+    async def aclose(self):
+        self._save_recorded()
@@ -0,0 +1,227 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .twDataTypes import Tweet
+
+# Most TweetDetail requests a resolver makes at the same time
+CONVERSATION_CONCURRENCY = 4
+
+
+def _iter_raw_tweets(payload):
+    # Every `tweet_results.result` of a payload , whatever the timeline it comes from
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            results = node.get("tweet_results")
+            if isinstance(results, dict) and results.get("result"):
+                yield results["result"]
+
+            stack.extend(value for value in node.values() if isinstance(value, (dict, list)))
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+def _get_raw_tweet_id(raw_tweet):
+    if raw_tweet.get("rest_id"):
+        return raw_tweet["rest_id"]
+
+    if isinstance(raw_tweet.get("tweet"), dict):
+        return raw_tweet["tweet"].get("rest_id")
+
+    return None
+
+
+class ConversationResolver:
+    def __init__(self, http, lazy=False, concurrency=CONVERSATION_CONCURRENCY):
+        """
+        Finds the tweets a batch of tweets replies to , out of the payloads already received
+        when they are in them and with one TweetDetail request per missing tweet otherwise
+
+        :param http: (`Request` | `AsyncRequest`) Used for the tweets which aren't in any payload
+        :param lazy: (`boolean`) Build the resolved tweets lazily
+        :param concurrency: (`int`) Most TweetDetail requests made at the same time
+        """
+
+        self.http = http
+        self.lazy = lazy
+        self.concurrency = max(1, int(concurrency))
+        self.requests = 0
+        self._raw_tweets = {}
+        self._tweets = {}
+        self._responses = {}
+        # The added payloads which weren't searched for tweets yet , they are only walked once a tweet is looked up
+        self._pending = []
+        self._lock = threading.RLock()
+
+    def __contains__(self, tweet_id):
+        tweet_id = str(tweet_id)
+        if tweet_id in self._tweets:
+            return True
+
+        self._index()
+        return tweet_id in self._raw_tweets
+
+    def __repr__(self):
+        return f"ConversationResolver(tweets={len(self._raw_tweets)}, requests={self.requests})"
+
+    def add_response(self, response):
+        """
+        Remember the tweets of a payload , so they don't have to be requested
+
+        :param response: (`dict`) A TweetDetail , UserTweets or any other payload holding `tweet_results`
+
+        :return: the response
+        """
+
+        if not response or id(response) in self._responses:
+            return response
+
+        with self._lock:
+            self._responses[id(response)] = response
+            self._pending.append(response)
+
+        return response
+
+    def _index(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+            for response in pending:
+                for raw_tweet in _iter_raw_tweets(response):
+                    tweet_id = _get_raw_tweet_id(raw_tweet)
+                    if tweet_id:
+                        self._raw_tweets.setdefault(tweet_id, (response, raw_tweet))
+
+    def add_tweet(self, tweet):
+        """
+        Hand out `tweet` itself when its id is resolved
+
+        :param tweet: (`.types.twDataTypes.Tweet`) An already built tweet
+        """
+
+        with self._lock:
+            self._tweets.setdefault(str(tweet.id), tweet)
+
+        return tweet
+
+    def get_response(self, tweet_id):
+        """
+        :return: The TweetDetail payload of `tweet_id` , requested every time it is called
+        """
+
+        self.requests += 1
+        return self.add_response(self.http.get_tweet_detail(tweet_id))
+
+    def get(self, tweet_id):
+        """
+        :param tweet_id: (`str`) Id of the tweet
+
+        :return: .types.twDataTypes.Tweet or None if the tweet is deleted or unavailable
+        """
+
+        tweet_id = str(tweet_id)
+        if tweet_id not in self:
+            # Without http , e.g. in a parsing worker , only the tweets of the added payloads are known
+            if self.http is None:
+                return None
+
+            self.get_response(tweet_id)
+
+        return self._build(tweet_id)
+
+    def missing(self, tweet_ids):
+        """
+        :return: The ids out of `tweet_ids` which aren't in any payload yet , without duplicates
+        """
+
+        return [tweet_id for tweet_id in dict.fromkeys(str(tweet_id) for tweet_id in tweet_ids if tweet_id) if tweet_id not in self]
+
+    def prefetch(self, tweet_ids):
+        """
+        Request the missing tweets of `tweet_ids` at once , at most `concurrency` at a time
+
+        :return: [.types.twDataTypes.Tweet] in the order of `tweet_ids` , None for the unavailable ones
+        """
+
+        missing = self.missing(tweet_ids)
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(missing))) as executor:
+                for response in executor.map(self.http.get_tweet_detail, missing):
+                    self.add_response(response)
+            self.requests += len(missing)
+
+        return [self._build(str(tweet_id)) for tweet_id in tweet_ids]
+
+    async def prefetch_async(self, tweet_ids):
+        """
+        Same as `prefetch` , for an `AsyncRequest`
+        """
+
+        missing = self.missing(tweet_ids)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(tweet_id):
+            async with semaphore:
+                return await self.http.get_tweet_detail(tweet_id)
+
+        for response in await asyncio.gather(*[fetch(tweet_id) for tweet_id in missing]):
+            self.add_response(response)
+        self.requests += len(missing)
+
+        return [self._build(str(tweet_id)) for tweet_id in tweet_ids]
+
+    def resolve(self, tweets):
+        """
+        Set `reply_to` of every reply in `tweets` to the Tweet it replies to
+
+        :param tweets: ([`.types.twDataTypes.Tweet`]) The batch to resolve
+        """
+
+        self._collect(tweets)
+        self.prefetch([tweet._get_reply_to_id() for tweet in tweets])
+        for tweet in tweets:
+            self._set_parent(tweet)
+
+        return tweets
+
+    async def resolve_async(self, tweets):
+        """
+        Same as `resolve` , for an `AsyncRequest`
+        """
+
+        self._collect(tweets)
+        await self.prefetch_async([tweet._get_reply_to_id() for tweet in tweets])
+        for tweet in tweets:
+            self._set_parent(tweet)
+
+        return tweets
+
+    def _collect(self, tweets):
+        # The batch and the payloads it was parsed from are searched before anything is requested
+        for tweet in tweets:
+            self.add_tweet(tweet)
+            self.add_response(tweet._get_raw_response())
+
+    def _set_parent(self, tweet):
+        parent_id = tweet._get_reply_to_id()
+        if parent_id and parent_id in self:
+            tweet._set_reply_to(self._build(parent_id))
+
+    def _build(self, tweet_id):
+        with self._lock:
+            if tweet_id in self._tweets:
+                return self._tweets[tweet_id]
+
+            self._index()
+            found = self._raw_tweets.get(tweet_id)
+            if found is None:
+                return None
+
+            response, raw_tweet = found
+            # skip deleted or protected tweets
+            # raw_tweet[__typename'] = 'TweetTombstone'
+            if raw_tweet.get("__typename") == "TweetTombstone":
+                return None
+
+            tweet = self._tweets[tweet_id] = Tweet(response, raw_tweet, self.http, lazy=self.lazy, resolver=self)
+            return tweet
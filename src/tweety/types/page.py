@@ -0,0 +1,18 @@
+class Page(list):
+    def __init__(self, results=(), cursor=None, is_next_page=False, profile=None):
+        """
+        The results of one page , with the cursor to request the page after it
+
+        :param results: ([`.types.twDataTypes.Tweet`] | [`.types.twDataTypes.User`]) The results of the page
+        :param cursor: (`str`) Cursor of the next page , pass it back as `cursor` to resume after this page
+        :param is_next_page: (`boolean`) Whether there is a page after this one
+        :param profile: (`.profiling.PageProfile`) Time spent on each phase of the page , None when it wasn't profiled
+        """
+
+        super().__init__(results)
+        self.cursor = cursor
+        self.is_next_page = is_next_page
+        self.profile = profile
+
+    def __repr__(self):
+        return f"Page(count={len(self)}, cursor={self.cursor}, is_next_page={self.is_next_page})"
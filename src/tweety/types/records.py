@@ -0,0 +1,194 @@
+from .twDataTypes import Tweet, User, UserLegacy, Media, Stream, ShortUser, Card, Choice, Place, Coordinates
+
+
+class _Record:
+    """
+    Compact read-only counterpart of a model : the values are kept in `__slots__` only ,
+    lists become tuples and no reference to the raw source dict or to `http` is kept.
+    """
+
+    __slots__ = ()
+
+    # The slots which aren't a field of the model , filled by the `from_model` of the record
+    _RECORD_SLOTS = ()
+
+    def __init__(self, **fields):
+        for key in self.__slots__:
+            setattr(self, key, fields.get(key))
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+
+        return all(getattr(self, key) == getattr(other, key) for key in self.__slots__)
+
+    def __hash__(self):
+        return hash((type(self), tuple(_hashable(getattr(self, key)) for key in self.__slots__)))
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__, ", ".join(f"{key}={getattr(self, key)!r}" for key in self.__slots__[:3]))
+
+    def to_dict(self):
+        """
+        :return: The record as plain dicts and lists , with the keys of the model it was built from
+        """
+
+        return {key: _to_dict(getattr(self, key)) for key in self.__slots__}
+
+    @classmethod
+    def from_model(cls, model):
+        return cls(**cls._model_fields(model))
+
+    @classmethod
+    def _model_fields(cls, model):
+        # A deferred field (e.g. the parent of a get_reply tweet) is only kept when already built , reading it could fetch it
+        deferred = model._deferred_fields() if hasattr(model, "_deferred_fields") else ()
+        return {key: to_record(getattr(model, key)) for key in cls.__slots__
+                if key not in cls._RECORD_SLOTS and (key not in deferred or key in model._fields)}
+
+
+class TweetRecord(_Record):
+    __slots__ = ("id", "created_on", "author", "text", "language", "likes", "retweet_counts", "quote_counts",
+                 "reply_counts", "views", "source", "is_retweet", "is_quoted", "is_reply", "is_possibly_sensitive",
+                 "vibe", "retweeted_tweet", "quoted_tweet", "reply_to", "media", "user_mentions", "urls", "hashtags",
+                 "symbols", "card", "place", "threads", "comments", "reply_to_id")
+
+    _RECORD_SLOTS = ("reply_to_id",)
+
+    @property
+    def tweet_body(self):
+        return self.text
+
+    @classmethod
+    def from_model(cls, model):
+        fields = cls._model_fields(model)
+        fields['reply_to_id'] = model._get_reply_to_id()
+        return cls(**fields)
+
+    def to_dict(self):
+        _dict = super().to_dict()
+        _dict['tweet_body'] = self.tweet_body
+        return _dict
+
+    @classmethod
+    def from_raw(cls, raw_tweet, is_legacy_user=False):
+        """
+        Build a record straight from a raw tweet , without keeping the intermediate Tweet
+
+        :param raw_tweet: (`dict`) The tweet as found in the page payload
+        :param is_legacy_user: (`boolean`) The author is in the legacy (adaptive search) format
+        """
+
+        return cls.from_model(Tweet(None, raw_tweet, None, is_legacy_user=is_legacy_user, lazy=True))
+
+
+class UserRecord(_Record):
+    __slots__ = ("id", "rest_id", "created_at", "default_profile", "default_profile_image", "description", "entities",
+                 "fast_followers_count", "favourites_count", "followers_count", "friends_count",
+                 "has_custom_timelines", "is_translator", "listed_count", "location", "media_count", "name",
+                 "normal_followers_count", "profile_banner_url", "profile_image_url_https",
+                 "profile_interstitial_type", "protected", "screen_name", "statuses_count", "translator_type",
+                 "verified", "possibly_sensitive", "pinned_tweets")
+
+    @property
+    def username(self):
+        return self.screen_name
+
+    @property
+    def profile_url(self):
+        return "https://twitter.com/{}".format(self.screen_name)
+
+    def to_dict(self):
+        _dict = super().to_dict()
+        _dict['username'] = self.username
+        _dict['profile_url'] = self.profile_url
+        return _dict
+
+
+class MediaRecord(_Record):
+    __slots__ = ("id", "type", "display_url", "expanded_url", "indices", "media_url_https", "url", "features",
+                 "media_key", "mediaStats", "sizes", "original_info", "file_format", "streams")
+
+
+class StreamRecord(_Record):
+    __slots__ = ("bitrate", "content_type", "url", "length", "aspect_ratio", "res")
+
+
+class ShortUserRecord(_Record):
+    __slots__ = ("id", "name", "screen_name")
+
+    @property
+    def username(self):
+        return self.screen_name
+
+    def to_dict(self):
+        _dict = super().to_dict()
+        _dict['username'] = self.username
+        return _dict
+
+
+class CardRecord(_Record):
+    __slots__ = ("rest_id", "name", "choices", "end_time", "last_updated_time", "duration", "user_ref")
+
+
+class ChoiceRecord(_Record):
+    __slots__ = ("name", "value", "type", "counts", "counts_type")
+
+
+class PlaceRecord(_Record):
+    __slots__ = ("id", "name", "full_name", "country", "country_code", "url", "coordinates")
+
+
+class CoordinatesRecord(_Record):
+    __slots__ = ("latitude", "longitude")
+
+
+MODEL_RECORDS = {
+    Tweet: TweetRecord,
+    User: UserRecord,
+    UserLegacy: UserRecord,
+    Media: MediaRecord,
+    Stream: StreamRecord,
+    ShortUser: ShortUserRecord,
+    Card: CardRecord,
+    Choice: ChoiceRecord,
+    Place: PlaceRecord,
+    Coordinates: CoordinatesRecord,
+}
+
+
+def to_record(value):
+    """
+    Convert a model , or a list of models , to its compact record. Other values are returned unchanged
+
+    :param value: Tweet | User | UserLegacy | Media | Stream | ShortUser | Card | Choice | Place | Coordinates | list
+    """
+
+    record = MODEL_RECORDS.get(type(value))
+    if record is not None:
+        return record.from_model(value)
+
+    if isinstance(value, list):
+        return tuple(to_record(item) for item in value)
+
+    return value
+
+
+def _hashable(value):
+    if isinstance(value, dict):
+        return frozenset((key, _hashable(item)) for key, item in value.items())
+
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+
+    return value
+
+
+def _to_dict(value):
+    if isinstance(value, _Record):
+        return value.to_dict()
+
+    if isinstance(value, tuple):
+        return [_to_dict(item) for item in value]
+
+    return value
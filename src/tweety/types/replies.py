@@ -0,0 +1,129 @@
+import asyncio
+import time
+from collections import deque
+from . import Tweet
+
+
+class TweetReplies:
+    def __init__(self, tweet_id, http, pages=None, wait_time=0, cursor=None, show_more=None, lazy=False):
+        """
+        The replies of a conversation , requested page by page while they are iterated
+
+        Only the page being iterated is kept , `cursor` and `show_more` are the state to resume from
+
+        :param tweet_id: (`str`) Id of the focal tweet of the conversation
+        :param http: (`Request` | `AsyncRequest`) Iterate with `for` over a Request and with `async for` over an AsyncRequest
+        :param pages: (`int`) Most TweetDetail pages to request , None to request until the conversation ends
+        :param wait_time: (`int`) seconds to wait between multiple requests
+        :param cursor: (`str`) The bottom cursor to resume from
+        :param show_more: ([`str`]) The `cursor-showmore` cursors to resume from , they are requested before `cursor`
+        :param lazy: (`boolean`) Build the replies lazily
+        """
+
+        self.tweet_id = str(tweet_id)
+        self.http = http
+        self.pages = pages
+        self.wait_time = wait_time
+        self.cursor = cursor
+        self.show_more = deque(show_more or [])
+        # The "show more" cursors already requested , a page handing one out again doesn't get it requested twice
+        self.requested_show_more = set()
+        self.lazy = lazy
+        self.is_next_page = True
+        self.pages_fetched = 0
+
+    def __repr__(self):
+        return f"TweetReplies(tweet_id={self.tweet_id}, pages={self.pages_fetched}, cursor={self.cursor})"
+
+    def __iter__(self):
+        for tweets in self.get_replies_page_iterator():
+            yield from tweets
+
+    async def __aiter__(self):
+        async for tweets in self.get_replies_page_iterator_async():
+            for tweet in tweets:
+                yield tweet
+
+    def _has_next_page(self):
+        if self.pages is not None and self.pages_fetched >= self.pages:
+            return False
+
+        return bool(self.show_more) or self.is_next_page
+
+    def _next_cursor(self):
+        # A thread's "show more" is read before the next page of threads , so a thread comes out in one piece
+        if self.show_more:
+            cursor = self.show_more.popleft()
+            self.requested_show_more.add(cursor)
+            return cursor
+
+        return self.cursor
+
+    def get_replies_page_iterator(self):
+        while self._has_next_page():
+            if self.pages_fetched:
+                time.sleep(self.wait_time)
+
+            cursor = self._next_cursor()
+            response = self.http.get_tweet_detail(self.tweet_id, cursor)
+            yield self._parse_page(response, cursor)
+
+    async def get_replies_page_iterator_async(self):
+        while self._has_next_page():
+            if self.pages_fetched:
+                await asyncio.sleep(self.wait_time)
+
+            cursor = self._next_cursor()
+            response = await self.http.get_tweet_detail(self.tweet_id, cursor)
+            yield self._parse_page(response, cursor)
+
+    @staticmethod
+    def _get_items(response):
+        # The first page adds entries , the "show more" pages add items to the module of their thread
+        try:
+            instructions = response['data']['threaded_conversation_with_injections_v2']['instructions']
+        except (KeyError, TypeError):
+            return
+
+        for instruction in instructions:
+            for entry in instruction.get('entries', []):
+                if str(entry['entryId']).split("-")[0] == "conversationthread":
+                    for item in entry['content']['items']:
+                        yield item['entryId'], item['item']['itemContent']
+                else:
+                    yield entry['entryId'], entry['content'].get('itemContent', {})
+
+            for item in instruction.get('moduleItems', []):
+                yield item['entryId'], item['item']['itemContent']
+
+    def _parse_page(self, response, cursor):
+        self.pages_fetched += 1
+        is_bottom_page = cursor is None or cursor == self.cursor
+        tweets = []
+        next_cursor = None
+        for entry_id, content in self._get_items(response):
+            info = str(entry_id).split("-")
+            if "cursor" in info:
+                if content.get('cursorType') == "Bottom" or "bottom" in info:
+                    next_cursor = content.get('value')
+                elif content.get('value') and content['value'] not in self.requested_show_more and content['value'] not in self.show_more:
+                    self.show_more.append(content['value'])
+                continue
+
+            # the focal tweet and its ancestors aren't replies
+            if info[0] == "tweet":
+                continue
+
+            raw_tweet = content.get('tweet_results', {}).get('result')
+            # skip deleted or protected tweets
+            # raw_tweet[__typename'] = 'TweetTombstone'
+            if not raw_tweet or raw_tweet.get('__typename') == 'TweetTombstone':
+                continue
+
+            tweets.append(Tweet(response, raw_tweet, self.http, lazy=self.lazy))
+
+        if is_bottom_page:
+            self.is_next_page = bool(next_cursor) and next_cursor != self.cursor
+            self.cursor = next_cursor if self.is_next_page else self.cursor
+
+        return tweets
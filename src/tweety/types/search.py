@@ -1,9 +1,12 @@
+import asyncio
 import time
 from . import Tweet, User
+from .page import Page
+from ..profiling import measure, profile_page, sleeping
 
 
 class Search(dict):
-    def __init__(self, keyword, http, pages=1, filter_=None, wait_time=2, cursor=None):
+    def __init__(self, keyword, http, pages=1, filter_=None, wait_time=0, cursor=None, lazy=False, keep_history=True, profile=None, parse_pool=None):
         super().__init__()
         self.tweets = []
         self.users = []
@@ -11,7 +14,16 @@ class Search(dict):
         self.cursor = cursor
         self.is_next_page = True
         self.http = http
+        self.lazy = lazy
+        self.wait_time = wait_time
+        # a streamed search only keeps the page being read
+        self.keep_history = keep_history
         self.filter = filter_.lower().strip() if filter_ else None
+        # The phases of every page are timed into it when given , see .profiling.Profile
+        self.profile = profile
+        self.page_profile = None
+        # The pages are built by the workers of a .parallel.ParsePool when given , into TweetRecord / UserRecord objects
+        self.parse_pool = parse_pool
         self._search(pages, wait_time)
 
     def __repr__(self):
@@ -24,33 +36,74 @@ class Search(dict):
     def get_next_page(self):
         _tweets = []
         if self.is_next_page:
-            response = self.http.perform_search(self.keyword, self.cursor, self.filter)
+            with profile_page(self.profile, self.cursor) as page:
+                if self.parse_pool is not None:
+                    body = self.http.perform_search(self.keyword, self.cursor, self.filter, raw=True)
+                    with measure("build"):
+                        thisTweets = self._set_records(self._submit_page(body).result())
+                else:
+                    response = self.http.perform_search(self.keyword, self.cursor, self.filter)
+                    with measure("build"):
+                        thisTweets = self._parse_response(response)
 
-            thisTweets = self._parse_response(response)
+                self._set_page(page, thisTweets)
+                return thisTweets
 
-            self['is_next_page'] = self.is_next_page
-            self['cursor'] = self.cursor
+    async def get_next_page_async(self):
+        if self.is_next_page:
+            with profile_page(self.profile, self.cursor) as page:
+                if self.parse_pool is not None:
+                    body = await self.http.perform_search(self.keyword, self.cursor, self.filter, raw=True)
+                    with measure("build"):
+                        thisTweets = self._set_records(await asyncio.wrap_future(self._submit_page(body)))
+                else:
+                    response = await self.http.perform_search(self.keyword, self.cursor, self.filter)
+                    with measure("build"):
+                        thisTweets = self._parse_response(response)
+
+                self._set_page(page, thisTweets)
+                return thisTweets
+
+    def _set_page(self, page, results):
+        self['is_next_page'] = self.is_next_page
+        self['cursor'] = self.cursor
+
+        self.page_profile = page
+        if page is not None:
+            page.items = len(results)
+
+    def _submit_page(self, body):
+        return self.parse_pool.submit_search(body, self.keyword, self.filter, self.cursor)
+
+    def _set_records(self, result):
+        records, self.cursor, self.is_next_page = result
+        results = self.users if self.filter == "users" else self.tweets
+        if self.keep_history:
+            results.extend(records)
 
-            return thisTweets
+        self['users' if self.filter == "users" else 'tweets'] = results
+        return records
 
     def _parse_response(self, response):
         thisObjects = []
         if self.filter == "users":
-            for raw_user in response.json()['globalObjects']['users'].values():
+            for raw_user in response['globalObjects']['users'].values():
                 try:
-                    user = User(raw_user, 2)
-                    self.users.append(user)
+                    user = User(raw_user, 2, self.lazy)
+                    if self.keep_history:
+                        self.users.append(user)
                     thisObjects.append(user)
                 except:
                     pass
             self['users'] = self.users
         else:
-            users = response.json()['globalObjects']['users']
-            for tweet_id, raw_tweet in response.json()['globalObjects']['tweets'].items():
+            users = response['globalObjects']['users']
+            for tweet_id, raw_tweet in response['globalObjects']['tweets'].items():
                 try:
                     raw_tweet['rest_id'], raw_tweet['core'] = tweet_id, users.get(str(raw_tweet['user_id']))
-                    tweet = Tweet(response, raw_tweet, self.http, False, True)
-                    self.tweets.append(tweet)
+                    tweet = Tweet(response, raw_tweet, self.http, False, True, lazy=self.lazy)
+                    if self.keep_history:
+                        self.tweets.append(tweet)
                     thisObjects.append(tweet)
                 except:
                     pass
@@ -61,8 +114,9 @@ class Search(dict):
         return thisObjects
 
     def _get_cursor(self, response):
+        instructions = response['timeline']['instructions']
         if self.filter == "users":
-            for i in response.json()['timeline']['instructions'][-1]['addEntries']['entries']:
+            for i in instructions[-1]['addEntries']['entries']:
                 if str(i['entryId']).split("-")[0] == "cursor":
                     if i['content']['operation']['cursor']['cursorType'] == "Bottom":
                         newCursor = i['content']['operation']['cursor']['value']
@@ -71,7 +125,7 @@ class Search(dict):
                         self.cursor = newCursor
                         return True
         else:
-            for i in response.json()['timeline']['instructions'][0]['addEntries']['entries']:
+            for i in instructions[0]['addEntries']['entries']:
                 try:
                     if i['content']['operation']:
                         if i['content']['operation']['cursor']['cursorType'] == "Bottom":
@@ -83,7 +137,7 @@ class Search(dict):
                 except:
                     pass
                 try:
-                    for j in response.json()['timeline']['instructions']:
+                    for j in instructions:
                         for key in j.keys():
                             if key == "replaceEntry":
                                 if j['replaceEntry']['entry']['content']['operation']['cursor']['cursorType'] == "Bottom":
@@ -101,7 +155,43 @@ class Search(dict):
             this_tweets = self.get_next_page()
 
             if self.is_next_page and page != pages:
-                time.sleep(wait_time)
+                with sleeping(self.profile, self.page_profile):
+                    time.sleep(wait_time)
+
+    async def _search_async(self, pages, wait_time):
+        for page in range(1, int(pages) + 1):
+            if not self.is_next_page:
+                break
+
+            this_tweets = await self.get_next_page_async()
+
+            if self.is_next_page and page != pages:
+                with sleeping(self.profile, self.page_profile):
+                    await asyncio.sleep(wait_time)
+
+    def get_search_page_iterator(self, pages):
+        for page in range(1, int(pages) + 1):
+            if not self.is_next_page:
+                break
+
+            results = self.get_next_page()
+            yield Page(results, self.cursor, self.is_next_page, self.page_profile)
+
+            if self.is_next_page and page != pages:
+                with sleeping(self.profile, self.page_profile):
+                    time.sleep(self.wait_time)
+
+    async def get_search_page_iterator_async(self, pages):
+        for page in range(1, int(pages) + 1):
+            if not self.is_next_page:
+                break
+
+            results = await self.get_next_page_async()
+            yield Page(results, self.cursor, self.is_next_page, self.page_profile)
+
+            if self.is_next_page and page != pages:
+                with sleeping(self.profile, self.page_profile):
+                    await asyncio.sleep(self.wait_time)
 
     def __getitem__(self, index):
         if self.filter == "users":
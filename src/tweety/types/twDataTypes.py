@@ -1,28 +1,102 @@
-from dateutil import parser
-import dateutil
+from ..utils import parse_date
 
 WORKBOOK_HEADERS = ['Created on', 'author', 'is_retweet', 'is_reply', 'tweet_id', 'tweet_body', 'language', 'likes',
                     'retweet_count', 'source', 'medias', 'user_mentioned', 'urls', 'hashtags', 'symbols']
 
 
-class Tweet(dict):
-    def __init__(self, raw_response, raw_tweet, http, get_threads=False, is_legacy_user=False, get_reply=False):  # noqa
+class _LazyModel(dict):
+    """
+    Base of the models whose fields are built by `_FIELD_BUILDERS`.
+
+    Eager models build every field up front , lazy models build a field on its first
+    attribute or item access and then store it like an eager one.
+    """
+
+    _FIELD_BUILDERS = {}
+
+    def _field(self, key):
+        if key not in self._fields:
+            self._fields[key] = self._FIELD_BUILDERS[key](self)
+
+        return self._fields[key]
+
+    def _set_fields(self):
+        for key, value in self._fields.items():
+            setattr(self, key, value)
+            self[key] = value
+
+    def __getattr__(self, item):
+        # Only called when the attribute isn't set , i.e. for the fields a lazy model hasn't built yet
+        if item.startswith("_") or item not in self._FIELD_BUILDERS:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{item}'")
+
+        value = self._field(item)
+        setattr(self, item, value)
+        self[item] = value
+        return value
+
+    def __missing__(self, key):
+        if key not in self._FIELD_BUILDERS:
+            raise KeyError(key)
+
+        return self.__getattr__(key)
+
+    def __contains__(self, key):
+        return key in self._FIELD_BUILDERS or super().__contains__(key)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+
+        return default
+
+    def materialize(self):
+        """
+        Build all the fields which weren't accessed yet , including the ones of nested models ,
+        e.g. before serializing a lazy model
+
+        :return: self
+        """
+
+        for key in self._FIELD_BUILDERS:
+            value = self._field(key)
+            for item in (value if isinstance(value, list) else [value]):
+                if isinstance(item, _LazyModel):
+                    item.materialize()
+
+        self._set_fields()
+        return self
+
+
+class Tweet(_LazyModel):
+    # The cheap fields every lazy tweet still builds on creation
+    _EAGER_FIELDS = ("created_on", "author")
+
+    def __init__(self, raw_response, raw_tweet, http=None, get_threads=False, is_legacy_user=False, get_reply=False, lazy=False, resolver=None):  # noqa
         super().__init__()
         self.http = http
         self.__raw_response = raw_response
         self.__raw_tweet = raw_tweet
         self.__is_legacy_user = is_legacy_user
-        self.__replied_to = None
         self._get_reply = get_reply
-        self.__formatted_tweet = self._format_tweet()
-        self.id = None
+        self._lazy = lazy
+        self._resolver = resolver
+        self._fields = {}
+        self.__original_tweet = self._get_original_tweet()
+        self.id = self._get_id()
+
+        if lazy:
+            self._fields['id'] = self.id
+            # Built up front even when lazy , so a malformed tweet fails here where the timelines skip it
+            for key in self._EAGER_FIELDS:
+                self._field(key)
+        else:
+            self._fields = self._format_tweet()
 
         if get_threads:
             self._get_threads()
 
-        for key, value in self.__formatted_tweet.items():
-            setattr(self, key, value)
-            self[key] = value
+        self._set_fields()
 
     def __repr__(self):
         return f"Tweet(id={self.id}, author={self.author}, created_on={self.created_on}, threads={len(self.threads) if self.threads else None})"  # noqa
@@ -34,56 +108,36 @@ class Tweet(dict):
 
 
     def _format_tweet(self):
-        original_tweet = self._get_original_tweet()
-        self.id = tweet_rest_id = self._get_id()
-        tweet_author = self.__raw_tweet['core']
+        # The tweet replied to costs a request when it isn't in the payload , it is only resolved once accessed
+        deferred = self._deferred_fields()
+        return {key: self._field(key) for key in self._FIELD_BUILDERS if key not in deferred}
+
+    def _deferred_fields(self):
+        # The fields left to the first access , building them can cost a request
+        return ("reply_to",) if self._get_reply else ()
+
+    def _get_resolver(self):
+        if self._resolver is None:
+            from .conversation import ConversationResolver
+            self._resolver = ConversationResolver(self.http, self._lazy)
+            self._resolver.add_response(self.__raw_response)
+
+        return self._resolver
 
-        created_on = dateutil.parser.parse(original_tweet.get("created_at"))
-        author = UserLegacy(tweet_author) if self.__is_legacy_user else User(tweet_author, 3)
-        is_retweet = self._is_retweet(original_tweet)
-        retweeted_tweet = self._get_retweeted_tweet(is_retweet,original_tweet)
-        text = self._get_tweet_text(original_tweet, is_retweet)
-        is_quoted = self._is_quoted(original_tweet)
-        quoted_tweet = self._get_quoted_tweet(is_quoted)
-        is_reply = self._is_reply(original_tweet)
-        is_sensitive = self._is_sensitive(original_tweet)
-        reply_counts = self._get_reply_counts(original_tweet)
-        quote_counts = self._get_quote_counts(original_tweet)
-        replied_to = self.__replied_to = self._get_reply_to(is_reply, original_tweet, )
-        vibe = self._get_vibe()
-        views = self._get_views()
-
-        return {
-            "created_on": created_on,
-            "author": author,
-            "is_quoted": is_quoted,
-            "quoted_tweet": quoted_tweet,
-            "quote_counts": quote_counts,
-            "is_retweet": is_retweet,
-            "retweeted_tweet": retweeted_tweet,
-            "is_reply": is_reply,
-            "vibe": vibe,
-            "reply_counts": reply_counts,
-            "is_possibly_sensitive": is_sensitive,
-            "id": tweet_rest_id,
-            "tweet_body": text,
-            "text": text,
-            "language": self._get_language(original_tweet),
-            "likes": self._get_likes(original_tweet),
-            "card": self._get_card(),
-            "place": self._get_place(original_tweet),
-            "retweet_counts": self._get_retweet_counts(original_tweet),
-            "source": self._get_source(self.__raw_tweet),
-            "media": self._get_tweet_media(original_tweet),
-            "user_mentions": self._get_tweet_mentions(original_tweet),
-            "urls": self._get_tweet_urls(original_tweet),
-            "hashtags": self._get_tweet_hashtags(original_tweet),
-            "symbols": self._get_tweet_symbols(original_tweet),
-            "views": views,
-            "reply_to": replied_to,
-            "threads": [],
-            "comments": []
-        }
+    def _get_raw_response(self):
+        return self.__raw_response
+
+    def _get_reply_to_id(self):
+        return self.__original_tweet.get("in_reply_to_status_id_str")
+
+    def _set_reply_to(self, tweet):
+        self._fields['reply_to'] = tweet
+        self.reply_to = tweet
+        self['reply_to'] = tweet
+
+    def _get_author(self):
+        tweet_author = self.__raw_tweet['core']
+        return UserLegacy(tweet_author, self._lazy) if self.__is_legacy_user else User(tweet_author, 3, self._lazy)
 
     def _get_id(self):
         if self.__raw_tweet.get("rest_id"):
@@ -105,7 +159,7 @@ class Tweet(dict):
         if is_retweet:
             try:
                 retweet = original_tweet['retweeted_status_result']['result']
-                return Tweet(None, retweet, self.http)
+                return Tweet(None, retweet, self.http, lazy=self._lazy)
             except Exception as e:
                 print(f"Error getting retweet: {e}, original tweet: {original_tweet}")
 
@@ -113,18 +167,19 @@ class Tweet(dict):
 
     def _get_threads(self):
         if not self.__raw_response:
-            self.__raw_response = self.http.get_tweet_detail(self.id)  # noqa
+            self.__raw_response = self._get_resolver().get_response(self.id)  # noqa
 
-        for entry in self.__raw_response.json()['data']['threaded_conversation_with_injections_v2']['instructions'][0]['entries']:
+        replied_to = self._get_reply_to_id()
+        for entry in self.__raw_response['data']['threaded_conversation_with_injections_v2']['instructions'][0]['entries']:
             if str(entry['entryId']).split("-")[0] == "conversationthread":
                 for item in entry['content']['items']:
                     try:
                         tweetType = item["item"]["itemContent"]["tweetDisplayType"]
                         tweet = item['item']['itemContent']['tweet_results']['result']
 
-                        if not self.__replied_to or self.__replied_to.id != tweet['rest_id']:
-                            self.__formatted_tweet['threads' if tweetType == "SelfThread" else 'comments'].append(
-                                Tweet(None, tweet, self.http))
+                        if replied_to != tweet['rest_id']:
+                            self._field('threads' if tweetType == "SelfThread" else 'comments').append(
+                                Tweet(None, tweet, self.http, lazy=self._lazy))
                     except KeyError as e:
                         pass
 
@@ -137,7 +192,7 @@ class Tweet(dict):
                     raw_tweet = self.__raw_tweet['quoted_status_result']['result']
                 # if not raw_tweet and self.__raw_tweet.get("legacy"):
                 #     raw_tweet = self.__raw_tweet['legacy']['retweeted_status_result']['result']['quoted_status_result']['result']
-                return Tweet(raw_response, raw_tweet, self.http)
+                return Tweet(raw_response, raw_tweet, self.http, lazy=self._lazy)
             except:
                 return None
 
@@ -167,12 +222,7 @@ class Tweet(dict):
 
     def _get_reply_to(self, is_reply, tweet):
         if is_reply and self._get_reply:
-            tweet_id = tweet['in_reply_to_status_id_str']
-            response = self.http.get_tweet_detail(tweet_id)
-            for entry in response.json()['data']['threaded_conversation_with_injections_v2']['instructions'][0]['entries']:
-                if str(entry['entryId']).split("-")[0] == "tweet":
-                    raw_tweet = entry['content']['itemContent']['tweet_results']['result']
-                    return Tweet(response, raw_tweet, self.http)
+            return self._get_resolver().get(tweet['in_reply_to_status_id_str'])
 
         elif is_reply and not self._get_reply:
             return tweet['in_reply_to_screen_name']
@@ -204,7 +254,7 @@ class Tweet(dict):
     def _is_reply(original_tweet):
         tweet_keys = list(original_tweet.keys())
         required_keys = ["in_reply_to_status_id_str", "in_reply_to_user_id_str", "in_reply_to_screen_name"]
-        return any(x in tweet_keys and original_tweet[x] is True for x in required_keys)
+        return any(x in tweet_keys and original_tweet[x] is not None for x in required_keys)
 
     @staticmethod
     def _is_quoted(original_tweet):
@@ -305,6 +355,38 @@ class Tweet(dict):
 
         return [symbol for symbol in original_tweet['entities']['symbols']]
 
+    _FIELD_BUILDERS = {
+        "created_on": lambda self: parse_date(self.__original_tweet.get("created_at")),
+        "author": lambda self: self._get_author(),
+        "is_quoted": lambda self: self._is_quoted(self.__original_tweet),
+        "quoted_tweet": lambda self: self._get_quoted_tweet(self._field("is_quoted")),
+        "quote_counts": lambda self: self._get_quote_counts(self.__original_tweet),
+        "is_retweet": lambda self: self._is_retweet(self.__original_tweet),
+        "retweeted_tweet": lambda self: self._get_retweeted_tweet(self._field("is_retweet"), self.__original_tweet),
+        "is_reply": lambda self: self._is_reply(self.__original_tweet),
+        "vibe": lambda self: self._get_vibe(),
+        "reply_counts": lambda self: self._get_reply_counts(self.__original_tweet),
+        "is_possibly_sensitive": lambda self: self._is_sensitive(self.__original_tweet),
+        "id": lambda self: self._get_id(),
+        "tweet_body": lambda self: self._field("text"),
+        "text": lambda self: self._get_tweet_text(self.__original_tweet, self._field("is_retweet")),
+        "language": lambda self: self._get_language(self.__original_tweet),
+        "likes": lambda self: self._get_likes(self.__original_tweet),
+        "card": lambda self: self._get_card(),
+        "place": lambda self: self._get_place(self.__original_tweet),
+        "retweet_counts": lambda self: self._get_retweet_counts(self.__original_tweet),
+        "source": lambda self: self._get_source(self.__raw_tweet),
+        "media": lambda self: self._get_tweet_media(self.__original_tweet),
+        "user_mentions": lambda self: self._get_tweet_mentions(self.__original_tweet),
+        "urls": lambda self: self._get_tweet_urls(self.__original_tweet),
+        "hashtags": lambda self: self._get_tweet_hashtags(self.__original_tweet),
+        "symbols": lambda self: self._get_tweet_symbols(self.__original_tweet),
+        "views": lambda self: self._get_views(),
+        "reply_to": lambda self: self._get_reply_to(self._field("is_reply"), self.__original_tweet),
+        "threads": lambda self: [],
+        "comments": lambda self: [],
+    }
+
 
 class Media(dict):
     def __init__(self, media_dict):
@@ -386,8 +468,8 @@ class ShortUser(dict):
 
 
 
-class User(dict):
-    def __init__(self, user_dict, type_=1):
+class User(_LazyModel):
+    def __init__(self, user_dict, type_=1, lazy=False):
         super().__init__()
         if type_ == 1:
             self.__dictionary = user_dict['data']['user']['result']
@@ -396,41 +478,12 @@ class User(dict):
         else:
             self.__dictionary = user_dict['user_results']['result']
 
-        self.id = self.__dictionary.get("id")
-        self.rest_id = self._get_rest_id(self.__dictionary)
-        self.created_at = self._get_created_at(self.__dictionary)
-        self.default_profile = self._get_key(self.__dictionary, "default_profile")
-        self.default_profile_image = self._get_key(self.__dictionary, "default_profile_image")
-        self.description = self._get_key(self.__dictionary, "description")
-        self.entities = self._get_key(self.__dictionary, "entities")
-        self.fast_followers_count = self._get_key(self.__dictionary, "fast_followers_count")
-        self.favourites_count = self._get_key(self.__dictionary, "favourites_count")
-        self.followers_count = self._get_key(self.__dictionary, "followers_count")
-        self.friends_count = self._get_key(self.__dictionary, "friends_count")
-        self.has_custom_timelines = self._get_key(self.__dictionary, "has_custom_timelines")
-        self.is_translator = self._get_key(self.__dictionary, "is_translator")
-        self.listed_count = self._get_key(self.__dictionary, "listed_count")
-        self.location = self._get_key(self.__dictionary, "location")
-        self.media_count = self._get_key(self.__dictionary, "media_count")
-        self.name = self._get_key(self.__dictionary, "name")
-        self.normal_followers_count = self._get_key(self.__dictionary, "normal_followers_count")
-        self.profile_banner_url = self._get_key(self.__dictionary, "profile_banner_url")
-        self.profile_image_url_https = self._get_key(self.__dictionary, "profile_image_url_https")
-        self.profile_interstitial_type = self._get_key(self.__dictionary, "profile_interstitial_type")
-        self.protected = self._get_key(self.__dictionary, "protected")
-        self.screen_name = self.username = self._get_key(self.__dictionary, "screen_name")
-        self.statuses_count = self._get_key(self.__dictionary, "statuses_count")
-        self.translator_type = self._get_key(self.__dictionary, "translator_type")
-        self.verified = self._get_key(self.__dictionary, "verified")
-        # self.verified_type = self._get_key(self.__dictionary, "verified_type")
-        self.possibly_sensitive = self._get_key(self.__dictionary, "possibly_sensitive")
-        self.pinned_tweets = self._get_key(self.__dictionary, "pinned_tweet_ids_str")
-
-        self.profile_url = "https://twitter.com/{}".format(self.screen_name)
+        self._fields = {}
+        if not lazy:
+            for key in self._FIELD_BUILDERS:
+                self._field(key)
 
-        for k, v in vars(self).items():
-            if not k.startswith("_"):
-                self[k] = v
+        self._set_fields()
 
     def __repr__(self):
         return f"User(id={self.rest_id}, name={self.name}, username={self.screen_name}, followers={self.followers_count}, verified={self.verified})"
@@ -455,7 +508,7 @@ class User(dict):
         if not date and user.get("created_at"):
             date = user["created_at"]
 
-        return parser.parse(date) if date else None
+        return parse_date(date) if date else None
 
     @staticmethod
     def _get_key(user, key):
@@ -468,6 +521,27 @@ class User(dict):
 
         return keyValue
 
+    _FIELD_BUILDERS = {
+        "id": lambda self: self.__dictionary.get("id"),
+        "rest_id": lambda self: self._get_rest_id(self.__dictionary),
+        "created_at": lambda self: self._get_created_at(self.__dictionary),
+        **{
+            key: (lambda key: lambda self: self._get_key(self.__dictionary, key))(key)
+            for key in ("default_profile", "default_profile_image", "description", "entities", "fast_followers_count",
+                        "favourites_count", "followers_count", "friends_count", "has_custom_timelines", "is_translator",
+                        "listed_count", "location", "media_count", "name", "normal_followers_count", "profile_banner_url",
+                        "profile_image_url_https", "profile_interstitial_type", "protected", "screen_name")
+        },
+        "username": lambda self: self._field("screen_name"),
+        "statuses_count": lambda self: self._get_key(self.__dictionary, "statuses_count"),
+        "translator_type": lambda self: self._get_key(self.__dictionary, "translator_type"),
+        "verified": lambda self: self._get_key(self.__dictionary, "verified"),
+        # "verified_type": lambda self: self._get_key(self.__dictionary, "verified_type"),
+        "possibly_sensitive": lambda self: self._get_key(self.__dictionary, "possibly_sensitive"),
+        "pinned_tweets": lambda self: self._get_key(self.__dictionary, "pinned_tweet_ids_str"),
+        "profile_url": lambda self: "https://twitter.com/{}".format(self._field("screen_name")),
+    }
+
 
 class Trends:
     def __init__(self, trends_dict):
@@ -483,44 +557,17 @@ class Trends:
         return self.__dictionary
 
 
-class UserLegacy(dict):
-    def __init__(self, user_dict):
+class UserLegacy(_LazyModel):
+    def __init__(self, user_dict, lazy=False):
         super().__init__()
         self.__dictionary = user_dict
-        self.id = self.__dictionary.get("id")
-        self.rest_id = self.__dictionary.get("id")
-        self.created_at = parser.parse(self.__dictionary.get("created_at")) if self.__dictionary.get("created_at") else None
-        self.default_profile = self.__dictionary.get("default_profile")
-        self.default_profile_image = self.__dictionary.get("default_profile_image")
-        self.description = self.__dictionary.get("description")
-        self.entities = self.__dictionary.get("entities")
-        self.fast_followers_count = self.__dictionary.get("fast_followers_count")
-        self.favourites_count = self.__dictionary.get("favourites_count")
-        self.followers_count = self.__dictionary.get("followers_count")
-        self.friends_count = self.__dictionary.get("friends_count")
-        self.has_custom_timelines = self.__dictionary.get("has_custom_timelines")
-        self.is_translator = self.__dictionary.get("is_translator")
-        self.listed_count = self.__dictionary.get("listed_count")
-        self.location = self.__dictionary.get("location")
-        self.media_count = self.__dictionary.get("media_count")
-        self.name = self.__dictionary.get("name")
-        self.normal_followers_count = self.__dictionary.get("normal_followers_count")
-        self.profile_banner_url = self.__dictionary.get("profile_banner_url")
-        self.profile_image_url_https = self.__dictionary.get("profile_image_url_https")
-        self.profile_interstitial_type = self.__dictionary.get("profile_interstitial_type")
-        self.protected = self.__dictionary.get("protected")
-        self.screen_name = self.__dictionary.get("screen_name")
-        self.statuses_count = self.__dictionary.get("statuses_count")
-        self.translator_type = self.__dictionary.get("translator_type")
-        self.verified = self.__dictionary.get("verified")
-        # self.verified_type = self.__dictionary.get("verified_type")
-        self.possibly_sensitive = self.__dictionary.get("possibly_sensitive")
-        self.pinned_tweets = self.__dictionary.get("pinned_tweet_ids_str")
-        self.profile_url = "https://twitter.com/{}".format(self.screen_name)
 
-        for k, v in vars(self).items():
-            if not k.startswith("_"):
-                self[k] = v
+        self._fields = {}
+        if not lazy:
+            for key in self._FIELD_BUILDERS:
+                self._field(key)
+
+        self._set_fields()
 
     def __repr__(self):
         return f"User(id={self.rest_id}, name={self.name}, followers={self.followers_count} , verified={self.verified})"
@@ -528,6 +575,24 @@ class UserLegacy(dict):
     def to_dict(self):
         return self.__dictionary
 
+    _FIELD_BUILDERS = {
+        "id": lambda self: self.__dictionary.get("id"),
+        "rest_id": lambda self: self.__dictionary.get("id"),
+        "created_at": lambda self: parse_date(self.__dictionary.get("created_at")) if self.__dictionary.get("created_at") else None,
+        **{
+            key: (lambda key: lambda self: self.__dictionary.get(key))(key)
+            for key in ("default_profile", "default_profile_image", "description", "entities", "fast_followers_count",
+                        "favourites_count", "followers_count", "friends_count", "has_custom_timelines", "is_translator",
+                        "listed_count", "location", "media_count", "name", "normal_followers_count", "profile_banner_url",
+                        "profile_image_url_https", "profile_interstitial_type", "protected", "screen_name",
+                        "statuses_count", "translator_type", "verified")
+        },
+        # "verified_type": lambda self: self.__dictionary.get("verified_type"),
+        "possibly_sensitive": lambda self: self.__dictionary.get("possibly_sensitive"),
+        "pinned_tweets": lambda self: self.__dictionary.get("pinned_tweet_ids_str"),
+        "profile_url": lambda self: "https://twitter.com/{}".format(self._field("screen_name")),
+    }
+
 
 class Card(dict):
     def __init__(self, card_dict):
@@ -570,10 +635,10 @@ class Card(dict):
                 }
                 self.choices.append(Choice(_r))
             elif _key[0] == "end" and _key[1] == "datetime":
-                self.end_time = parser.parse(_['value']['string_value'])
+                self.end_time = parse_date(_['value']['string_value'])
                 # last_updated_datetime_utc
             elif _key[0] == "last" and _key[1] == "updated":
-                self.last_updated_time = parser.parse(_['value']['string_value'])
+                self.last_updated_time = parse_date(_['value']['string_value'])
                 # duration_minutes
             elif _key[0] == "duration" and _key[1] == "minutes":
                 self.duration = _['value']['string_value']
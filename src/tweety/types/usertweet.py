@@ -1,10 +1,14 @@
+import asyncio
 import time
 import traceback
 from . import Tweet
+from .page import Page
+from ..profiling import measure, profile_page, sleeping
 
 
 class UserTweets(dict):
-    def __init__(self, user_id, http, get_replies: bool = True, wait_time=2, throttle_on_fail=10, cursor=None):
+    def __init__(self, user_id, http, get_replies: bool = True, wait_time=0, throttle_on_fail=None, cursor=None, lazy=False, since_id=None,
+                 profile=None, parse_pool=None):
         super().__init__()
         self.tweets = []
         self.get_replies = get_replies
@@ -13,12 +17,23 @@ class UserTweets(dict):
         self.http = http
         self.user_id = user_id
         self.wait_time = wait_time
+        # A page without a timeline is requested again right away , the request waits on the rate limit scheduler
+        # of the http client when the budget is spent. Seconds to sleep before that on top of it
         self.throttle_on_fail = throttle_on_fail
+        self.lazy = lazy
+        # Only the tweets newer than since_id are returned , the pagination stops once it is reached
+        self.since_id = int(since_id) if since_id else None
+        self.newest_id = str(since_id) if since_id else None
+        # The phases of every page are timed into it when given , see .profiling.Profile
+        self.profile = profile
+        self.page_profile = None
+        # The pages are built by the workers of a .parallel.ParsePool when given , into TweetRecord objects
+        self.parse_pool = parse_pool
         # self._get_tweets(user_id, pages, get_replies, wait_time)
 
     @staticmethod
     def _get_entries(response):
-        timeline = response.json()['data']['user']['result']['timeline_v2']
+        timeline = response['data']['user']['result']['timeline_v2']
         if 'timeline' in timeline:
             instructions = timeline['timeline']['instructions']
             for instruction in instructions:
@@ -40,57 +55,201 @@ class UserTweets(dict):
 
         return []
 
-    def get_next_page(self, user_id, get_replies):
+    @staticmethod
+    def _is_pinned(entry):
+        try:
+            return entry['content']['itemContent']['socialContext']['contextType'] == "Pin"
+        except (KeyError, TypeError):
+            return False
+
+    def _is_known(self, tweet_id):
+        return self.since_id is not None and tweet_id is not None and int(tweet_id) <= self.since_id
+
+    def _parse_page(self, response, entries):
         _tweets = []
-        if self.is_next_page:
-            response = self.http.get_tweets(user_id, replies=get_replies, cursor=self.cursor)
+        reached_since_id = False
+        for entry in entries:
+            pinned = self._is_pinned(entry)
+            # Only a timeline entry tells how far the sync went , a pinned tweet or the older tweets of a conversation don't
+            if str(entry['entryId']).split("-")[0] == "tweet" and not pinned:
+                reached_since_id = reached_since_id or self._is_known(str(entry['entryId']).split("-")[-1])
+
+            tweets = self._get_tweet_content_key(entry)
+            for tweet in tweets:
+                # Skip deleted/suspended tweets
+                if tweet['__typename'] == 'TweetTombstone':
+                    continue
 
-            try:
-                entries = self._get_entries(response)
-            except Exception as e:
+                try:
+                    tweet = Tweet(response, tweet, self.http, lazy=self.lazy)
+                    if not self._is_known(tweet.id):
+                        _tweets.append(tweet)
+                        # Every returned tweet moves the watermark , also the newer tweets of a conversation and a newly
+                        # pinned tweet , which would otherwise come back on every sync. A returned tweet is newer than since_id ,
+                        # the timeline tweets between the two are read before the sync stops
+                        if self.newest_id is None or int(tweet.id) > int(self.newest_id):
+                            self.newest_id = tweet.id
+                except:
+                    traceback.print_exc()
+                    pass
+
+        self.is_next_page = self._get_cursor(entries) and not reached_since_id
+
+        self['is_next_page'] = self.is_next_page
+        self['cursor'] = self.cursor
+
+        return _tweets
+
+    def _throttle(self):
+        if self.throttle_on_fail:
+            with measure("sleep"):
                 time.sleep(self.throttle_on_fail)
+
+    async def _throttle_async(self):
+        if self.throttle_on_fail:
+            with measure("sleep"):
+                await asyncio.sleep(self.throttle_on_fail)
+
+    def get_next_page(self, user_id, get_replies):
+        if self.is_next_page:
+            if self.parse_pool is not None:
+                return self._get_pooled_page(user_id, get_replies)
+
+            with profile_page(self.profile, self.cursor) as page:
                 response = self.http.get_tweets(user_id, replies=get_replies, cursor=self.cursor)
+
                 try:
                     entries = self._get_entries(response)
-                except:
-                    raise Exception(f"Error getting page entries for user {user_id} after throttle: {e}. Response: {response}")
+                except Exception as e:
+                    self._throttle()
+                    response = self.http.get_tweets(user_id, replies=get_replies, cursor=self.cursor)
+                    try:
+                        entries = self._get_entries(response)
+                    except:
+                        raise Exception(f"Error getting page entries for user {user_id} after throttle: {e}. Response: {response}")
+
+                with measure("build"):
+                    tweets = self._parse_page(response, entries)
+
+                self.page_profile = page
+                if page is not None:
+                    page.items = len(tweets)
+
+                return tweets
 
-            for entry in entries:
-                tweets = self._get_tweet_content_key(entry)
-                for tweet in tweets:
-                    # Skip deleted/suspended tweets
-                    if tweet['__typename'] == 'TweetTombstone':
-                        continue
+    async def get_next_page_async(self, user_id, get_replies):
+        if self.is_next_page:
+            if self.parse_pool is not None:
+                return await self._get_pooled_page_async(user_id, get_replies)
+
+            with profile_page(self.profile, self.cursor) as page:
+                response = await self.http.get_tweets(user_id, replies=get_replies, cursor=self.cursor)
 
+                try:
+                    entries = self._get_entries(response)
+                except Exception as e:
+                    await self._throttle_async()
+                    response = await self.http.get_tweets(user_id, replies=get_replies, cursor=self.cursor)
                     try:
-                        _tweets.append(Tweet(response, tweet, self.http))
+                        entries = self._get_entries(response)
                     except:
-                        traceback.print_exc()
-                        pass
+                        raise Exception(f"Error getting page entries for user {user_id} after throttle: {e}. Response: {response}")
+
+                with measure("build"):
+                    tweets = self._parse_page(response, entries)
+
+                self.page_profile = page
+                if page is not None:
+                    page.items = len(tweets)
+
+                return tweets
+
+    def _submit_page(self, body, get_replies):
+        return self.parse_pool.submit_timeline(body, get_replies, self.cursor, self.since_id, self.newest_id)
 
-            self.is_next_page = self._get_cursor(entries)
+    def _set_pooled_page(self, page, result):
+        tweets, self.cursor, self.is_next_page, self.newest_id = result
+        self['is_next_page'] = self.is_next_page
+        self['cursor'] = self.cursor
 
-            self['is_next_page'] = self.is_next_page
-            self['cursor'] = self.cursor
+        self.page_profile = page
+        if page is not None:
+            page.items = len(tweets)
 
-            return _tweets
+        return tweets
+
+    def _get_pooled_page(self, user_id, get_replies):
+        with profile_page(self.profile, self.cursor) as page:
+            body = self.http.get_tweets(user_id, replies=get_replies, cursor=self.cursor, raw=True)
+
+            with measure("build"):
+                result = self._submit_page(body, get_replies).result()
+
+            # Only a page without a timeline is requested again , an error of the worker is raised as it is
+            if result is None:
+                self._throttle()
+                body = self.http.get_tweets(user_id, replies=get_replies, cursor=self.cursor, raw=True)
+                with measure("build"):
+                    result = self._submit_page(body, get_replies).result()
+
+                if result is None:
+                    raise Exception(f"Error getting page entries for user {user_id} after throttle. Response: {body}")
+
+            return self._set_pooled_page(page, result)
+
+    async def _get_pooled_page_async(self, user_id, get_replies):
+        with profile_page(self.profile, self.cursor) as page:
+            body = await self.http.get_tweets(user_id, replies=get_replies, cursor=self.cursor, raw=True)
+
+            with measure("build"):
+                result = await asyncio.wrap_future(self._submit_page(body, get_replies))
+
+            # Only a page without a timeline is requested again , an error of the worker is raised as it is
+            if result is None:
+                await self._throttle_async()
+                body = await self.http.get_tweets(user_id, replies=get_replies, cursor=self.cursor, raw=True)
+                with measure("build"):
+                    result = await asyncio.wrap_future(self._submit_page(body, get_replies))
+
+                if result is None:
+                    raise Exception(f"Error getting page entries for user {user_id} after throttle. Response: {body}")
+
+            return self._set_pooled_page(page, result)
 
     def get_tweets_page_iterator(self, pages):
         for page in range(1, int(pages) + 1):
+            if not self.is_next_page:
+                break
+
             tweets = self.get_next_page(self.user_id, self.get_replies)
-            yield tweets
-            
+            yield Page(tweets, self.cursor, self.is_next_page, self.page_profile)
+
+            if self.is_next_page and page != pages:
+                with sleeping(self.profile, self.page_profile):
+                    time.sleep(self.wait_time)
+
+    async def get_tweets_page_iterator_async(self, pages):
+        for page in range(1, int(pages) + 1):
+            if not self.is_next_page:
+                break
+
+            tweets = await self.get_next_page_async(self.user_id, self.get_replies)
+            yield Page(tweets, self.cursor, self.is_next_page, self.page_profile)
+
             if self.is_next_page and page != pages:
-                time.sleep(self.wait_time)
+                with sleeping(self.profile, self.page_profile):
+                    await asyncio.sleep(self.wait_time)
 
     def get_tweets(self, pages):
         all_tweets = []
-        for page in range(1, int(pages) + 1):
-            tweets = self.get_next_page(self.user_id, self.get_replies)
+        for tweets in self.get_tweets_page_iterator(pages):
             all_tweets += tweets
+        return all_tweets
 
-            if self.is_next_page and page != pages:
-                time.sleep(self.wait_time)
+    async def get_tweets_async(self, pages):
+        all_tweets = []
+        async for tweets in self.get_tweets_page_iterator_async(pages):
+            all_tweets += tweets
         return all_tweets
 
     def _get_cursor(self, entries):
@@ -121,3 +280,37 @@ class UserTweets(dict):
         return f"UserTweets(user_id={self.user_id}, count={self.__len__()})"
 
 
+class TimelineResult(dict):
+    def __init__(self, identifier, user_id=None, user=None, tweets=None, error=None):
+        """
+        The outcome of crawling the timeline of one account
+
+        :param identifier: (`str`) The screen name or rest id the account was requested with
+        :param user_id: (`str`) The rest id of the account , None if it couldn't be resolved
+        :param user: (`.types.twDataTypes.User`) The account , None if only the rest id was given
+        :param tweets: ([`.types.twDataTypes.Tweet`]) The tweets of the crawled pages
+        :param error: (`Exception`) Why the account couldn't be crawled , None on success
+        """
+
+        super().__init__()
+        self.identifier = identifier
+        self.user_id = user_id
+        self.user = user
+        self.tweets = tweets if tweets is not None else []
+        self.error = error
+
+        self['identifier'] = self.identifier
+        self['user_id'] = self.user_id
+        self['user'] = self.user
+        self['tweets'] = self.tweets
+        self['error'] = self.error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        if self.error is not None:
+            return f"TimelineResult(identifier={self.identifier}, error={self.error!r})"
+
+        return f"TimelineResult(identifier={self.identifier}, count={len(self.tweets)})"
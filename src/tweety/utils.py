@@ -1,5 +1,85 @@
+import functools
+import json
+from datetime import datetime, timedelta, timezone
+from dateutil import parser
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
 def custom_json(self):
     try:
         return self.json()
     except:
         return None
+
+
+def json_loads(content):
+    """
+    Decode a response body , using orjson when it is installed and the stdlib json module otherwise
+
+    :param content: (`bytes` | `str`) The raw body
+    """
+
+    if orjson is not None:
+        return orjson.loads(content)
+
+    return json.loads(content)
+
+
+def decode_response(response, loads=json_loads):
+    """
+    Decode the body of a response exactly once
+
+    :param response: (`httpx.Response`) The response to decode
+    :param loads: (`callable`) The decoder , `json_loads` by default
+
+    :return: The parsed payload or None if the body isn't valid JSON
+    """
+
+    try:
+        return loads(response.content)
+    except Exception:
+        return None
+
+
+TWITTER_MONTHS = {month: index for index, month in enumerate(
+    ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"], 1)}
+
+
+@functools.lru_cache(maxsize=8192)
+def parse_date(value):
+    """
+    Parse the timestamps Twitter returns , i.e. `Wed Oct 10 20:19:24 +0000 2018` and ISO-8601 for the cards.
+    Anything else is handed to dateutil. Repeated values , e.g. the `created_at` of an author , come from the cache
+
+    :param value: (`str`) The timestamp
+
+    :return: datetime.datetime
+    """
+
+    try:
+        if value[3] == " ":
+            _, month, day, clock, offset, year = value.split(" ")
+            hour, minute, second = clock.split(":")
+            return datetime(int(year), TWITTER_MONTHS[month], int(day), int(hour), int(minute), int(second),
+                            tzinfo=_get_timezone(offset))
+
+        if value[4] == "-":
+            return datetime.fromisoformat(value[:-1] + "+00:00" if value[-1] == "Z" else value)
+    # AttributeError : datetime.fromisoformat is new in python 3.7
+    except (ValueError, KeyError, IndexError, AttributeError):
+        pass
+
+    return parser.parse(value)
+
+
+@functools.lru_cache(maxsize=64)
+def _get_timezone(offset):
+    if offset == "+0000":
+        return timezone.utc
+
+    minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+    return timezone(timedelta(minutes=-minutes if offset[0] == "-" else minutes))
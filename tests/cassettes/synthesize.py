@@ -0,0 +1,116 @@
+"""
+Writes tweety.json , the cassette the offline tests replay.
+
+The exchanges are synthetic : the payloads come from benchmarks/fixtures.py through an `httpx.MockTransport` ,
+shaped like the real responses , with the values the tests assert on (e.g. @elonmusk) filled in.
+Run it again after adding a flow the tests need : `python tests/cassettes/synthesize.py`
+"""
+
+import asyncio
+import json
+import os
+import sys
+from urllib.parse import parse_qs
+import httpx
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "..", "benchmarks"))
+
+import fixtures  # noqa: E402
+from tweety.bot import Tweety, AsyncTweety  # noqa: E402
+from tweety.transport import CassetteTransport  # noqa: E402
+
+CASSETTE = os.path.join(HERE, "tweety.json")
+ELON = 44196397
+PROTECTED = 1000001
+REPLIED_TWEET = "1587156152609021958"
+
+
+def _user(user_id):
+    user = fixtures.graphql_user(user_id)
+    if user_id == ELON:
+        user["legacy"].update(screen_name="elonmusk", name="Elon Musk")
+    if user_id == PROTECTED:
+        user["legacy"].update(screen_name="protected_account", protected=True)
+    return user
+
+
+def _rename_authors(node):
+    # The fixtures name every user userN , the timelines of @elonmusk are written by him
+    if isinstance(node, dict):
+        if node.get("rest_id") == str(ELON) and "legacy" in node:
+            node["legacy"].update(screen_name="elonmusk", name="Elon Musk")
+        for value in node.values():
+            _rename_authors(value)
+    elif isinstance(node, list):
+        for value in node:
+            _rename_authors(value)
+    return node
+
+
+def _tweet_detail(tweet_id):
+    payload = fixtures.tweet_detail_page(tweet_id, replies=2)
+    if tweet_id == REPLIED_TWEET:
+        entries = payload["data"]["threaded_conversation_with_injections_v2"]["instructions"][0]["entries"]
+        reply = next(entry for entry in entries if entry["entryId"].startswith("conversationthread"))
+        reply["content"]["items"][0]["item"]["itemContent"]["tweet_results"]["result"]["legacy"]["full_text"] = "@sukutodo 😍"
+    return payload
+
+
+def _payload(endpoint, variables, query):
+    screen_names = {"elonmusk": ELON, "protected_account": PROTECTED}
+    if endpoint == "activate.json":
+        return fixtures.guest_token()
+    if endpoint == "init.json":
+        return {}
+    if endpoint == "UserByScreenName":
+        user_id = screen_names.get(variables["screen_name"])
+        return {"data": {"user": {"result": _user(user_id)}}} if user_id else {"data": {}}
+    if endpoint == "UsersByRestIds":
+        return {"data": {"users": [{"result": _user(int(user_id))} for user_id in variables["userIds"]]}}
+    if endpoint == "UsersByScreenNames":
+        return {"data": {"users": [{"result": _user(screen_names[name])} if name in screen_names else {"result": {"__typename": "UserUnavailable"}}
+                                   for name in variables["screen_names"]]}}
+    if endpoint == "UserTweets":
+        page = 1 if variables.get("cursor") else 0
+        return _rename_authors(fixtures.user_tweets_page(variables["userId"], page, last_page=page == 1))
+    if endpoint == "adaptive.json":
+        return fixtures.search_page(query["q"][0], 0, count=3)
+    if endpoint == "TweetDetail":
+        return _tweet_detail(variables["focalTweetId"])
+    return None
+
+
+def handler(request):
+    query = parse_qs(request.url.query.decode())
+    variables = json.loads(query["variables"][0]) if "variables" in query else {}
+    payload = _payload(request.url.path.rsplit("/", 1)[-1], variables, query)
+    return httpx.Response(404) if payload is None else httpx.Response(200, json=payload)
+
+
+def main():
+    mock = httpx.MockTransport(handler)
+    cassette = CassetteTransport(CASSETTE, CassetteTransport.RECORD, transport=mock, async_transport=mock)
+    app = Tweety(transport=cassette)
+    user = app.get_user("elonmusk")
+    app.get_user("protected_account")
+    tweets = app.get_tweets(2, user_id=user.rest_id)
+    app.search("python", 1)
+    app.tweet_detail(tweets[0].id)
+    app.get_replies(tweets[0].id)
+    app.get_replies(REPLIED_TWEET)
+    app.get_users(["elonmusk", str(ELON), "nonexistentuser1231237"])
+    list(app.crawl_timelines(["elonmusk", str(ELON), "nonexistentuser1231237"], pages=1))
+    cassette.save()
+
+    async def crawl():
+        # Replayed from the exchanges above , checks the async client needs nothing more
+        async with AsyncTweety(transport=CassetteTransport(CASSETTE)) as tweety:
+            await tweety.get_tweets(2, user_id=(await tweety.get_user("elonmusk")).rest_id)
+
+    asyncio.run(crawl())
+    print(f"{cassette.recorded} exchanges written to {CASSETTE}")
+
+
+if __name__ == "__main__":
+    main()
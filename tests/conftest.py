@@ -0,0 +1,57 @@
+# The payload builders the offline tests share , import them with `from conftest import ...`
+
+AUTHOR = {
+    "rest_id": "44196397",
+    "legacy": {"created_at": "Tue Jun 02 20:12:29 +0000 2009", "name": "Elon Musk", "screen_name": "elonmusk"},
+}
+
+
+def raw_tweet(tweet_id="1587156152609021958", text=None, in_reply_to=None, source=None, **legacy):
+    """
+    A tweet as found in the GraphQL payloads , the keyword arguments are added to its `legacy`
+    """
+
+    tweet_legacy = {"created_at": "Mon Oct 31 18:30:05 +0000 2022", "full_text": text or f"Tweet {tweet_id}"}
+    if in_reply_to:
+        tweet_legacy.update(in_reply_to_status_id_str=in_reply_to, in_reply_to_screen_name="elonmusk")
+    tweet_legacy.update(legacy)
+
+    tweet = {"__typename": "Tweet", "rest_id": tweet_id, "core": {"user_results": {"result": AUTHOR}}, "legacy": tweet_legacy}
+    if source:
+        tweet["source"] = source
+    return tweet
+
+
+def tweet_entry(tweet_id, pinned=False, **kwargs):
+    content = {"tweet_results": {"result": raw_tweet(tweet_id, **kwargs)}}
+    if pinned:
+        content["socialContext"] = {"type": "TimelineGeneralContext", "contextType": "Pin"}
+    return {"entryId": f"tweet-{tweet_id}", "content": {"itemContent": content}}
+
+
+def bottom_cursor(value):
+    return {"entryId": f"cursor-bottom-{value}", "content": {"cursorType": "Bottom", "value": value}}
+
+
+def timeline_payload(entries):
+    instructions = [{"type": "TimelineAddEntries", "entries": entries}]
+    return {"data": {"user": {"result": {"timeline_v2": {"timeline": {"instructions": instructions}}}}}}
+
+
+def search_page(page):
+    users = {"44196397": {"id_str": "44196397", "name": "Elon Musk", "screen_name": "elonmusk",
+                          "created_at": "Tue Jun 02 20:12:29 +0000 2009"}}
+    tweets = {str(page * 10 + i): {"user_id": 44196397, "full_text": f"Tweet {i}", "created_at": "Mon Oct 31 18:30:05 +0000 2022"}
+              for i in range(3)}
+    cursor = {"entryId": "sq-cursor-bottom", "content": {"operation": {"cursor": {"value": f"scroll-{page + 1}", "cursorType": "Bottom"}}}}
+    return {"globalObjects": {"tweets": tweets, "users": users}, "timeline": {"instructions": [{"addEntries": {"entries": [cursor]}}]}}
+
+
+class SearchHttp:
+    # Serves `search_page` for the page number at the end of the cursor
+    def __init__(self):
+        self.cursors = []
+
+    def perform_search(self, keyword, cursor, filter_):
+        self.cursors.append(cursor)
+        return search_page(int(cursor.split("-")[-1]) if cursor else 0)
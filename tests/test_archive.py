@@ -0,0 +1,94 @@
+import asyncio
+import json
+import os
+import sqlite3
+from tweety.archive import ArchiveReplay, PayloadArchive, replay_pages
+from tweety.bot import AsyncTweety
+from tweety.builder import UrlBuilder
+from tweety.transport import CassetteTransport
+from tweety.types.usertweet import UserTweets
+from conftest import bottom_cursor, timeline_payload, tweet_entry
+
+CASSETTE = os.path.join(os.path.dirname(__file__), "cassettes", "tweety.json")
+
+
+def _page(page):
+    entries = [tweet_entry(str(page * 10 + 1)), tweet_entry(str(page * 10 + 2)), bottom_cursor(f"page-{page + 1}")]
+    return json.dumps(timeline_payload(entries)).encode()
+
+
+def _archive(directory):
+    archive = PayloadArchive(directory, segment_size=1)
+    builder = UrlBuilder()
+    for page, cursor in enumerate([None, "page-1", "page-2"]):
+        archive.add(builder.user_tweets("44196397", cursor=cursor)["url"], _page(page))
+
+    return archive
+
+
+def test_pages_are_archived_in_segments(tmp_path):
+    archive = _archive(str(tmp_path))
+
+    # every body went over the segment size , each one started a new segment
+    assert sorted(name for name in os.listdir(str(tmp_path)) if name.startswith("segment-")) == [
+        "segment-000000.gz", "segment-000001.gz", "segment-000002.gz"]
+    assert [entry["cursor"] for entry in archive.entries(["UserTweets"])] == [None, "page-1", "page-2"]
+    assert archive.entries(["UserTweets"], cursor="page-1")[0]["variables"]["userId"] == "44196397"
+    assert PayloadArchive(str(tmp_path)).read(archive.entries()[2]) == _page(2)
+
+
+def test_replay_without_network(tmp_path):
+    archive = _archive(str(tmp_path))
+
+    pages = [page for entry, page in replay_pages(archive)]
+    assert [[tweet.id for tweet in page] for page in pages] == [["1", "2"], ["11", "12"], ["21", "22"]]
+    assert pages[-1].cursor == "page-3"
+
+    user_tweets = UserTweets("44196397", ArchiveReplay(archive), False, 0)
+    assert [len(page) for page in user_tweets.get_tweets_page_iterator(3)] == [2, 2, 2]
+
+
+def test_replay_reads_the_index_once(tmp_path):
+    archive = _archive(str(tmp_path))
+    # the latest payload of a request is the one served
+    payload = timeline_payload([tweet_entry("51"), tweet_entry("52"), bottom_cursor("page-2")])
+    archive.add(UrlBuilder().user_tweets("44196397", cursor="page-1")["url"], json.dumps(payload).encode())
+    queries = []
+    entries = archive.entries
+    archive.entries = lambda *args, **kwargs: queries.append(args) or entries(*args, **kwargs)
+
+    replay = ArchiveReplay(archive)
+    assert [tweet.id for tweet in UserTweets("44196397", replay, False, 0).get_tweets(3)] == ["1", "2", "51", "52", "21", "22"]
+    assert replay.get_tweets("12", cursor="page-1") is None
+    assert len(queries) == 1
+
+
+def _committed(directory):
+    with sqlite3.connect(os.path.join(directory, "index.db")) as db:
+        return db.execute("SELECT COUNT(*) FROM payloads").fetchone()[0]
+
+
+def test_index_is_committed_in_batches(tmp_path):
+    archive = PayloadArchive(str(tmp_path), commit_every=2, commit_interval=60)
+    url = UrlBuilder().user_tweets("44196397")["url"]
+    archive.add(url, _page(0))
+    assert len(archive) == 1 and _committed(str(tmp_path)) == 0
+
+    archive.add(url, _page(1))
+    archive.add(url, _page(2))
+    assert _committed(str(tmp_path)) == 2
+
+    archive.close()
+    assert _committed(str(tmp_path)) == 3
+
+
+def test_async_responses_are_archived(tmp_path):
+    archive = PayloadArchive(str(tmp_path))
+
+    async def crawl():
+        async with AsyncTweety(transport=CassetteTransport(CASSETTE), archive=archive) as tweety:
+            user = await tweety.get_user("elonmusk")
+            return await tweety.get_tweets(pages=2, user_id=user.rest_id)
+
+    assert len(asyncio.run(crawl())) == 80
+    assert [entry["cursor"] is None for entry in archive.entries(["UserTweets"])] == [True, False]
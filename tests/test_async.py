@@ -0,0 +1,49 @@
+import asyncio
+import os
+from tweety.bot import Tweety, AsyncTweety
+from tweety.types import Tweet
+from tweety.transport import CassetteTransport
+
+CASSETTE = os.path.join(os.path.dirname(__file__), "cassettes", "tweety.json")
+
+NUM_PAGES = 2
+
+
+def test_async_get_user_tweets():
+    async def crawl():
+        async with AsyncTweety(transport=CassetteTransport(CASSETTE)) as tweety:
+            user = await tweety.get_user('elonmusk')
+            assert user.rest_id == '44196397'
+
+            num_pages = 0
+            async for tweets in tweety.paginate_tweets(user.rest_id, pages=NUM_PAGES):
+                assert tweets[0].author.rest_id == '44196397'
+                num_pages += 1
+
+            return num_pages
+
+    assert asyncio.run(crawl()) == NUM_PAGES
+
+
+def test_get_tweets_takes_the_arguments_of_tweety():
+    async def crawl():
+        async with AsyncTweety(transport=CassetteTransport(CASSETTE)) as tweety:
+            return await tweety.get_tweets(2, False, 0, None, '44196397')
+
+    tweets = asyncio.run(crawl())
+    assert len(tweets) == 80 and tweets[0].author.rest_id == '44196397'
+
+
+def test_tweet_detail_and_replies_resolve_the_parent_like_tweety():
+    tweet_id = "1587156152609021958"
+    tweety = Tweety(transport=CassetteTransport(CASSETTE))
+    expected = tweety.tweet_detail(tweet_id).reply_to, tweety.get_replies(tweet_id)[0].reply_to.reply_to
+    tweety.close()
+
+    async def get():
+        async with AsyncTweety(transport=CassetteTransport(CASSETTE)) as async_tweety:
+            return (await async_tweety.tweet_detail(tweet_id)).reply_to, (await async_tweety.get_replies(tweet_id))[0].reply_to.reply_to
+
+    parents = asyncio.run(get())
+    assert all(isinstance(parent, Tweet) for parent in parents)
+    assert [parent.id for parent in parents] == [parent.id for parent in expected]
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+import pytest
+from tweety.checkpoint import Checkpoint, FileCheckpointStore, SQLiteCheckpointStore, track, track_async
+from tweety.types.page import Page
+from tweety.types.search import Search
+from conftest import SearchHttp
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "file":
+        return FileCheckpointStore(str(tmp_path / "checkpoints.json"))
+
+    return SQLiteCheckpointStore(str(tmp_path / "checkpoints.db"))
+
+
+def test_store_round_trip(store):
+    assert store.load("job") is None
+
+    checkpoint = Checkpoint("job", "tweets", "44196397")
+    checkpoint.update(Page([], "cursor-1", True))
+    store.save(checkpoint)
+
+    loaded = store.load("job")
+    assert (loaded.kind, loaded.target, loaded.cursor, loaded.pages) == ("tweets", "44196397", "cursor-1", 1)
+    assert store.jobs() == ["job"]
+
+    store.delete("job")
+    assert store.load("job") is None
+
+
+def test_job_resumes_after_a_crash(store):
+    checkpoint = Checkpoint("python", "search", "python")
+    with pytest.raises(RuntimeError):
+        pages = Search("python", SearchHttp(), 0, wait_time=0).get_search_page_iterator(5)
+        for index, page in enumerate(track(pages, store, checkpoint)):
+            if index == 1:
+                raise RuntimeError("crash")
+
+    # the page being read when the crawl crashed isn't saved , it is read again
+    saved = store.load("python")
+    assert (saved.pages, saved.cursor, saved.last_tweet_id) == (1, "scroll-1", "2")
+
+    http = SearchHttp()
+    pages = Search("python", http, 0, wait_time=0, cursor=saved.cursor).get_search_page_iterator(2)
+    assert [page[0].id for page in track(pages, store, saved)] == ["10", "20"]
+    assert http.cursors == ["scroll-1", "scroll-2"]
+    assert store.load("python").pages == 3
+
+
+def test_async_job_saves_off_the_event_loop(store):
+    saved_on = []
+    save = store.save
+
+    def record_save(checkpoint):
+        saved_on.append(threading.current_thread())
+        save(checkpoint)
+
+    store.save = record_save
+
+    async def crawl():
+        async def pages():
+            for index in range(2):
+                yield Page([], f"cursor-{index}", True)
+
+        return [page.cursor async for page in track_async(pages(), store, Checkpoint("job", "tweets", "44196397"))]
+
+    assert asyncio.run(crawl()) == ["cursor-0", "cursor-1"]
+    assert len(saved_on) == 2 and threading.main_thread() not in saved_on
+    assert store.load("job").cursor == "cursor-1"
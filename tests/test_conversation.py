@@ -0,0 +1,48 @@
+from tweety.types import Tweet
+from tweety.types.conversation import ConversationResolver
+from conftest import raw_tweet
+
+
+def _detail(*raw_tweets):
+    entries = [{"entryId": f"tweet-{tweet['rest_id']}", "content": {"itemContent": {"tweet_results": {"result": tweet}}}}
+               for tweet in raw_tweets]
+    return {"data": {"threaded_conversation_with_injections_v2": {"instructions": [{"entries": entries}]}}}
+
+
+class _Http:
+    def __init__(self):
+        self.requested = []
+
+    def get_tweet_detail(self, tweet_id):
+        self.requested.append(tweet_id)
+        return _detail(raw_tweet(tweet_id))
+
+
+def test_parent_in_payload_is_not_requested():
+    http = _Http()
+    payload = _detail(raw_tweet("1"), raw_tweet("2", in_reply_to="1"))
+    reply = Tweet(payload, raw_tweet("2", in_reply_to="1"), http, get_reply=True)
+
+    assert reply.is_reply
+    assert 'reply_to' not in dict(reply)
+    assert reply.reply_to.id == "1"
+    assert http.requested == []
+
+
+def test_missing_parents_are_requested_once():
+    http = _Http()
+    replies = [Tweet(None, raw_tweet(str(10 + index), in_reply_to=str(index % 2)), http) for index in range(6)]
+
+    ConversationResolver(http).resolve(replies)
+    assert sorted(http.requested) == ["0", "1"]
+    assert [reply.reply_to.id for reply in replies[:2]] == ["0", "1"]
+
+
+def test_payloads_are_indexed_on_first_lookup():
+    resolver = ConversationResolver(_Http())
+    resolver.add_response(_detail(raw_tweet("1")))
+    resolver.add_response(_detail(raw_tweet("2")))
+    assert resolver._raw_tweets == {}
+
+    assert "2" in resolver and resolver.get("1").id == "1"
+    assert resolver.http.requested == []
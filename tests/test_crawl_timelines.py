@@ -0,0 +1,33 @@
+import os
+import httpx
+from tweety.bot import Tweety
+from tweety.exceptions_ import UserNotFound
+from tweety.transport import CassetteTransport
+
+CASSETTE = os.path.join(os.path.dirname(__file__), "cassettes", "tweety.json")
+
+NUM_PAGES = 1
+
+
+def test_crawl_timelines():
+    tweety = Tweety(transport=CassetteTransport(CASSETTE))
+    results = {result.identifier: result for result in tweety.crawl_timelines(['elonmusk', '44196397', 'nonexistentuser1231237'], pages=NUM_PAGES, concurrency=3)}
+
+    assert len(results) == 3
+    assert results['elonmusk'].ok and results['elonmusk'].user_id == '44196397'
+    assert results['44196397'].tweets[0].author.rest_id == '44196397'
+    assert isinstance(results['nonexistentuser1231237'].error, UserNotFound)
+
+
+def test_accounts_are_looked_up_in_one_batch():
+    cassette, endpoints = CassetteTransport(CASSETTE), []
+
+    def handler(request):
+        endpoints.append(request.url.path.rsplit("/", 1)[-1])
+        return cassette.handle_request(request)
+
+    tweety = Tweety(transport=httpx.MockTransport(handler))
+    results = list(tweety.crawl_timelines(['elonmusk', '@ElonMusk', '44196397', 'nonexistentuser1231237'], pages=1))
+
+    assert len(results) == 4 and all(result.ok for result in results if result.identifier != 'nonexistentuser1231237')
+    assert (endpoints.count("UsersByScreenNames"), endpoints.count("UsersByRestIds"), endpoints.count("UserByScreenName")) == (1, 1, 0)
@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+from unittest import mock
+from dateutil import parser
+from tweety import utils
+from tweety.utils import parse_date
+
+
+def test_parse_twitter_dates():
+    for value in ["Wed Oct 10 20:19:24 +0000 2018", "Wed Oct 10 20:19:24 -0530 2018", "2022-11-02T18:30:05Z"]:
+        assert parse_date(value) == parser.parse(value)
+
+    assert parse_date("Wed Oct 10 20:19:24 +0000 2018").tzinfo == timezone.utc
+
+
+def test_parse_unexpected_dates_with_dateutil():
+    assert parse_date("10 October 2018") == parser.parse("10 October 2018")
+
+
+def test_parse_iso_dates_without_fromisoformat():
+    class _Py36Datetime:
+        # datetime as on python 3.6 , without fromisoformat
+        def __new__(cls, *args, **kwargs):
+            return datetime(*args, **kwargs)
+
+    parse_date.cache_clear()
+    with mock.patch.object(utils, "datetime", _Py36Datetime):
+        assert parse_date("2022-11-02T18:30:05Z") == parser.parse("2022-11-02T18:30:05Z")
+        assert parse_date("Wed Oct 10 20:19:24 +0000 2018") == parser.parse("Wed Oct 10 20:19:24 +0000 2018")
+    parse_date.cache_clear()
@@ -0,0 +1,60 @@
+import csv
+import pytest
+from tweety.export import TweetFlattener, export_csv, export_parquet, export_xlsx
+from tweety.types.twDataTypes import WORKBOOK_HEADERS
+from tweety.types import Tweet
+from tweety.types.page import Page
+from conftest import raw_tweet
+
+
+def _raw_tweet(tweet_id):
+    return raw_tweet(tweet_id, "Hello #python #tweety", favorite_count=10, entities={"hashtags": [{"text": "python"}, {"text": "tweety"}]})
+
+
+def _pages():
+    yield Page([Tweet(None, _raw_tweet("1"), None), Tweet(None, _raw_tweet("2"), None)], "cursor-1", True)
+    yield Page([Tweet(None, _raw_tweet("3"), None)], None, False)
+
+
+def test_export_csv(tmp_path):
+    path = str(tmp_path / "tweets.csv")
+    flattener = TweetFlattener(["tweet_id", "author", "hashtags", "medias"], flatten={"medias": len}, separator=",")
+    assert export_csv(_pages(), path, flattener) == 3
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+
+    assert rows[0] == ["tweet_id", "author", "hashtags", "medias"]
+    assert rows[1] == ["1", "elonmusk", "python,tweety", "0"]
+    assert len(rows) == 4
+
+
+def test_export_xlsx(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    path = str(tmp_path / "tweets.xlsx")
+    assert export_xlsx(_pages(), path, sheet_title="Timeline") == 3
+
+    sheet = openpyxl.load_workbook(path, read_only=True)["Timeline"]
+    rows = list(sheet.values)
+    assert list(rows[0]) == WORKBOOK_HEADERS
+    assert len(rows) == 4
+
+    row = dict(zip(rows[0], rows[1]))
+    assert (row["tweet_id"], row["author"], row["likes"], row["hashtags"]) == ("1", "elonmusk", 10, "python tweety")
+    assert row["Created on"].tzinfo is None and row["Created on"].isoformat() == "2022-10-31T18:30:05"
+
+
+def test_unknown_column():
+    with pytest.raises(ValueError):
+        TweetFlattener(["tweet_id", "retweets"])
+
+
+def test_export_parquet(tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "tweets.parquet")
+    assert export_parquet(_pages(), path, batch_size=2) == 3
+
+    assert parquet.ParquetFile(path).num_row_groups == 2
+    table = parquet.read_table(path)
+    assert table.column("likes").to_pylist() == [10, 10, 10]
+    assert table.column("hashtags").to_pylist()[0] == "python tweety"
@@ -1,10 +1,14 @@
+import os
 from tweety.bot import Tweety
+from tweety.transport import CassetteTransport
 from tweety.types import Tweet
 
+CASSETTE = os.path.join(os.path.dirname(__file__), "cassettes", "tweety.json")
+
 NUM_PAGES = 2
 
 def test_get_replies():
-    tweety = Tweety()
+    tweety = Tweety(transport=CassetteTransport(CASSETTE))
     tweets = tweety.get_replies('1587156152609021958')
 
     assert type(tweets[0]) == Tweet
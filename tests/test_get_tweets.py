@@ -1,9 +1,13 @@
+import os
 from tweety.bot import Tweety
+from tweety.transport import CassetteTransport
+
+CASSETTE = os.path.join(os.path.dirname(__file__), "cassettes", "tweety.json")
 
 NUM_PAGES = 2
 
 def test_get_user_tweets():
-    tweety = Tweety()
+    tweety = Tweety(transport=CassetteTransport(CASSETTE))
     tweets_iterator = tweety.paginate_tweets('44196397', pages=NUM_PAGES)
 
     num_pages = 0
@@ -1,8 +1,12 @@
+import os
 from tweety.bot import Tweety
+from tweety.transport import CassetteTransport
+
+CASSETTE = os.path.join(os.path.dirname(__file__), "cassettes", "tweety.json")
 
 
 def test_get_user():
-    tweety = Tweety()
+    tweety = Tweety(transport=CassetteTransport(CASSETTE))
     user = tweety.get_user('elonmusk')
     print(user.name, user.id, user.username)
     assert user.rest_id == '44196397'
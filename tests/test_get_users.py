@@ -0,0 +1,60 @@
+import json
+import os
+import httpx
+from tweety.bot import Tweety, _parse_users, _split_user_identifiers
+from tweety.cache import UserCache
+from tweety.transport import CassetteTransport
+
+CASSETTE = os.path.join(os.path.dirname(__file__), "cassettes", "tweety.json")
+
+
+def test_get_users():
+    tweety = Tweety(transport=CassetteTransport(CASSETTE))
+    users = tweety.get_users(['elonmusk', '44196397', 'nonexistentuser1231237'])
+
+    assert users['elonmusk'].rest_id == '44196397'
+    assert users['44196397'].rest_id == '44196397'
+    assert 'nonexistentuser1231237' not in users
+
+
+def test_cached_users_are_lazy_when_the_client_is():
+    tweety = Tweety(transport=CassetteTransport(CASSETTE), lazy=True, user_cache=UserCache())
+    tweety.get_user('elonmusk')
+
+    for user in (tweety.get_user('elonmusk'), tweety.get_users(['elonmusk'])['elonmusk']):
+        assert 'followers_count' not in dict(user)
+        assert user.rest_id == '44196397'
+
+
+def test_split_and_parse_users():
+    user_ids, screen_names = _split_user_identifiers(['44196397', 44196397, '@ElonMusk', 'elonmusk', 'id:12', 'elonmusk'])
+    assert user_ids == {'44196397': ['44196397', 44196397], '12': ['id:12']}
+    assert screen_names == {'elonmusk': ['@ElonMusk', 'elonmusk']}
+
+    response = {"data": {"users": [
+        {"result": {"__typename": "User", "rest_id": "44196397", "legacy": {"screen_name": "elonmusk", "name": "Elon Musk", "created_at": "Tue Jun 02 20:12:29 +0000 2009"}}},
+        {"result": {"__typename": "UserUnavailable"}},
+        {},
+    ]}}
+    users = _parse_users(response)
+    assert [user.username for user in users] == ['elonmusk']
+
+
+def _users_handler(request):
+    # 1234 is the username of a user whose rest id is 99
+    if request.url.path.endswith("activate.json"):
+        return httpx.Response(200, json={"guest_token": "1"})
+
+    raw_user = {"result": {"__typename": "User", "rest_id": "99", "legacy": {"screen_name": "1234", "name": "Digits",
+                                                                           "created_at": "Tue Jun 02 20:12:29 +0000 2009"}}}
+    variables = json.loads(request.url.params.get("variables", "{}"))
+    found = "99" in variables.get("userIds", []) or "1234" in variables.get("screen_names", [])
+    return httpx.Response(200, json={"data": {"users": [raw_user] if found else []}})
+
+
+def test_username_of_digits_is_found_when_no_rest_id_matches():
+    users = Tweety(transport=httpx.MockTransport(_users_handler)).get_users(['1234', 99, 'id:1234', 'id:99'])
+
+    assert users['1234'].rest_id == '99'
+    assert users[99].username == users['id:99'].username == '1234'
+    assert 'id:1234' not in users
@@ -0,0 +1,14 @@
+import json
+import httpx
+from tweety.utils import decode_response
+
+
+def test_decode_response():
+    response = httpx.Response(200, content=b'{"guest_token": "123"}')
+    assert decode_response(response) == {"guest_token": "123"}
+    assert decode_response(response, json.loads) == {"guest_token": "123"}
+
+
+def test_decode_invalid_response():
+    response = httpx.Response(429, content=b'Rate limit exceeded')
+    assert decode_response(response) is None
@@ -0,0 +1,30 @@
+from tweety.types import Tweet
+from tweety.types.usertweet import UserTweets
+from conftest import bottom_cursor, raw_tweet, tweet_entry
+
+SOURCE = '<a href="https://mobile.twitter.com" rel="nofollow">Twitter Web App</a>'
+
+
+def _raw_tweet():
+    return raw_tweet(text="Hello", source=SOURCE, favorite_count=10, entities={"hashtags": [{"text": "tweety", "indices": [0, 7]}]})
+
+
+def test_lazy_tweet_matches_eager_tweet():
+    eager = Tweet(None, _raw_tweet(), None)
+    lazy = Tweet(None, _raw_tweet(), None, lazy=True)
+
+    assert 'text' not in dict(lazy)
+    assert lazy.text == eager.text == 'Hello'
+    assert lazy['likes'] == eager['likes'] == 10
+    assert lazy.get('source') == 'Twitter Web App'
+    assert lazy.author.username == 'elonmusk'
+    assert dict(lazy.materialize()).keys() == dict(eager).keys()
+    assert dict(lazy.author) == dict(eager.author)
+
+
+def test_lazy_timeline_skips_malformed_tweets():
+    timeline = UserTweets("44196397", None, False, lazy=True)
+    tweets = timeline._parse_page(None, [tweet_entry("1"), tweet_entry("2", created_at="not a date"), bottom_cursor("page-2")])
+
+    assert [tweet.id for tweet in tweets] == ["1"]
+    assert 'text' not in dict(tweets[0])
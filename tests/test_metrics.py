@@ -0,0 +1,58 @@
+import httpx
+from tweety.http import Request
+from tweety.metrics import MetricsCollector
+
+SEARCH_URL = "https://twitter.com/i/api/2/search/adaptive.json"
+
+
+def _handler():
+    tokens = iter(range(1, 100))
+    limited = set()
+
+    def handle(request):
+        if request.url.path.endswith("activate.json"):
+            return httpx.Response(200, json={"guest_token": str(next(tokens))})
+
+        # the first token is rate limited once , the request is retried with a new one
+        token = request.headers.get("x-guest-token")
+        if request.url.path.endswith("adaptive.json") and token == "1" and token not in limited:
+            limited.add(token)
+            return httpx.Response(429, json={})
+
+        return httpx.Response(200, json={"globalObjects": {}})
+
+    return handle
+
+
+def test_collects_requests_retries_and_tokens():
+    metrics = MetricsCollector()
+    events = []
+    metrics.hooks.add("before_request", lambda endpoint, request_data, attempt: events.append((endpoint, attempt)))
+
+    request = Request(transport=httpx.MockTransport(_handler()), hooks=metrics.hooks)
+    try:
+        assert request.hooks is metrics.hooks
+        assert request.perform_search("python", None, None) == {"globalObjects": {}}
+    finally:
+        request.close()
+
+    assert events == [("adaptive.json", 0), ("adaptive.json", 1)]
+    snapshot = metrics.snapshot()
+    assert snapshot["requests"] == 2
+    assert snapshot["retries"] == 1
+    assert snapshot["guest_tokens"]["fetched"] == 2
+
+    search = snapshot["endpoints"]["adaptive.json"]
+    assert search["statuses"] == {200: 1, 429: 1}
+    assert search["bytes"] == len(b'{}') + len(b'{"globalObjects":{}}')
+    assert search["network_seconds"]["count"] == 2
+    assert search["network_seconds"]["buckets"]["+Inf"] == 2
+    assert search["parse_seconds"]["count"] == 1
+
+    text = metrics.to_prometheus()
+    assert '# TYPE tweety_requests_total counter' in text
+    assert 'tweety_requests_total{endpoint="adaptive.json",status="429"} 1' in text
+    assert 'tweety_retries_total{endpoint="adaptive.json",status="429"} 1' in text
+    assert 'tweety_guest_tokens_total 2' in text
+    assert 'tweety_request_seconds_bucket{endpoint="adaptive.json",le="+Inf"} 2' in text
+    assert 'tweety_request_seconds_count{endpoint="adaptive.json"} 2' in text
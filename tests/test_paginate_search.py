@@ -0,0 +1,17 @@
+from tweety.types.search import Search
+from conftest import SearchHttp
+
+
+def test_pages_are_streamed_without_history():
+    http = SearchHttp()
+    search = Search("python", http, 0, wait_time=0, keep_history=False)
+    assert http.cursors == []
+
+    pages = list(search.get_search_page_iterator(2))
+    assert [len(page) for page in pages] == [3, 3]
+    assert pages[-1].cursor == "scroll-2"
+    assert search.tweets == []
+
+    resumed = Search("python", http, 0, wait_time=0, cursor=pages[-1].cursor)
+    assert next(resumed.get_search_page_iterator(1))[0].id == "20"
+    assert len(resumed.tweets) == 3
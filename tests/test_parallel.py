@@ -0,0 +1,44 @@
+import os
+import pickle
+from tweety.bot import Tweety
+from tweety.parallel import ParsePool, parse_timeline_page
+from tweety.transport import CassetteTransport
+from tweety.types.records import TweetRecord, to_record
+from tweety.types.usertweet import UserTweets
+from conftest import bottom_cursor, timeline_payload, tweet_entry
+
+CASSETTE = os.path.join(os.path.dirname(__file__), "cassettes", "tweety.json")
+
+
+def _crawl(app):
+    user = app.get_user("elonmusk")
+    pages = list(app.paginate_tweets(user.rest_id, pages=2, wait_time=0))
+    return pages, app.search("python", 1, wait_time=0)
+
+
+def test_pages_are_built_in_worker_processes():
+    pages, search = _crawl(Tweety(transport=CassetteTransport(CASSETTE)))
+    with ParsePool(workers=2) as pool:
+        pooled_pages, pooled_search = _crawl(Tweety(transport=CassetteTransport(CASSETTE), parse_pool=pool))
+
+    assert [page.cursor for page in pooled_pages] == [page.cursor for page in pages]
+    assert [page.is_next_page for page in pooled_pages] == [page.is_next_page for page in pages]
+    for pooled, page in zip(pooled_pages, pages):
+        assert all(isinstance(record, TweetRecord) for record in pooled)
+        assert list(pooled) == [to_record(tweet) for tweet in page]
+
+    assert pooled_search.cursor == search.cursor
+    assert list(pooled_search) == [to_record(tweet) for tweet in search]
+    assert pickle.loads(pickle.dumps(pooled_pages[0][0])) == pooled_pages[0][0]
+
+
+def test_worker_skips_malformed_tweets_like_the_serial_parser():
+    payload = timeline_payload([tweet_entry("1"), tweet_entry("2", created_at="not a date"), bottom_cursor("page-2")])
+    timeline = UserTweets("44196397", None, False, 0)
+    serial = timeline._parse_page(payload, timeline._get_entries(payload))
+
+    records, cursor, is_next_page, newest_id = parse_timeline_page(payload)
+    assert [record.id for record in records] == [tweet.id for tweet in serial] == ["1"]
+    assert (cursor, is_next_page) == ("page-2", True)
+    # a payload without a timeline is requested again by the caller
+    assert parse_timeline_page({"errors": [{"code": 88}]}) is None
@@ -0,0 +1,48 @@
+import os
+from tweety.bot import Tweety
+from tweety.profiling import PHASES, Profile, measure
+from tweety.transport import CassetteTransport
+
+CASSETTE = os.path.join(os.path.dirname(__file__), "cassettes", "tweety.json")
+
+
+def test_pages_and_endpoints_are_profiled():
+    app = Tweety(transport=CassetteTransport(CASSETTE), profile=True)
+    user = app.get_user("elonmusk")
+    pages = list(app.paginate_tweets(user.rest_id, pages=2, wait_time=0))
+    search = app.search("python", 1, wait_time=0)
+
+    assert [page.profile.items for page in pages] == [len(page) for page in pages]
+    assert pages[0].profile.endpoint == "UserTweets" and pages[0].profile.requests == 1
+    assert search.page_profile.endpoint == "adaptive.json"
+    for phase in ("network", "decode", "build"):
+        assert pages[0].profile.wall[phase] > 0
+
+    summary = app.profile.summary()
+    assert summary["UserTweets"]["pages"] == 2
+    assert summary["UserTweets"]["items"] == sum(len(page) for page in pages)
+    assert summary["adaptive.json"]["pages"] == 1
+    assert set(summary["UserTweets"]["wall"]) == set(PHASES)
+    assert list(app.profile.pages)[-1] is search.page_profile
+
+
+def test_off_by_default():
+    app = Tweety(transport=CassetteTransport(CASSETTE))
+    user = app.get_user("elonmusk")
+    page = next(iter(app.paginate_tweets(user.rest_id, pages=1, wait_time=0)))
+
+    assert app.profile is None and page.profile is None
+    with measure("build") as timer:
+        pass
+    assert timer.page is None
+
+
+def test_sleep_is_counted_after_the_page():
+    profile = Profile(keep_pages=1)
+    with profile.page("cursor-1") as page:
+        page.endpoint = "UserTweets"
+    with profile.sleeping(page):
+        pass
+
+    assert page.wall["sleep"] > 0
+    assert profile.summary()["UserTweets"]["wall"]["sleep"] == page.wall["sleep"]
@@ -1,10 +1,14 @@
+import os
 from tweety.bot import Tweety
 from tweety.exceptions_ import UserProtected
+from tweety.transport import CassetteTransport
 import pytest
 
+CASSETTE = os.path.join(os.path.dirname(__file__), "cassettes", "tweety.json")
+
 @pytest.mark.skip
 def test_protected_user():
-    tweety = Tweety()
+    tweety = Tweety(transport=CassetteTransport(CASSETTE))
     try:
         tweety.get_user('protected_account')
     except UserProtected:
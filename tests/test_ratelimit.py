@@ -0,0 +1,53 @@
+import time
+from tweety.ratelimit import RateLimitScheduler, get_endpoint
+from tweety.types.usertweet import UserTweets
+from conftest import bottom_cursor, timeline_payload, tweet_entry
+
+
+def test_spends_budget_then_waits_for_reset():
+    scheduler = RateLimitScheduler()
+    endpoint = get_endpoint("https://twitter.com/i/api/graphql/OXXUyHfKYZ-xLx4NcL9-_Q/UserTweets?variables=%7B%7D")
+    assert endpoint == "UserTweets"
+    assert scheduler.reserve(endpoint, "token") == 0
+
+    reset = int(time.time()) + 30
+    scheduler.update(endpoint, "token", {"x-rate-limit-limit": "50", "x-rate-limit-remaining": "2", "x-rate-limit-reset": str(reset)})
+    assert scheduler.reserve(endpoint, "token") == 0
+    assert scheduler.reserve(endpoint, "token") == 0
+    assert 25 < scheduler.reserve(endpoint, "token") <= 31
+    assert scheduler.reserve(endpoint, "other token") == 0
+
+
+def test_rate_limited_response_spends_budget():
+    scheduler = RateLimitScheduler()
+    scheduler.update("TweetDetail", "token", {"x-rate-limit-remaining": "10", "x-rate-limit-reset": str(int(time.time()) + 60)}, 429)
+    assert scheduler.delay("TweetDetail", "token") > 0
+
+    scheduler.forget("token")
+    assert scheduler.delay("TweetDetail", "token") == 0
+
+
+def test_page_without_timeline_is_requested_again_without_a_fixed_sleep():
+    class _Http:
+        def __init__(self):
+            self.responses = [{"errors": [{"code": 88}]}, timeline_payload([tweet_entry("1"), bottom_cursor("page-2")])]
+
+        def get_tweets(self, user_id, replies=False, cursor=None):
+            return self.responses.pop(0)
+
+    start = time.monotonic()
+    tweets = UserTweets("44196397", _Http(), False).get_tweets(1)
+    assert [tweet.id for tweet in tweets] == ["1"]
+    assert time.monotonic() - start < 1
+
+
+def test_rate_limited_response_without_reset_is_backed_off():
+    scheduler = RateLimitScheduler()
+    scheduler.update("TweetDetail", "token", {"retry-after": "20"}, 429)
+    assert 15 < scheduler.delay("TweetDetail", "token") <= 20
+
+    scheduler.update("UserTweets", "token", {}, 429)
+    first = scheduler.delay("UserTweets", "token")
+    scheduler.update("UserTweets", "token", {}, 429)
+    assert 0 < first < scheduler.delay("UserTweets", "token")
+    assert scheduler.reserve("UserTweets", "token") > 0
@@ -0,0 +1,52 @@
+import pickle
+from tweety.types import Tweet
+from tweety.types.records import TweetRecord, UserRecord, to_record
+from conftest import raw_tweet
+
+
+class _Http:
+    def __init__(self):
+        self.requested = []
+
+    def get_tweet_detail(self, tweet_id):
+        self.requested.append(tweet_id)
+        raise AssertionError("the parent was requested")
+
+
+def _raw_tweet():
+    return raw_tweet(text="Hello", favorite_count=10, entities={"user_mentions": [{"id_str": "1", "name": "Tweety", "screen_name": "tweety"}]})
+
+
+def test_record_from_model():
+    tweet = Tweet(None, _raw_tweet(), None)
+    record = to_record(tweet)
+
+    assert isinstance(record, TweetRecord) and isinstance(record.author, UserRecord)
+    assert not hasattr(record, '__dict__')
+    assert record.text == record.tweet_body == tweet.text
+    assert record.author.username == 'elonmusk'
+    assert record.user_mentions[0].screen_name == 'tweety'
+    assert record.to_dict()['author']['profile_url'] == tweet.author.profile_url
+    assert record.to_dict()['tweet_body'] == tweet['tweet_body']
+    assert set(record.to_dict()) == set(TweetRecord.__slots__) | {'tweet_body'}
+    assert record == TweetRecord.from_raw(_raw_tweet())
+    assert pickle.loads(pickle.dumps(record)) == record
+
+
+def test_record_does_not_fetch_the_parent():
+    http = _Http()
+    reply = Tweet(None, raw_tweet("2", in_reply_to="1"), http, get_reply=True)
+    record = to_record(reply)
+
+    assert http.requested == []
+    assert record.reply_to is None and record.reply_to_id == "1"
+
+    reply._set_reply_to(Tweet(None, raw_tweet("1"), http))
+    assert to_record(reply).reply_to.id == "1"
+
+
+def test_records_are_hashable():
+    record = TweetRecord.from_raw(_raw_tweet())
+
+    assert hash(record) == hash(TweetRecord.from_raw(_raw_tweet()))
+    assert len({record, TweetRecord.from_raw(_raw_tweet()), TweetRecord.from_raw(raw_tweet("2"))}) == 2
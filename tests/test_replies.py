@@ -0,0 +1,62 @@
+from tweety.types.replies import TweetReplies
+from conftest import raw_tweet, tweet_entry
+
+
+def _item(tweet_id):
+    return {"entryId": f"conversationthread-{tweet_id}-tweet-{tweet_id}",
+            "item": {"itemContent": {"tweet_results": {"result": raw_tweet(tweet_id)}}}}
+
+
+def _cursor(entry_id, value, cursor_type):
+    return {"entryId": entry_id, "item": {"itemContent": {"value": value, "cursorType": cursor_type}}}
+
+
+class _Http:
+    def __init__(self):
+        self.requested = []
+
+    def get_tweet_detail(self, tweet_id, cursor=None):
+        self.requested.append(cursor)
+        if cursor == "more-2":
+            return {"data": {"threaded_conversation_with_injections_v2": {"instructions": [
+                {"type": "TimelineAddToModule", "moduleItems": [_item("21")]}]}}}
+
+        if cursor == "more-loop":
+            # A "show more" page handing its own cursor out again
+            return {"data": {"threaded_conversation_with_injections_v2": {"instructions": [
+                {"type": "TimelineAddToModule", "moduleItems": [_item("31"), _cursor("conversationthread-3-cursor-showmore-1", "more-loop", "ShowMore")]}]}}}
+
+        entries = [tweet_entry("1")]
+        if cursor is None:
+            entries.append({"entryId": "conversationthread-2", "content": {"items": [
+                _item("2"), _cursor("conversationthread-2-cursor-showmore-1", "more-2", "ShowMore")]}})
+            entries.append({"entryId": "cursor-bottom-1", "content": {"itemContent": {"value": "page-2", "cursorType": "Bottom"}}})
+        else:
+            entries.append({"entryId": "conversationthread-3", "content": {"items": [_item("3")]}})
+
+        return {"data": {"threaded_conversation_with_injections_v2": {"instructions": [{"entries": entries}]}}}
+
+
+def test_follows_show_more_and_bottom_cursors():
+    http = _Http()
+    replies = TweetReplies("1", http)
+
+    assert [tweet.id for tweet in replies] == ["2", "21", "3"]
+    assert http.requested == [None, "more-2", "page-2"]
+
+
+def test_resume_from_cursor():
+    http = _Http()
+    first = TweetReplies("1", http, pages=1)
+    assert [tweet.id for tweet in first] == ["2"]
+
+    resumed = TweetReplies("1", http, cursor=first.cursor, show_more=list(first.show_more))
+    assert [tweet.id for tweet in resumed] == ["21", "3"]
+
+
+def test_repeated_show_more_cursor_is_requested_once():
+    http = _Http()
+    replies = TweetReplies("1", http, cursor="page-2", show_more=["more-loop"])
+
+    assert [tweet.id for tweet in replies] == ["31", "3"]
+    assert http.requested == ["more-loop", "page-2"]
@@ -0,0 +1,40 @@
+from tweety.types.usertweet import UserTweets
+from conftest import bottom_cursor, raw_tweet, tweet_entry
+
+
+def _conversation(*tweet_ids):
+    return {"entryId": f"homeConversation-{tweet_ids[0]}", "content": {"items": [
+        {"item": {"itemContent": {"tweet_results": {"result": {"tweet": raw_tweet(tweet_id)}}}}} for tweet_id in tweet_ids]}}
+
+
+def test_pinned_and_conversations_dont_end_the_sync():
+    user_tweets = UserTweets("44196397", None, since_id="100")
+    tweets = user_tweets._parse_page(None, [tweet_entry("50", pinned=True), tweet_entry("120"), _conversation("110", "90"), bottom_cursor("page-2")])
+
+    assert [tweet.id for tweet in tweets] == ["120", "110"]
+    assert user_tweets.is_next_page
+    assert user_tweets.newest_id == "120"
+
+    tweets = user_tweets._parse_page(None, [tweet_entry("105"), tweet_entry("100"), tweet_entry("95"), bottom_cursor("page-3")])
+    assert [tweet.id for tweet in tweets] == ["105"]
+    assert not user_tweets.is_next_page
+    assert user_tweets.newest_id == "120"
+
+
+def test_newer_tweets_of_a_conversation_move_newest_id():
+    user_tweets = UserTweets("44196397", None, since_id="100")
+    user_tweets._parse_page(None, [tweet_entry("90", pinned=True), tweet_entry("105"), _conversation("120", "110"), bottom_cursor("page-2")])
+
+    assert user_tweets.newest_id == "120"
+
+
+def test_newly_pinned_tweet_is_returned_once():
+    entries = [tweet_entry("130", pinned=True), tweet_entry("120"), tweet_entry("100"), bottom_cursor("page-2")]
+    user_tweets = UserTweets("44196397", None, since_id="100")
+    assert [tweet.id for tweet in user_tweets._parse_page(None, entries)] == ["130", "120"]
+    assert user_tweets.newest_id == "130"
+
+    # the next sync starts from the returned watermark , the pinned tweet isn't new anymore
+    user_tweets = UserTweets("44196397", None, since_id=user_tweets.newest_id)
+    assert user_tweets._parse_page(None, entries) == []
+    assert not user_tweets.is_next_page
@@ -0,0 +1,62 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tweety.singleflight import SingleFlight, DETAIL_CACHE_TTL
+
+
+def test_concurrent_calls_share_one_call():
+    flight = SingleFlight(ttl=60)
+    calls = []
+    release = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        release.wait(1)
+        return {"data": len(calls)}
+
+    with ThreadPoolExecutor(4) as executor:
+        futures = [executor.submit(flight.do, "1", fetch) for _ in range(4)]
+        time.sleep(0.1)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert all(result == {"data": 1} for result in results)
+    assert len({id(result) for result in results}) == 4
+
+    # Every caller gets its own copy , changing one doesn't change the cached result
+    results[0]["data"] = 2
+    assert flight.do("1", fetch) == {"data": 1}
+    assert flight.hits == 1
+
+
+def test_detail_cache_is_off_by_default():
+    flight = SingleFlight(ttl=DETAIL_CACHE_TTL)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"data": len(calls)}
+
+    assert flight.do("1", fetch) == {"data": 1}
+    assert flight.do("1", fetch) == {"data": 2}
+    assert flight.hits == 0
+
+
+def test_async_calls_and_errors_are_shared():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(*[flight.do_async("1", fetch) for _ in range(3)], return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) for result in results)
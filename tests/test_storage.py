@@ -0,0 +1,38 @@
+from tweety.storage import SQLiteStorage
+from tweety.types import Tweet
+from tweety.types.records import to_record
+from conftest import raw_tweet
+
+
+def _raw_tweet(tweet_id, likes=10):
+    return raw_tweet(tweet_id, "Hello #python", favorite_count=likes,
+                     entities={"user_mentions": [{"id_str": "1", "name": "Tweety", "screen_name": "tweety"}],
+                               "hashtags": [{"text": "python"}]},
+                     extended_entities={"media": [{"id_str": "7", "type": "photo", "media_url_https": "https://pbs.twimg.com/media/a.jpg"}]})
+
+
+def test_pages_are_upserted(tmp_path):
+    with SQLiteStorage(str(tmp_path / "tweety.db")) as storage:
+        assert storage.save([Tweet(None, _raw_tweet("1"), None), Tweet(None, _raw_tweet("2"), None)]) == 2
+        # the same tweet on a later page replaces the stored row
+        storage.save([to_record(Tweet(None, _raw_tweet("2", likes=99), None))])
+
+        assert (storage.count("tweets"), storage.count("users"), storage.count("media"), storage.count("entities")) == (2, 1, 2, 4)
+        tweet = storage.get_tweet("2")
+        assert (tweet["author_id"], tweet["likes"], tweet["created_on"]) == ("44196397", 99, "2022-10-31T18:30:05+00:00")
+        assert storage.get_user("44196397")["screen_name"] == "elonmusk"
+
+
+def test_removed_entities_and_media_are_deleted(tmp_path):
+    with SQLiteStorage(str(tmp_path / "tweety.db")) as storage:
+        storage.save([Tweet(None, _raw_tweet("1"), None)])
+        storage.save([Tweet(None, raw_tweet("1", "Hello"), None)])
+
+        assert (storage.count("tweets"), storage.count("media"), storage.count("entities")) == (1, 0, 0)
+
+
+def test_reply_id_of_a_record_is_stored(tmp_path):
+    with SQLiteStorage(str(tmp_path / "tweety.db")) as storage:
+        storage.save([to_record(Tweet(None, raw_tweet("2", in_reply_to="1"), None))])
+
+        assert storage.get_tweet("2")["reply_to_id"] == "1"
@@ -0,0 +1,74 @@
+import os
+import threading
+import time
+from tweety.bot import Tweety
+from tweety.tokens import GuestToken, GuestTokenPool
+from tweety.transport import CassetteTransport
+
+CASSETTE = os.path.join(os.path.dirname(__file__), "cassettes", "tweety.json")
+
+
+def test_round_robin_and_retire():
+    pool = GuestTokenPool(size=2)
+    pool.refresh(lambda: GuestToken(str(len(pool)), None))
+    assert len(pool) == 2
+
+    first, second = pool.acquire(), pool.acquire()
+    assert first is not second
+    assert pool.acquire() is first
+
+    pool.retire(first)
+    assert pool.missing == 1
+    assert pool.acquire() is second
+
+
+def test_least_recently_limited_and_expiry():
+    pool = GuestTokenPool(size=2, ttl=60, strategy=GuestTokenPool.LEAST_RECENTLY_LIMITED)
+    limited, fresh = pool.add(GuestToken("1", None)), pool.add(GuestToken("2", None))
+    pool.mark_limited(limited)
+    assert pool.acquire() is fresh
+
+    fresh.created_at -= 120
+    assert pool.acquire() is limited
+    pool.refresh(lambda: GuestToken("3", None))
+    assert [token.value for token in pool.tokens] == ["1", "3"]
+
+
+def test_retired_and_expired_tokens_are_handed_out_for_closing():
+    pool = GuestTokenPool(size=2, ttl=60)
+    retired, expired = pool.add(GuestToken("1", None)), pool.add(GuestToken("2", None))
+    pool.retire(retired)
+    expired.created_at -= 120
+    pool.refresh(lambda: GuestToken("3", None))
+
+    assert pool.retired == 2
+    assert pool.take_discarded() == []
+    assert pool.take_discarded(grace=0) == [retired, expired]
+    assert pool.take_discarded(grace=0) == []
+
+
+def test_concurrent_refreshes_fill_the_pool_once():
+    pool = GuestTokenPool(size=2)
+    created = []
+
+    def new_token():
+        created.append(1)
+        time.sleep(0.05)
+        return GuestToken(str(len(created)), None)
+
+    threads = [threading.Thread(target=pool.refresh, args=(new_token,)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 2 and len(pool) == 2
+
+
+def test_close_stops_the_refresh_thread():
+    running = threading.active_count()
+    app = Tweety(transport=CassetteTransport(CASSETTE))
+    assert threading.active_count() == running + 1
+
+    app.close()
+    assert threading.active_count() == running
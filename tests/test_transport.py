@@ -0,0 +1,49 @@
+import os
+import httpx
+import pytest
+from tweety.bot import Tweety
+from tweety.exceptions_ import RequestNotRecorded
+from tweety.transport import CassetteTransport
+
+CASSETTE = os.path.join(os.path.dirname(__file__), "cassettes", "tweety.json")
+
+
+def _handler(request):
+    if request.url.path.endswith("activate.json"):
+        return httpx.Response(200, json={"guest_token": "1"})
+
+    return httpx.Response(200, json={"cursor": request.url.params.get("cursor")}, headers={"x-rate-limit-remaining": "5"})
+
+
+def test_record_and_replay(tmp_path):
+    path = str(tmp_path / "cassette.json")
+    recorder = CassetteTransport(path, CassetteTransport.RECORD, transport=httpx.MockTransport(_handler))
+    with httpx.Client(transport=recorder) as client:
+        client.post("https://api.twitter.com/1.1/guest/activate.json")
+        client.get("https://twitter.com/i/api/2/search/adaptive.json", params={"q": "python", "cursor": "scroll-1"})
+        # written once , when the session is closed
+        assert not os.path.exists(path)
+    assert recorder.recorded == 2
+
+    # the headers and the order of the parameters don't matter , the cursor does
+    with httpx.Client(transport=CassetteTransport(path)) as client:
+        response = client.get("https://twitter.com/i/api/2/search/adaptive.json?cursor=scroll-1&q=python", headers={"x-guest-token": "2"})
+        assert response.json() == {"cursor": "scroll-1"}
+        assert response.headers["x-rate-limit-remaining"] == "5"
+
+        with pytest.raises(RequestNotRecorded):
+            client.get("https://twitter.com/i/api/2/search/adaptive.json", params={"q": "python", "cursor": "scroll-2"})
+
+
+def test_entry_points_run_offline():
+    app = Tweety(transport=CassetteTransport(CASSETTE))
+    user = app.get_user("elonmusk")
+    tweets = app.get_tweets(2, user_id=user.rest_id, wait_time=0)
+
+    assert user.rest_id == "44196397"
+    assert len(tweets) == 80
+    assert len(app.search("python", 1, wait_time=0).tweets) == 3
+    assert app.tweet_detail(tweets[0].id).id == tweets[0].id
+
+    replies = app.get_replies(tweets[0].id)
+    assert replies and all(reply.reply_to.id == tweets[0].id for reply in replies)
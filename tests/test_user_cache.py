@@ -0,0 +1,27 @@
+from tweety.cache import UserCache
+
+
+def test_lru_and_ttl():
+    cache = UserCache(maxsize=2)
+    cache.set("@ElonMusk", 44196397)
+    cache.set("jack", 12)
+    assert cache.get_rest_id("elonmusk") == "44196397"
+
+    cache.set("nasa", 11348282)
+    assert "jack" not in cache
+    assert len(cache) == 2
+
+    cache.ttl = -1
+    assert cache.get("nasa") is None
+
+
+def test_sqlite_snapshot(tmp_path):
+    path = str(tmp_path / "users.db")
+    raw_user = {"__typename": "User", "rest_id": "44196397", "legacy": {"screen_name": "elonmusk", "name": "Elon Musk"}}
+    cache = UserCache(path=path)
+    cache.set_raw_user(raw_user)
+    cache.close()
+
+    cached = UserCache(path=path).get("ElonMusk")
+    assert cached.rest_id == "44196397"
+    assert cached.profile == raw_user